@@ -9,6 +9,8 @@ import homeassistant.helpers.config_validation as cv
 
 from .const import DOMAIN
 from .coordinator import RCEPSEDataUpdateCoordinator
+from .services import async_setup_services
+from .snapshot import RCESnapshotStore
 from .config_flow import migrate_legacy_time_values, migrate_price_unit_in_mapping
 
 _LOGGER = logging.getLogger(__name__)
@@ -40,6 +42,7 @@ async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     _LOGGER.debug("Setting up RCE PSE integration")
     hass.data.setdefault(DOMAIN, {})
+    async_setup_services(hass)
     _LOGGER.debug("RCE PSE integration setup completed")
     return True
 
@@ -51,8 +54,15 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     coordinator = RCEPSEDataUpdateCoordinator(hass, entry)
     _LOGGER.debug("Created data coordinator for RCE PSE")
     
-    await coordinator.async_config_entry_first_refresh()
-    _LOGGER.debug("Completed first data refresh for RCE PSE")
+    if await coordinator.async_restore_snapshot():
+        _LOGGER.debug("Serving cached RCE PSE snapshot")
+        if coordinator.snapshot_is_stale():
+            entry.async_create_background_task(
+                hass, coordinator.async_refresh(), f"{DOMAIN}_revalidate_snapshot"
+            )
+    else:
+        await coordinator.async_config_entry_first_refresh()
+        _LOGGER.debug("Completed first data refresh for RCE PSE")
     
     hass.data[DOMAIN][entry.entry_id] = coordinator
     
@@ -69,6 +79,10 @@ async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
     await hass.config_entries.async_reload(entry.entry_id)
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await RCESnapshotStore(hass, entry.entry_id).async_remove()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     _LOGGER.debug("Unloading RCE PSE config entry: %s", entry.entry_id)
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
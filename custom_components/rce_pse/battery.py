@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import logging
+import math
+from array import array
+from bisect import bisect_right
+from collections import deque
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+
+from .price_series import SLOT_SECONDS, datetime_from_epoch, epoch_seconds
+
+_LOGGER = logging.getLogger(__name__)
+
+ACTION_CHARGE = "charge"
+ACTION_DISCHARGE = "discharge"
+ACTION_IDLE = "idle"
+BATTERY_ACTIONS = (ACTION_CHARGE, ACTION_DISCHARGE, ACTION_IDLE)
+
+_SLOT_HOURS = SLOT_SECONDS / 3600
+_EPSILON = 1e-9
+
+
+@dataclass(frozen=True, slots=True)
+class BatteryParameters:
+    capacity_kwh: float
+    charge_power_kw: float
+    discharge_power_kw: float
+    round_trip_efficiency: float
+    min_soc: float
+    max_soc: float
+    soc_steps: int
+
+    @property
+    def step_kwh(self) -> float:
+        return self.capacity_kwh * (self.max_soc - self.min_soc) / self.soc_steps
+
+    def level_soc(self, level: int) -> float:
+        return self.min_soc + (self.max_soc - self.min_soc) * level / self.soc_steps
+
+    def soc_level(self, soc: float) -> int:
+        if self.max_soc <= self.min_soc:
+            return 0
+        level = round((soc - self.min_soc) / (self.max_soc - self.min_soc) * self.soc_steps)
+        return min(max(level, 0), self.soc_steps)
+
+
+@dataclass(frozen=True, slots=True)
+class BatteryPlanSlot:
+    start: int
+    price: float
+    action: str
+    grid_energy_kwh: float
+    soc: float
+
+    @property
+    def period_start(self) -> datetime:
+        return datetime_from_epoch(self.start)
+
+    @property
+    def period_end(self) -> datetime:
+        return datetime_from_epoch(self.start + SLOT_SECONDS)
+
+
+@dataclass(frozen=True, slots=True)
+class BatteryPlan:
+    starts: array
+    slots: tuple[BatteryPlanSlot, ...]
+    savings: float
+
+    def slot_at(self, when: datetime) -> BatteryPlanSlot | None:
+        index = bisect_right(self.starts, epoch_seconds(when)) - 1
+        if index < 0 or self.starts[index] + SLOT_SECONDS <= epoch_seconds(when):
+            return None
+        return self.slots[index]
+
+    def slots_from(self, when: datetime) -> tuple[BatteryPlanSlot, ...]:
+        return self.slots[max(bisect_right(self.starts, epoch_seconds(when) - SLOT_SECONDS), 0):]
+
+
+def _sliding_min(
+    values: list[float], slope: float, reach: int, forward: bool
+) -> tuple[list[float], list[int]]:
+    size = len(values)
+    best = [math.inf] * size
+    origin = list(range(size))
+    window: deque[int] = deque()
+    order = range(size) if forward else range(size - 1, -1, -1)
+    for j in order:
+        key = values[j] - slope * j
+        while window and values[window[-1]] - slope * window[-1] >= key:
+            window.pop()
+        window.append(j)
+        if abs(window[0] - j) > reach:
+            window.popleft()
+        i = window[0]
+        best[j] = values[i] + slope * (j - i)
+        origin[j] = i
+    return best, origin
+
+
+def optimize_battery(
+    starts: Sequence[int],
+    prices: Sequence[float],
+    params: BatteryParameters,
+    initial_soc: float | None = None,
+) -> BatteryPlan:
+    levels = params.soc_steps + 1
+    step = params.step_kwh
+    start_level = params.soc_level(params.min_soc if initial_soc is None else initial_soc)
+    if not starts or step <= 0:
+        return BatteryPlan(array("q"), (), 0.0)
+
+    efficiency = math.sqrt(params.round_trip_efficiency)
+    charge_reach = int(params.charge_power_kw * _SLOT_HOURS * efficiency / step + _EPSILON)
+    discharge_reach = int(params.discharge_power_kw * _SLOT_HOURS / efficiency / step + _EPSILON)
+
+    cost = [math.inf] * levels
+    cost[start_level] = 0.0
+    history: list[array] = []
+    for price in prices:
+        charged, charge_origin = _sliding_min(cost, price / efficiency * step, charge_reach, True)
+        discharged, discharge_origin = _sliding_min(cost, price * efficiency * step, discharge_reach, False)
+        origin = array("i", range(levels))
+        for j in range(levels):
+            best = cost[j]
+            if charged[j] < best - _EPSILON:
+                best = charged[j]
+                origin[j] = charge_origin[j]
+            if discharged[j] < best - _EPSILON:
+                best = discharged[j]
+                origin[j] = discharge_origin[j]
+            cost[j] = best
+        history.append(origin)
+
+    level = min(range(start_level, levels), key=cost.__getitem__)
+    path = [level]
+    for origin in reversed(history):
+        level = origin[level]
+        path.append(level)
+    path.reverse()
+
+    slots = []
+    for i, (start, price) in enumerate(zip(starts, prices)):
+        delta = (path[i + 1] - path[i]) * step
+        if delta > 0:
+            action, grid = ACTION_CHARGE, delta / efficiency
+        elif delta < 0:
+            action, grid = ACTION_DISCHARGE, delta * efficiency
+        else:
+            action, grid = ACTION_IDLE, 0.0
+        slots.append(BatteryPlanSlot(start, price, action, grid, params.level_soc(path[i + 1])))
+    savings = -sum(slot.grid_energy_kwh * slot.price for slot in slots)
+    _LOGGER.debug(
+        "Battery plan over %d slots with %d SoC levels, projected savings %.2f",
+        len(slots),
+        levels,
+        savings,
+    )
+    return BatteryPlan(array("q", starts), tuple(slots), savings)
@@ -14,6 +14,8 @@ from .binary_sensors import (
     RCETodayExpensiveWindowBinarySensor,
     RCETodaySecondExpensiveWindowBinarySensor,
     RCETodayLowPriceThresholdWindowActiveBinarySensor,
+    RCETodayCheapestSlotsBinarySensor,
+    RCETodayScheduleBinarySensor,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -34,6 +36,8 @@ async def async_setup_entry(
         RCETodayExpensiveWindowBinarySensor(coordinator, config_entry),
         RCETodaySecondExpensiveWindowBinarySensor(coordinator, config_entry),
         RCETodayLowPriceThresholdWindowActiveBinarySensor(coordinator, config_entry),
+        RCETodayCheapestSlotsBinarySensor(coordinator, config_entry),
+        RCETodayScheduleBinarySensor(coordinator, config_entry),
     ]
     
     _LOGGER.debug("Adding %d RCE PSE binary sensors to Home Assistant", len(binary_sensors))
@@ -8,6 +8,8 @@ from .custom_windows import (
     RCETodayExpensiveWindowBinarySensor,
     RCETodaySecondExpensiveWindowBinarySensor,
 )
+from .cheapest_slots import RCETodayCheapestSlotsBinarySensor
+from .schedule import RCETodayScheduleBinarySensor
 from .low_price_threshold import RCETodayLowPriceThresholdWindowActiveBinarySensor
 
 __all__ = [
@@ -18,4 +20,6 @@ __all__ = [
     "RCETodayExpensiveWindowBinarySensor",
     "RCETodaySecondExpensiveWindowBinarySensor",
     "RCETodayLowPriceThresholdWindowActiveBinarySensor",
+    "RCETodayCheapestSlotsBinarySensor",
+    "RCETodayScheduleBinarySensor",
 ] 
\ No newline at end of file
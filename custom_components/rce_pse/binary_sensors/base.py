@@ -1,21 +1,62 @@
 from __future__ import annotations
 
+from bisect import bisect_right
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.util import dt as dt_util
 
+from ..dependencies import EntityDependencies, TimeGranularity
 from ..shared_base import RCEBaseCommonEntity
-from ..time_window import parse_pse_dtime
+from ..time_window import parse_pse_dtime, window_timestamp_bounds_from_records
 
 if TYPE_CHECKING:
     pass
 
 
 class RCEBaseBinarySensor(RCEBaseCommonEntity, BinarySensorEntity):
+    _dependencies = EntityDependencies(day_offsets=(0,), granularity=TimeGranularity.TRANSITION)
+
     def __init__(self, coordinator, unique_id):
         super().__init__(coordinator, unique_id)
+        self._transition_index: tuple[Any, str, list[datetime]] | None = None
+
+    def get_active_window(self) -> list[dict]:
+        return []
+
+    def active_bounds(self) -> list[tuple[datetime, datetime]]:
+        try:
+            bounds = window_timestamp_bounds_from_records(self.get_active_window())
+        except (ValueError, KeyError, IndexError):
+            return []
+        return [] if bounds is None else [bounds]
+
+    def transition_instants(self) -> list[datetime]:
+        data = self.coordinator.data
+        now = dt_util.now()
+        today = now.strftime("%Y-%m-%d")
+        if (
+            self._transition_index is not None
+            and self._transition_index[0] is data
+            and self._transition_index[1] == today
+        ):
+            return self._transition_index[2]
+
+        next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        instants = {next_midnight}
+        for bounds in self.active_bounds():
+            instants.update(bounds)
+        self._transition_index = (data, today, sorted(instants))
+        return self._transition_index[2]
+
+    def next_transition(self, now: datetime) -> datetime | None:
+        local_now = dt_util.as_local(now).replace(tzinfo=None)
+        instants = self.transition_instants()
+        index = bisect_right(instants, local_now)
+        if index >= len(instants):
+            return None
+        return instants[index].replace(tzinfo=dt_util.get_default_time_zone())
 
     def is_now_within_optimal_window_records(self, optimal_window: list[dict]) -> bool:
         if not optimal_window:
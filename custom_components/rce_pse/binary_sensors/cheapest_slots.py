@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.util import dt as dt_util
+
+from ..const import (
+    CONF_CHEAPEST_SLOTS_DURATION,
+    CONF_CHEAPEST_SLOTS_END,
+    CONF_CHEAPEST_SLOTS_START,
+    DEFAULT_CHEAPEST_SLOTS_DURATION,
+    DEFAULT_CHEAPEST_SLOTS_END,
+    DEFAULT_CHEAPEST_SLOTS_START,
+)
+from ..coordinator import RCEPSEDataUpdateCoordinator
+from ..dependencies import CHEAPEST_SLOTS_OPTIONS, EntityDependencies, TimeGranularity
+from ..derived import RCESlotSelection
+from ..price_series import SLOT_SECONDS, record_period_end, record_price
+from ..time_window import duration_minutes_from_hhmm
+from .custom_windows import RCECustomWindowBinarySensor
+
+
+class RCESlotSelectionBinarySensor(RCECustomWindowBinarySensor):
+    _unrecorded_attributes = frozenset({"slots"})
+
+    def get_selection(self) -> RCESlotSelection | None:
+        return None
+
+    def get_active_window(self) -> list[dict]:
+        selection = self.get_selection()
+        return list(selection.records) if selection is not None else []
+
+    def active_bounds(self) -> list[tuple[datetime, datetime]]:
+        selection = self.get_selection()
+        return selection.runs() if selection is not None else []
+
+    @property
+    def is_on(self) -> bool:
+        selection = self.get_selection()
+        if selection is None:
+            return False
+        return selection.contains(dt_util.now().replace(tzinfo=None))
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        selection = self.get_selection()
+        if selection is None or not selection.records:
+            return {"slots": [], "average_price": None}
+        tz = dt_util.get_default_time_zone()
+        prices = [record_price(record) for record in selection.records]
+        return {
+            "slots": [
+                (record_period_end(record) - timedelta(seconds=SLOT_SECONDS)).replace(tzinfo=tz).isoformat()
+                for record in selection.records
+            ],
+            "average_price": self.round_display_price(sum(prices) / len(prices)),
+        }
+
+
+class RCETodayCheapestSlotsBinarySensor(RCESlotSelectionBinarySensor):
+    _dependencies = EntityDependencies(
+        day_offsets=(0,),
+        option_keys=CHEAPEST_SLOTS_OPTIONS,
+        granularity=TimeGranularity.TRANSITION,
+    )
+
+    def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
+        super().__init__(coordinator, config_entry, "today_cheapest_slots_active")
+        self._attr_icon = "mdi:clock-check"
+
+    def get_selection(self) -> RCESlotSelection | None:
+        today_data = self.get_today_data()
+        if not today_data:
+            return None
+        start_s = self.get_config_value(CONF_CHEAPEST_SLOTS_START, DEFAULT_CHEAPEST_SLOTS_START)
+        end_s = self.get_config_value(CONF_CHEAPEST_SLOTS_END, DEFAULT_CHEAPEST_SLOTS_END)
+        duration = self.get_config_value(CONF_CHEAPEST_SLOTS_DURATION, DEFAULT_CHEAPEST_SLOTS_DURATION)
+        return self.find_cheapest_slots_for_day(
+            today_data, start_s, end_s, duration_minutes_from_hhmm(duration)
+        )
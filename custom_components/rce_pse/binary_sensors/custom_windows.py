@@ -4,8 +4,22 @@ from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 
+from ..dependencies import (
+    CHEAPEST_WINDOW_OPTIONS,
+    EXPENSIVE_WINDOW_OPTIONS,
+    SECOND_EXPENSIVE_WINDOW_OPTIONS,
+    EntityDependencies,
+    TimeGranularity,
+)
 from ..coordinator import RCEPSEDataUpdateCoordinator
 from ..const import (
+    CONF_CHEAPEST_SLOTS_DURATION,
+    CONF_CHEAPEST_SLOTS_END,
+    CONF_CHEAPEST_SLOTS_START,
+    CONF_SCHEDULE_END,
+    CONF_SCHEDULE_MIN_SEGMENT,
+    CONF_SCHEDULE_RUNTIME,
+    CONF_SCHEDULE_START,
     CONF_CHEAPEST_TIME_WINDOW_START,
     CONF_CHEAPEST_TIME_WINDOW_END,
     CONF_CHEAPEST_WINDOW_DURATION_HOURS,
@@ -22,7 +36,7 @@ from ..const import (
     DEFAULT_SECOND_EXPENSIVE_TIME_WINDOW_END,
     DEFAULT_SECOND_EXPENSIVE_WINDOW_DURATION_HOURS,
 )
-from ..time_window import business_date_from_day_data, duration_minutes_from_hhmm, normalize_hhmm
+from ..time_window import duration_minutes_from_hhmm, normalize_hhmm
 from .base import RCEBaseBinarySensor
 
 _TIME_WINDOW_KEYS = frozenset(
@@ -36,6 +50,13 @@ _TIME_WINDOW_KEYS = frozenset(
         CONF_SECOND_EXPENSIVE_TIME_WINDOW_START,
         CONF_SECOND_EXPENSIVE_TIME_WINDOW_END,
         CONF_SECOND_EXPENSIVE_WINDOW_DURATION_HOURS,
+        CONF_CHEAPEST_SLOTS_START,
+        CONF_CHEAPEST_SLOTS_END,
+        CONF_CHEAPEST_SLOTS_DURATION,
+        CONF_SCHEDULE_START,
+        CONF_SCHEDULE_END,
+        CONF_SCHEDULE_RUNTIME,
+        CONF_SCHEDULE_MIN_SEGMENT,
     }
 )
 
@@ -69,79 +90,87 @@ class RCECustomWindowBinarySensor(RCEBaseBinarySensor):
         search_end: str,
         duration_hhmm: str,
         is_max: bool,
+        exclude: tuple[str, str, int, bool] | None = None,
     ) -> list[dict]:
-        bd = business_date_from_day_data(day_data)
-        if not bd:
-            return []
         dm = duration_minutes_from_hhmm(duration_hhmm)
-        return self.calculator.find_optimal_window(
-            day_data, bd, search_start, search_end, dm, is_max=is_max
+        return self.find_optimal_window_for_day(
+            day_data, search_start, search_end, dm, is_max=is_max, exclude=exclude
         )
 
+    @property
+    def is_on(self) -> bool:
+        optimal_window = self.get_active_window()
+        if not optimal_window:
+            return False
+
+        return self.is_now_within_optimal_window_records(optimal_window)
+
 
 class RCETodayCheapestWindowBinarySensor(RCECustomWindowBinarySensor):
+    _dependencies = EntityDependencies(
+        day_offsets=(0,),
+        option_keys=CHEAPEST_WINDOW_OPTIONS,
+        granularity=TimeGranularity.TRANSITION,
+    )
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
         super().__init__(coordinator, config_entry, "today_cheapest_window_active")
         self._attr_icon = "mdi:clock-check"
 
-    @property
-    def is_on(self) -> bool:
+    def get_active_window(self) -> list[dict]:
         today_data = self.get_today_data()
         if not today_data:
-            return False
+            return []
 
         start_s = self.get_config_value(CONF_CHEAPEST_TIME_WINDOW_START, DEFAULT_TIME_WINDOW_START)
         end_s = self.get_config_value(CONF_CHEAPEST_TIME_WINDOW_END, DEFAULT_TIME_WINDOW_END)
         duration = self.get_config_value(CONF_CHEAPEST_WINDOW_DURATION_HOURS, DEFAULT_WINDOW_DURATION_HOURS)
 
-        optimal_window = self.find_optimal_window_for_data(
+        return self.find_optimal_window_for_data(
             today_data, start_s, end_s, duration, is_max=False
         )
 
-        if not optimal_window:
-            return False
-
-        return self.is_now_within_optimal_window_records(optimal_window)
-
 
 class RCETodayExpensiveWindowBinarySensor(RCECustomWindowBinarySensor):
+    _dependencies = EntityDependencies(
+        day_offsets=(0,),
+        option_keys=EXPENSIVE_WINDOW_OPTIONS,
+        granularity=TimeGranularity.TRANSITION,
+    )
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
         super().__init__(coordinator, config_entry, "today_expensive_window_active")
         self._attr_icon = "mdi:clock-alert"
 
-    @property
-    def is_on(self) -> bool:
+    def get_active_window(self) -> list[dict]:
         today_data = self.get_today_data()
         if not today_data:
-            return False
+            return []
 
         start_s = self.get_config_value(CONF_EXPENSIVE_TIME_WINDOW_START, DEFAULT_TIME_WINDOW_START)
         end_s = self.get_config_value(CONF_EXPENSIVE_TIME_WINDOW_END, DEFAULT_TIME_WINDOW_END)
         duration = self.get_config_value(CONF_EXPENSIVE_WINDOW_DURATION_HOURS, DEFAULT_WINDOW_DURATION_HOURS)
 
-        optimal_window = self.find_optimal_window_for_data(
+        return self.find_optimal_window_for_data(
             today_data, start_s, end_s, duration, is_max=True
         )
 
-        if not optimal_window:
-            return False
-
-        return self.is_now_within_optimal_window_records(optimal_window)
-
 
 class RCETodaySecondExpensiveWindowBinarySensor(RCECustomWindowBinarySensor):
+    _dependencies = EntityDependencies(
+        day_offsets=(0,),
+        option_keys=SECOND_EXPENSIVE_WINDOW_OPTIONS,
+        granularity=TimeGranularity.TRANSITION,
+    )
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
         super().__init__(coordinator, config_entry, "today_second_expensive_window_active")
         self._attr_icon = "mdi:clock-alert"
 
-    @property
-    def is_on(self) -> bool:
+    def get_active_window(self) -> list[dict]:
         today_data = self.get_today_data()
         if not today_data:
-            return False
+            return []
 
         start_s = self.get_config_value(
             CONF_SECOND_EXPENSIVE_TIME_WINDOW_START, DEFAULT_SECOND_EXPENSIVE_TIME_WINDOW_START
@@ -153,11 +182,6 @@ class RCETodaySecondExpensiveWindowBinarySensor(RCECustomWindowBinarySensor):
             CONF_SECOND_EXPENSIVE_WINDOW_DURATION_HOURS, DEFAULT_SECOND_EXPENSIVE_WINDOW_DURATION_HOURS
         )
 
-        optimal_window = self.find_optimal_window_for_data(
-            today_data, start_s, end_s, duration, is_max=True
+        return self.find_optimal_window_for_data(
+            today_data, start_s, end_s, duration, is_max=True, exclude=self.expensive_window_spec()
         )
-
-        if not optimal_window:
-            return False
-
-        return self.is_now_within_optimal_window_records(optimal_window)
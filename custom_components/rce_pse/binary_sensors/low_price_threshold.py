@@ -5,12 +5,19 @@ from typing import Any
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.util import dt as dt_util
 
+from ..dependencies import LOW_PRICE_OPTIONS, EntityDependencies, TimeGranularity
 from ..coordinator import RCEPSEDataUpdateCoordinator
 from ..const import CONF_LOW_PRICE_THRESHOLD, DEFAULT_LOW_PRICE_THRESHOLD
+from ..derived import ThresholdIntervals
 from .base import RCEBaseBinarySensor
 
 
 class RCETodayLowPriceThresholdWindowActiveBinarySensor(RCEBaseBinarySensor):
+    _dependencies = EntityDependencies(
+        day_offsets=(0,),
+        option_keys=LOW_PRICE_OPTIONS,
+        granularity=TimeGranularity.TRANSITION,
+    )
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
         super().__init__(coordinator, "today_low_price_threshold_window_active")
@@ -27,22 +34,24 @@ class RCETodayLowPriceThresholdWindowActiveBinarySensor(RCEBaseBinarySensor):
             return float(value)
         return value
 
-    @property
-    def is_on(self) -> bool:
+    def get_intervals(self) -> ThresholdIntervals | None:
         today_data = self.get_today_data()
         if not today_data:
-            return False
+            return None
         threshold = self.get_config_value(CONF_LOW_PRICE_THRESHOLD, DEFAULT_LOW_PRICE_THRESHOLD)
-        window = self.calculator.find_first_window_below_threshold(today_data, threshold)
-        if not window:
-            return False
-        try:
-            start_time_str = window[0]["period"].split(" - ")[0]
-            end_time_str = window[-1]["period"].split(" - ")[1]
-            today_str = dt_util.now().strftime("%Y-%m-%d")
-            start_datetime = datetime.strptime(f"{today_str} {start_time_str}:00", "%Y-%m-%d %H:%M:%S")
-            end_datetime = datetime.strptime(f"{today_str} {end_time_str}:00", "%Y-%m-%d %H:%M:%S")
-            now = dt_util.now().replace(tzinfo=None)
-            return start_datetime <= now < end_datetime
-        except (ValueError, KeyError, IndexError):
+        return self.get_threshold_index(today_data, threshold).below
+
+    def get_active_window(self) -> list[dict]:
+        intervals = self.get_intervals()
+        return list(intervals.runs[0]) if intervals else []
+
+    def active_bounds(self) -> list[tuple[datetime, datetime]]:
+        intervals = self.get_intervals()
+        return [intervals.interval(0)] if intervals else []
+
+    @property
+    def is_on(self) -> bool:
+        intervals = self.get_intervals()
+        if not intervals:
             return False
+        return intervals.index_at(dt_util.now().replace(tzinfo=None)) == 0
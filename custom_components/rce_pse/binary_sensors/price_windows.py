@@ -14,13 +14,15 @@ class RCETodayMinPriceWindowBinarySensor(RCEBaseBinarySensor):
         super().__init__(coordinator, "today_min_price_window_active")
         self._attr_icon = "mdi:clock-check"
 
-    @property
-    def is_on(self) -> bool:
+    def get_active_window(self) -> list[dict]:
         today_data = self.get_today_data()
         if not today_data:
-            return False
-        
-        min_price_records = self.calculator.find_extreme_price_records(today_data, is_max=False)
+            return []
+        return self.get_extreme_price_records(today_data, is_max=False)
+
+    @property
+    def is_on(self) -> bool:
+        min_price_records = self.get_active_window()
         if not min_price_records:
             return False
         
@@ -36,13 +38,15 @@ class RCETodayMaxPriceWindowBinarySensor(RCEBaseBinarySensor):
         super().__init__(coordinator, "today_max_price_window_active")
         self._attr_icon = "mdi:clock-alert"
 
-    @property
-    def is_on(self) -> bool:
+    def get_active_window(self) -> list[dict]:
         today_data = self.get_today_data()
         if not today_data:
-            return False
-        
-        max_price_records = self.calculator.find_extreme_price_records(today_data, is_max=True)
+            return []
+        return self.get_extreme_price_records(today_data, is_max=True)
+
+    @property
+    def is_on(self) -> bool:
+        max_price_records = self.get_active_window()
         if not max_price_records:
             return False
         
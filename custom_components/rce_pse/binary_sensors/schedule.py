@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.util import dt as dt_util
+
+from ..coordinator import RCEPSEDataUpdateCoordinator
+from ..dependencies import SCHEDULE_OPTIONS, EntityDependencies, TimeGranularity
+from ..derived import RCESlotSelection, schedule_spec
+from .cheapest_slots import RCESlotSelectionBinarySensor
+
+
+class RCETodayScheduleBinarySensor(RCESlotSelectionBinarySensor):
+    _dependencies = EntityDependencies(
+        day_offsets=(0,),
+        option_keys=SCHEDULE_OPTIONS,
+        granularity=TimeGranularity.TRANSITION,
+    )
+    _attr_entity_registry_enabled_default = False
+    _unrecorded_attributes = frozenset({"slots", "segments"})
+
+    def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
+        super().__init__(coordinator, config_entry, "today_schedule_active")
+        self._attr_icon = "mdi:calendar-clock"
+
+    def get_selection(self) -> RCESlotSelection | None:
+        today_data = self.get_today_data()
+        if not today_data:
+            return None
+        return self.find_schedule_for_day(today_data, schedule_spec(self.get_config_value))
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        attributes = super().extra_state_attributes
+        selection = self.get_selection()
+        tz = dt_util.get_default_time_zone()
+        attributes["segments"] = [
+            {"start": start.replace(tzinfo=tz).isoformat(), "end": end.replace(tzinfo=tz).isoformat()}
+            for start, end in (selection.runs() if selection is not None else ())
+        ]
+        return attributes
@@ -20,6 +20,22 @@ from .const import (
     CONF_SECOND_EXPENSIVE_TIME_WINDOW_START,
     CONF_SECOND_EXPENSIVE_TIME_WINDOW_END,
     CONF_SECOND_EXPENSIVE_WINDOW_DURATION_HOURS,
+    CONF_CHEAPEST_SLOTS_START,
+    CONF_CHEAPEST_SLOTS_END,
+    CONF_CHEAPEST_SLOTS_DURATION,
+    CONF_SCHEDULE_START,
+    CONF_SCHEDULE_END,
+    CONF_SCHEDULE_RUNTIME,
+    CONF_SCHEDULE_MAX_SEGMENTS,
+    CONF_SCHEDULE_MIN_SEGMENT,
+    CONF_ROLLING_WINDOW_DURATION,
+    CONF_ROLLING_WINDOW_HORIZON,
+    CONF_BATTERY_CAPACITY,
+    CONF_BATTERY_CHARGE_POWER,
+    CONF_BATTERY_DISCHARGE_POWER,
+    CONF_BATTERY_EFFICIENCY,
+    CONF_BATTERY_MIN_SOC,
+    CONF_BATTERY_MAX_SOC,
     CONF_USE_HOURLY_PRICES,
     CONF_LOW_PRICE_THRESHOLD,
     CONF_USE_GROSS_PRICES,
@@ -33,6 +49,24 @@ from .const import (
     DEFAULT_SECOND_EXPENSIVE_TIME_WINDOW_START,
     DEFAULT_SECOND_EXPENSIVE_TIME_WINDOW_END,
     DEFAULT_SECOND_EXPENSIVE_WINDOW_DURATION_HOURS,
+    DEFAULT_CHEAPEST_SLOTS_START,
+    DEFAULT_CHEAPEST_SLOTS_END,
+    DEFAULT_CHEAPEST_SLOTS_DURATION,
+    DEFAULT_SCHEDULE_START,
+    DEFAULT_SCHEDULE_END,
+    DEFAULT_SCHEDULE_RUNTIME,
+    DEFAULT_SCHEDULE_MAX_SEGMENTS,
+    DEFAULT_SCHEDULE_MIN_SEGMENT,
+    MAX_SCHEDULE_SEGMENTS,
+    DEFAULT_ROLLING_WINDOW_DURATION,
+    DEFAULT_ROLLING_WINDOW_HORIZON,
+    MAX_ROLLING_WINDOW_HORIZON,
+    DEFAULT_BATTERY_CAPACITY,
+    DEFAULT_BATTERY_CHARGE_POWER,
+    DEFAULT_BATTERY_DISCHARGE_POWER,
+    DEFAULT_BATTERY_EFFICIENCY,
+    DEFAULT_BATTERY_MIN_SOC,
+    DEFAULT_BATTERY_MAX_SOC,
     DEFAULT_USE_HOURLY_PRICES,
     DEFAULT_USE_GROSS_PRICES,
     DEFAULT_LOW_PRICE_THRESHOLD,
@@ -52,6 +86,10 @@ SECTION_PRICING = "pricing"
 SECTION_CHEAPEST_WINDOW = "cheapest_window"
 SECTION_EXPENSIVE_WINDOW = "expensive_window"
 SECTION_SECOND_EXPENSIVE_WINDOW = "second_expensive_window"
+SECTION_CHEAPEST_SLOTS = "cheapest_slots"
+SECTION_SCHEDULE = "schedule"
+SECTION_ROLLING_WINDOW = "rolling_window"
+SECTION_BATTERY = "battery"
 
 SECTION_KEYS = frozenset(
     {
@@ -59,6 +97,10 @@ SECTION_KEYS = frozenset(
         SECTION_CHEAPEST_WINDOW,
         SECTION_EXPENSIVE_WINDOW,
         SECTION_SECOND_EXPENSIVE_WINDOW,
+        SECTION_CHEAPEST_SLOTS,
+        SECTION_SCHEDULE,
+        SECTION_ROLLING_WINDOW,
+        SECTION_BATTERY,
     }
 )
 
@@ -72,6 +114,14 @@ TIME_KEYS = (
     CONF_SECOND_EXPENSIVE_TIME_WINDOW_START,
     CONF_SECOND_EXPENSIVE_TIME_WINDOW_END,
     CONF_SECOND_EXPENSIVE_WINDOW_DURATION_HOURS,
+    CONF_CHEAPEST_SLOTS_START,
+    CONF_CHEAPEST_SLOTS_END,
+    CONF_CHEAPEST_SLOTS_DURATION,
+    CONF_SCHEDULE_START,
+    CONF_SCHEDULE_END,
+    CONF_SCHEDULE_RUNTIME,
+    CONF_SCHEDULE_MIN_SEGMENT,
+    CONF_ROLLING_WINDOW_DURATION,
 )
 
 WINDOW_END_KEYS = frozenset(
@@ -79,6 +129,8 @@ WINDOW_END_KEYS = frozenset(
         CONF_CHEAPEST_TIME_WINDOW_END,
         CONF_EXPENSIVE_TIME_WINDOW_END,
         CONF_SECOND_EXPENSIVE_TIME_WINDOW_END,
+        CONF_CHEAPEST_SLOTS_END,
+        CONF_SCHEDULE_END,
     }
 )
 
@@ -214,6 +266,16 @@ def _time_window_errors(flat: Mapping[str, Any]) -> dict[str, str]:
                 DEFAULT_SECOND_EXPENSIVE_WINDOW_DURATION_HOURS,
             ),
         ),
+        (
+            flat.get(CONF_CHEAPEST_SLOTS_START, DEFAULT_CHEAPEST_SLOTS_START),
+            flat.get(CONF_CHEAPEST_SLOTS_END, DEFAULT_CHEAPEST_SLOTS_END),
+            flat.get(CONF_CHEAPEST_SLOTS_DURATION, DEFAULT_CHEAPEST_SLOTS_DURATION),
+        ),
+        (
+            flat.get(CONF_SCHEDULE_START, DEFAULT_SCHEDULE_START),
+            flat.get(CONF_SCHEDULE_END, DEFAULT_SCHEDULE_END),
+            flat.get(CONF_SCHEDULE_RUNTIME, DEFAULT_SCHEDULE_RUNTIME),
+        ),
     )
     for start, end, duration in pairs:
         ns = normalize_hhmm(str(start))
@@ -230,6 +292,24 @@ def _time_window_errors(flat: Mapping[str, Any]) -> dict[str, str]:
         dm = duration_minutes_from_hhmm(str(duration))
         if dm > span:
             return {"base": "duration_exceeds_search_window"}
+    min_segment = str(flat.get(CONF_SCHEDULE_MIN_SEGMENT, DEFAULT_SCHEDULE_MIN_SEGMENT))
+    if not is_valid_duration_hhmm(min_segment):
+        return {"base": "invalid_duration"}
+    if duration_minutes_from_hhmm(min_segment) > duration_minutes_from_hhmm(
+        str(flat.get(CONF_SCHEDULE_RUNTIME, DEFAULT_SCHEDULE_RUNTIME))
+    ):
+        return {"base": "min_segment_exceeds_runtime"}
+    rolling_duration = str(flat.get(CONF_ROLLING_WINDOW_DURATION, DEFAULT_ROLLING_WINDOW_DURATION))
+    if not is_valid_duration_hhmm(rolling_duration):
+        return {"base": "invalid_duration"}
+    if duration_minutes_from_hhmm(rolling_duration) > 60 * float(
+        flat.get(CONF_ROLLING_WINDOW_HORIZON, DEFAULT_ROLLING_WINDOW_HORIZON)
+    ):
+        return {"base": "duration_exceeds_horizon"}
+    if float(flat.get(CONF_BATTERY_MIN_SOC, DEFAULT_BATTERY_MIN_SOC)) >= float(
+        flat.get(CONF_BATTERY_MAX_SOC, DEFAULT_BATTERY_MAX_SOC)
+    ):
+        return {"base": "invalid_soc_range"}
     return {}
 
 
@@ -239,6 +319,18 @@ def _price_unit_select_options() -> list[dict[str, str]]:
         {"value": UNIT_PLN_KWH, "label": UNIT_PLN_KWH},
     ]
 
+
+def _number_selector(minimum: float, maximum: float, step: float, unit: str) -> selector.NumberSelector:
+    return selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=minimum,
+            max=maximum,
+            step=step,
+            mode=selector.NumberSelectorMode.BOX,
+            unit_of_measurement=unit,
+        )
+    )
+
 def _rce_form_schema(current_data: Mapping[str, Any]) -> vol.Schema:
     def _get(key: str, default: Any) -> Any:
         v = current_data.get(key, default)
@@ -387,6 +479,137 @@ def _rce_form_schema(current_data: Mapping[str, Any]) -> vol.Schema:
         }
     )
 
+    cheapest_slots_inner = vol.Schema(
+        {
+            vol.Required(
+                CONF_CHEAPEST_SLOTS_START,
+                default=_get(CONF_CHEAPEST_SLOTS_START, DEFAULT_CHEAPEST_SLOTS_START),
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=_start_time_select_options(),
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                )
+            ),
+            vol.Required(
+                CONF_CHEAPEST_SLOTS_END,
+                default=_get(CONF_CHEAPEST_SLOTS_END, DEFAULT_CHEAPEST_SLOTS_END),
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=_end_time_select_options(),
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                )
+            ),
+            vol.Required(
+                CONF_CHEAPEST_SLOTS_DURATION,
+                default=_get(CONF_CHEAPEST_SLOTS_DURATION, DEFAULT_CHEAPEST_SLOTS_DURATION),
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=_duration_select_options(),
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                )
+            ),
+        }
+    )
+
+    schedule_inner = vol.Schema(
+        {
+            vol.Required(
+                CONF_SCHEDULE_START,
+                default=_get(CONF_SCHEDULE_START, DEFAULT_SCHEDULE_START),
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=_start_time_select_options(),
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                )
+            ),
+            vol.Required(
+                CONF_SCHEDULE_END,
+                default=_get(CONF_SCHEDULE_END, DEFAULT_SCHEDULE_END),
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=_end_time_select_options(),
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                )
+            ),
+            vol.Required(
+                CONF_SCHEDULE_RUNTIME,
+                default=_get(CONF_SCHEDULE_RUNTIME, DEFAULT_SCHEDULE_RUNTIME),
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=_duration_select_options(),
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                )
+            ),
+            vol.Required(
+                CONF_SCHEDULE_MAX_SEGMENTS,
+                default=_get(CONF_SCHEDULE_MAX_SEGMENTS, DEFAULT_SCHEDULE_MAX_SEGMENTS),
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=1,
+                    max=MAX_SCHEDULE_SEGMENTS,
+                    step=1,
+                    mode=selector.NumberSelectorMode.BOX,
+                )
+            ),
+            vol.Required(
+                CONF_SCHEDULE_MIN_SEGMENT,
+                default=_get(CONF_SCHEDULE_MIN_SEGMENT, DEFAULT_SCHEDULE_MIN_SEGMENT),
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=_duration_select_options(),
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                )
+            ),
+        }
+    )
+
+    rolling_window_inner = vol.Schema(
+        {
+            vol.Required(
+                CONF_ROLLING_WINDOW_DURATION,
+                default=_get(CONF_ROLLING_WINDOW_DURATION, DEFAULT_ROLLING_WINDOW_DURATION),
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=_duration_select_options(),
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                )
+            ),
+            vol.Required(
+                CONF_ROLLING_WINDOW_HORIZON,
+                default=_get(CONF_ROLLING_WINDOW_HORIZON, DEFAULT_ROLLING_WINDOW_HORIZON),
+            ): _number_selector(1, MAX_ROLLING_WINDOW_HORIZON, 1, "h"),
+        }
+    )
+
+    battery_inner = vol.Schema(
+        {
+            vol.Required(
+                CONF_BATTERY_CAPACITY,
+                default=_get(CONF_BATTERY_CAPACITY, DEFAULT_BATTERY_CAPACITY),
+            ): _number_selector(0, 1000, 0.1, "kWh"),
+            vol.Required(
+                CONF_BATTERY_CHARGE_POWER,
+                default=_get(CONF_BATTERY_CHARGE_POWER, DEFAULT_BATTERY_CHARGE_POWER),
+            ): _number_selector(0.1, 500, 0.1, "kW"),
+            vol.Required(
+                CONF_BATTERY_DISCHARGE_POWER,
+                default=_get(CONF_BATTERY_DISCHARGE_POWER, DEFAULT_BATTERY_DISCHARGE_POWER),
+            ): _number_selector(0.1, 500, 0.1, "kW"),
+            vol.Required(
+                CONF_BATTERY_EFFICIENCY,
+                default=_get(CONF_BATTERY_EFFICIENCY, DEFAULT_BATTERY_EFFICIENCY),
+            ): _number_selector(50, 100, 1, "%"),
+            vol.Required(
+                CONF_BATTERY_MIN_SOC,
+                default=_get(CONF_BATTERY_MIN_SOC, DEFAULT_BATTERY_MIN_SOC),
+            ): _number_selector(0, 100, 1, "%"),
+            vol.Required(
+                CONF_BATTERY_MAX_SOC,
+                default=_get(CONF_BATTERY_MAX_SOC, DEFAULT_BATTERY_MAX_SOC),
+            ): _number_selector(0, 100, 1, "%"),
+        }
+    )
+
     return vol.Schema(
         {
             vol.Required(SECTION_PRICING): section(pricing_inner, {"collapsed": False}),
@@ -395,6 +618,10 @@ def _rce_form_schema(current_data: Mapping[str, Any]) -> vol.Schema:
             vol.Required(SECTION_SECOND_EXPENSIVE_WINDOW): section(
                 second_expensive_inner, {"collapsed": True}
             ),
+            vol.Required(SECTION_CHEAPEST_SLOTS): section(cheapest_slots_inner, {"collapsed": True}),
+            vol.Required(SECTION_SCHEDULE): section(schedule_inner, {"collapsed": True}),
+            vol.Required(SECTION_ROLLING_WINDOW): section(rolling_window_inner, {"collapsed": True}),
+            vol.Required(SECTION_BATTERY): section(battery_inner, {"collapsed": True}),
         }
     )
 
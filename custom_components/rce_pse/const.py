@@ -10,9 +10,15 @@ PSE_API_BASE_URL: Final[str] = "https://api.raporty.pse.pl/api"
 PSE_ENDPOINT_RCE_PLN: Final[str] = "rce-pln"
 PSE_ENDPOINT_PDGSZ: Final[str] = "pdgsz"
 RCE_PLN_API_SELECT: Final[str] = "dtime,period,rce_pln,business_date"
+RCE_PLN_PROBE_SELECT: Final[str] = "business_date"
 PDGSZ_API_SELECT: Final[str] = "business_date,dtime,is_active,usage_fcst"
 PSE_API_PAGE_SIZE: Final[int] = 200
+RCE_PLN_REQUEST_TIMEOUT: Final[int] = 20
+PDGSZ_REQUEST_TIMEOUT: Final[int] = 20
 API_UPDATE_INTERVAL: Final[timedelta] = timedelta(minutes=30)
+SNAPSHOT_STORAGE_VERSION: Final[int] = 1
+SNAPSHOT_SAVE_DELAY: Final[int] = 10
+WINDOW_QUERY_CACHE_SIZE: Final[int] = 64
 PDGSZ_USAGE_FCST_TO_ATTR: Final[dict[int, str]] = {
     0: "recommended_usage",
     1: "normal_usage",
@@ -34,6 +40,26 @@ CONF_SECOND_EXPENSIVE_TIME_WINDOW_START: Final[str] = "second_expensive_time_win
 CONF_SECOND_EXPENSIVE_TIME_WINDOW_END: Final[str] = "second_expensive_time_window_end"
 CONF_SECOND_EXPENSIVE_WINDOW_DURATION_HOURS: Final[str] = "second_expensive_window_duration_hours"
 
+CONF_CHEAPEST_SLOTS_START: Final[str] = "cheapest_slots_start"
+CONF_CHEAPEST_SLOTS_END: Final[str] = "cheapest_slots_end"
+CONF_CHEAPEST_SLOTS_DURATION: Final[str] = "cheapest_slots_duration"
+
+CONF_SCHEDULE_START: Final[str] = "schedule_start"
+CONF_SCHEDULE_END: Final[str] = "schedule_end"
+CONF_SCHEDULE_RUNTIME: Final[str] = "schedule_runtime"
+CONF_SCHEDULE_MAX_SEGMENTS: Final[str] = "schedule_max_segments"
+CONF_SCHEDULE_MIN_SEGMENT: Final[str] = "schedule_min_segment"
+
+CONF_ROLLING_WINDOW_DURATION: Final[str] = "rolling_window_duration"
+CONF_ROLLING_WINDOW_HORIZON: Final[str] = "rolling_window_horizon"
+
+CONF_BATTERY_CAPACITY: Final[str] = "battery_capacity"
+CONF_BATTERY_CHARGE_POWER: Final[str] = "battery_charge_power"
+CONF_BATTERY_DISCHARGE_POWER: Final[str] = "battery_discharge_power"
+CONF_BATTERY_EFFICIENCY: Final[str] = "battery_round_trip_efficiency"
+CONF_BATTERY_MIN_SOC: Final[str] = "battery_min_soc"
+CONF_BATTERY_MAX_SOC: Final[str] = "battery_max_soc"
+
 CONF_WINDOW_DURATION_HOURS: Final[str] = "window_duration_hours"
 CONF_USE_HOURLY_PRICES: Final[str] = "use_hourly_prices"
 CONF_LOW_PRICE_THRESHOLD: Final[str] = "low_price_threshold"
@@ -56,5 +82,24 @@ DEFAULT_USE_GROSS_PRICES: Final[bool] = False
 DEFAULT_SECOND_EXPENSIVE_TIME_WINDOW_START: Final[str] = "06:00"
 DEFAULT_SECOND_EXPENSIVE_TIME_WINDOW_END: Final[str] = "10:00"
 DEFAULT_SECOND_EXPENSIVE_WINDOW_DURATION_HOURS: Final[str] = "02:00"
+DEFAULT_CHEAPEST_SLOTS_START: Final[str] = "00:00"
+DEFAULT_CHEAPEST_SLOTS_END: Final[str] = "00:00"
+DEFAULT_CHEAPEST_SLOTS_DURATION: Final[str] = "04:00"
+DEFAULT_SCHEDULE_START: Final[str] = "00:00"
+DEFAULT_SCHEDULE_END: Final[str] = "00:00"
+DEFAULT_SCHEDULE_RUNTIME: Final[str] = "03:00"
+DEFAULT_SCHEDULE_MAX_SEGMENTS: Final[int] = 2
+DEFAULT_SCHEDULE_MIN_SEGMENT: Final[str] = "01:00"
+MAX_SCHEDULE_SEGMENTS: Final[int] = 12
+DEFAULT_ROLLING_WINDOW_DURATION: Final[str] = "03:00"
+DEFAULT_ROLLING_WINDOW_HORIZON: Final[int] = 12
+MAX_ROLLING_WINDOW_HORIZON: Final[int] = 48
+DEFAULT_BATTERY_CAPACITY: Final[float] = 0.0
+DEFAULT_BATTERY_CHARGE_POWER: Final[float] = 5.0
+DEFAULT_BATTERY_DISCHARGE_POWER: Final[float] = 5.0
+DEFAULT_BATTERY_EFFICIENCY: Final[float] = 90.0
+DEFAULT_BATTERY_MIN_SOC: Final[float] = 10.0
+DEFAULT_BATTERY_MAX_SOC: Final[float] = 100.0
+BATTERY_SOC_STEPS: Final[int] = 200
 DEFAULT_LOW_PRICE_THRESHOLD: Final[float] = 0.0
 DEFAULT_PRICE_UNIT: Final[str] = UNIT_PLN_MWH
\ No newline at end of file
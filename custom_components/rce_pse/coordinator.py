@@ -2,37 +2,95 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from collections import defaultdict
-from datetime import timedelta
+from bisect import bisect_right
+from collections.abc import Mapping, Sequence
+from datetime import datetime, timedelta
 from typing import Any
 
 import aiohttp
 import async_timeout
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 
-from .time_window import parse_pse_dtime
+from .battery import BatteryParameters, BatteryPlan, optimize_battery
 from .const import (
     API_UPDATE_INTERVAL,
+    BATTERY_SOC_STEPS,
+    CONF_BATTERY_CAPACITY,
+    CONF_BATTERY_CHARGE_POWER,
+    CONF_BATTERY_DISCHARGE_POWER,
+    CONF_BATTERY_EFFICIENCY,
+    CONF_BATTERY_MAX_SOC,
+    CONF_BATTERY_MIN_SOC,
+    CONF_LOW_PRICE_THRESHOLD,
     CONF_PRICE_UNIT,
-    UNIT_PLN_KWH,
-    CONF_USE_HOURLY_PRICES,
+    CONF_ROLLING_WINDOW_DURATION,
+    CONF_ROLLING_WINDOW_HORIZON,
     CONF_USE_GROSS_PRICES,
+    CONF_USE_HOURLY_PRICES,
+    DEFAULT_BATTERY_CAPACITY,
+    DEFAULT_BATTERY_CHARGE_POWER,
+    DEFAULT_BATTERY_DISCHARGE_POWER,
+    DEFAULT_BATTERY_EFFICIENCY,
+    DEFAULT_BATTERY_MAX_SOC,
+    DEFAULT_BATTERY_MIN_SOC,
+    DEFAULT_LOW_PRICE_THRESHOLD,
     DEFAULT_PRICE_UNIT,
-    DEFAULT_USE_HOURLY_PRICES,
+    DEFAULT_ROLLING_WINDOW_DURATION,
+    DEFAULT_ROLLING_WINDOW_HORIZON,
     DEFAULT_USE_GROSS_PRICES,
+    DEFAULT_USE_HOURLY_PRICES,
     DOMAIN,
     MWH_TO_KWH_DIVISOR,
     PDGSZ_API_SELECT,
+    PDGSZ_REQUEST_TIMEOUT,
     PSE_API_BASE_URL,
     PSE_API_PAGE_SIZE,
     PSE_ENDPOINT_PDGSZ,
     PSE_ENDPOINT_RCE_PLN,
-    PRICE_INTERNAL_DECIMALS,
     RCE_PLN_API_SELECT,
+    RCE_PLN_PROBE_SELECT,
+    RCE_PLN_REQUEST_TIMEOUT,
+    SNAPSHOT_STORAGE_VERSION,
     TAX_RATE,
+    UNIT_PLN_KWH,
+)
+from .dependencies import RCEEntityDispatcher
+from .derived import (
+    CHEAPEST_SLOTS,
+    CONFIGURED_WINDOWS,
+    RCEDerivedData,
+    RollingWindowQuery,
+    ScheduleQuery,
+    WindowQuery,
+    WindowQueryCache,
+    build_derived_data,
+    schedule_spec,
+    window_spec,
 )
+from .fingerprint import RCEDataChanges, RCESnapshotFingerprint
+from .polling import (
+    MIN_COMPLETE_DAY_SLOTS,
+    PDGSZ_POLL_INTERVAL,
+    POLL_TOLERANCE,
+    complete_business_dates,
+    next_poll_time,
+    poll_due,
+)
+from .price_calculator import PriceCalculator
+from .price_series import (
+    SLOT_SECONDS,
+    PriceSeries,
+    datetime_from_epoch,
+    epoch_seconds,
+    price_record_at,
+    record_period_end,
+)
+from .scheduler import RCESlotScheduler
+from .snapshot import RCESnapshot, RCESnapshotStore, merge_business_days
+from .time_window import duration_minutes_from_hhmm
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -41,22 +99,32 @@ def _pse_request_url(endpoint: str) -> str:
     return f"{PSE_API_BASE_URL.rstrip('/')}/{endpoint}"
 
 
-def format_internal_price(value: float) -> str:
-    return f"{value:.{PRICE_INTERNAL_DECIMALS}f}"
-
-
 class RCEPSEDataUpdateCoordinator(DataUpdateCoordinator):
 
+    slot_scheduler: RCESlotScheduler | None = None
+    dispatcher: RCEEntityDispatcher | None = None
+    last_changes: RCEDataChanges | None = None
+
     def __init__(self, hass: HomeAssistant, config_entry=None) -> None:
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
             update_interval=API_UPDATE_INTERVAL,
+            always_update=False,
         )
         self.session = None
         self._last_api_fetch = None
+        self._next_poll_at: datetime | None = None
+        self._next_pdgsz_poll_at: datetime | None = None
+        self._raw_days: dict[str, tuple[dict, ...]] = {}
+        self._series_variants: tuple[PriceSeries | None, dict[tuple, PriceSeries]] = (None, {})
+        self.window_cache = WindowQueryCache()
+        self._next_windows: dict[RollingWindowQuery, tuple[str | None, tuple[dict, ...]]] = {}
         self.config_entry = config_entry
+        self.slot_scheduler = RCESlotScheduler(hass, self)
+        self.dispatcher = RCEEntityDispatcher(self)
+        self._snapshot_store: RCESnapshotStore | None = None
 
     def _get_config_value(self, key: str, default: Any) -> Any:
         if not self.config_entry:
@@ -71,29 +139,41 @@ class RCEPSEDataUpdateCoordinator(DataUpdateCoordinator):
 
     async def _async_update_data(self) -> dict[str, Any]:
         now = dt_util.now()
+        self.last_changes = None
         
-        if (self._last_api_fetch and 
-            self.data and 
-            now - self._last_api_fetch < API_UPDATE_INTERVAL):
-            time_since_fetch = now - self._last_api_fetch
-            _LOGGER.debug("Using cached data - last API fetch was %s ago (max interval: %s)", 
-                         time_since_fetch, API_UPDATE_INTERVAL)
+        next_fetch = self._next_api_fetch()
+        if next_fetch and self.data and now < next_fetch - POLL_TOLERANCE:
+            _LOGGER.debug("Using cached data - next API fetch scheduled at %s (last fetch: %s)",
+                         next_fetch, self._last_api_fetch)
+            self._apply_poll_schedule(next_fetch)
             return self.data
         
         _LOGGER.debug("Fetching fresh data from PSE API - last fetch: %s", self._last_api_fetch)
         
         if self.session is None:
-            self.session = aiohttp.ClientSession()
+            self.session = async_get_clientsession(self.hass)
             
         try:
             async with async_timeout.timeout(30):
-                data = await self._fetch_data()
+                rce_due = poll_due(self._next_poll_at, now)
+                fetch_rce = rce_due
+                if rce_due and await self._awaiting_publication(now):
+                    fetch_rce = False
+                    if not poll_due(self._next_pdgsz_poll_at, now):
+                        self._last_api_fetch = now
+                        self._schedule_next_poll(now, self.data, pdgsz=False)
+                        return self.data
+                data = self._detect_changes(await self._fetch_data(fetch_rce))
+                if self.last_changes is None or self.last_changes:
+                    data = await self._async_attach_battery_plan(data)
                 self._last_api_fetch = now
+                self._schedule_next_poll(now, data, rce=rce_due)
                 _LOGGER.debug("Successfully fetched fresh data from PSE API, records count: %d", 
                             len(data.get("raw_data", [])))
                 return data
         except asyncio.TimeoutError as exception:
             self._last_api_fetch = now
+            self._schedule_next_poll(now, self.data)
             _LOGGER.error("Timeout communicating with PSE API: %s", exception)
             if self.data:
                 _LOGGER.warning("Using existing data due to API timeout")
@@ -101,20 +181,150 @@ class RCEPSEDataUpdateCoordinator(DataUpdateCoordinator):
             raise UpdateFailed(f"Timeout communicating with API: {exception}") from exception
         except Exception as exception:
             self._last_api_fetch = now
+            self._schedule_next_poll(now, self.data)
             _LOGGER.error("Error communicating with PSE API: %s", exception)
             if self.data:
                 _LOGGER.warning("Using existing data due to API error")
                 return self.data
             raise UpdateFailed(f"Error communicating with API: {exception}") from exception
 
-    async def _fetch_data(self) -> dict[str, Any]:
+    def _detect_changes(self, data: dict[str, Any]) -> dict[str, Any]:
+        fingerprint = data.get("fingerprint")
+        previous = self.data.get("fingerprint") if isinstance(self.data, dict) else None
+        if not isinstance(fingerprint, RCESnapshotFingerprint) or not isinstance(
+            previous, RCESnapshotFingerprint
+        ):
+            return data
+        changes = fingerprint.changes_since(previous)
+        self.last_changes = changes
+        if not changes:
+            _LOGGER.debug("PSE data unchanged (fingerprint %s), keeping current snapshot", fingerprint.digest)
+            return {**self.data, "last_update": data["last_update"]}
+        _LOGGER.debug(
+            "PSE data changed for business dates %s, PDGSZ dates %s",
+            sorted(changes.business_dates),
+            sorted(changes.pdgsz_dates),
+        )
+        return data
+
+    def _next_api_fetch(self) -> datetime | None:
+        next_fetch = self._next_poll_at
+        if next_fetch is None:
+            if self._last_api_fetch is None:
+                return None
+            next_fetch = self._last_api_fetch + API_UPDATE_INTERVAL
+        if self._next_pdgsz_poll_at is None:
+            return next_fetch
+        return min(next_fetch, self._next_pdgsz_poll_at)
+
+    def _schedule_next_poll(
+        self, now: datetime, data: Mapping[str, Any] | None, rce: bool = True, pdgsz: bool = True
+    ) -> None:
+        if rce:
+            raw_data = data.get("raw_data") if data else None
+            self._next_poll_at = next_poll_time(now, complete_business_dates(raw_data))
+        if pdgsz:
+            self._next_pdgsz_poll_at = now + PDGSZ_POLL_INTERVAL
+        _LOGGER.debug(
+            "Next PSE API poll scheduled at %s, PDGSZ poll at %s", self._next_poll_at, self._next_pdgsz_poll_at
+        )
+        self._apply_poll_schedule(self._next_api_fetch())
+
+    def _apply_poll_schedule(self, next_fetch: datetime) -> None:
+        self.update_interval = max(next_fetch - dt_util.now(), POLL_TOLERANCE)
+
+    async def _awaiting_publication(self, now: datetime) -> bool:
+        if not self.data or self.session is None:
+            return False
+        complete = complete_business_dates(self.data.get("raw_data"))
+        today = now.strftime("%Y-%m-%d")
+        tomorrow = (now + timedelta(days=1)).strftime("%Y-%m-%d")
+        if today not in complete or tomorrow in complete:
+            return False
+        try:
+            published = await self._probe_business_date(self.session, tomorrow)
+        except (aiohttp.ClientError, TimeoutError, UpdateFailed) as exception:
+            _LOGGER.debug("PSE publication probe failed, falling back to full fetch: %s", exception)
+            return False
+        if published:
+            _LOGGER.debug("PSE prices for %s published, running full fetch", tomorrow)
+            return False
+        _LOGGER.debug("PSE prices for %s not published yet", tomorrow)
+        return True
+
+    async def _probe_business_date(self, session: aiohttp.ClientSession, business_date: str) -> bool:
+        params = {
+            "$select": RCE_PLN_PROBE_SELECT,
+            "$filter": f"business_date eq '{business_date}'",
+            "$first": 1,
+        }
+        async with (
+            async_timeout.timeout(RCE_PLN_REQUEST_TIMEOUT),
+            session.get(
+                _pse_request_url(PSE_ENDPOINT_RCE_PLN),
+                params=params,
+                headers={"Accept": "application/json"},
+            ) as response,
+        ):
+            if response.status != 200:
+                raise UpdateFailed(f"API returned status {response.status}")
+            data = await response.json()
+            return bool(data.get("value"))
+
+    async def _fetch_data(self, fetch_rce: bool = True) -> dict[str, Any]:
         today = dt_util.now().strftime("%Y-%m-%d")
-        _LOGGER.debug("Fetching PSE data for business_date >= %s", today)
-        
+        since = self._first_missing_business_date(today) if fetch_rce else None
+        if since is None:
+            _LOGGER.debug("Skipping RCE request, refreshing PDGSZ data only")
+        else:
+            _LOGGER.debug("Fetching PSE data for business_date >= %s", since)
+
+        session = self.session
+        if session is None:
+            raise UpdateFailed("HTTP session not initialized")
+
+        requests = [self._fetch_pdgsz_with_timeout(session, today)]
+        if since is not None:
+            requests.append(self._fetch_rce_pln(session, since))
+        pdgsz_result, *rce_results = await asyncio.gather(*requests, return_exceptions=True)
+        rce_result = rce_results[0] if rce_results else []
+
+        if isinstance(pdgsz_result, BaseException):
+            _LOGGER.warning("PDGSZ fetch failed, using empty list: %s", pdgsz_result)
+            pdgsz_data = []
+        else:
+            pdgsz_data = pdgsz_result
+
+        if isinstance(rce_result, aiohttp.ClientError):
+            _LOGGER.error("HTTP client error fetching PSE data: %s", rce_result)
+            raise UpdateFailed(f"Error fetching data: {rce_result}") from rce_result
+        if isinstance(rce_result, BaseException):
+            raise rce_result
+
+        held_days = self._raw_days
+        self._raw_days = merge_business_days(held_days, rce_result, today, since)
+        reuse_dates = [bd for bd, day in self._raw_days.items() if held_days.get(bd) is day]
+        rce_records = [record for day in self._raw_days.values() for record in day]
+        _LOGGER.debug(
+            "Merged %d fetched records, reusing business dates %s", len(rce_result), reuse_dates
+        )
+
+        fetched_at = dt_util.now()
+        self._async_save_snapshot(RCESnapshot(fetched_at, rce_records, pdgsz_data))
+        return self._build_snapshot_data(rce_records, pdgsz_data, fetched_at, reuse_dates)
+
+    def _first_missing_business_date(self, today: str) -> str | None:
+        tomorrow = (dt_util.parse_date(today) + timedelta(days=1)).isoformat()
+        for business_date in (today, tomorrow):
+            if len(self._raw_days.get(business_date, ())) < MIN_COMPLETE_DAY_SLOTS:
+                return business_date
+        return None
+
+    async def _fetch_rce_pln(self, session: aiohttp.ClientSession, since: str) -> list[dict]:
         rce_url = _pse_request_url(PSE_ENDPOINT_RCE_PLN)
         params = {
             "$select": RCE_PLN_API_SELECT,
-            "$filter": f"business_date ge '{today}'",
+            "$filter": f"business_date ge '{since}'",
             "$first": PSE_API_PAGE_SIZE,
         }
         
@@ -124,64 +334,101 @@ class RCEPSEDataUpdateCoordinator(DataUpdateCoordinator):
 
         _LOGGER.debug("PSE API request URL: %s, params: %s", rce_url, params)
 
-        session = self.session
-        if session is None:
-            raise UpdateFailed("HTTP session not initialized")
+        async with (
+            async_timeout.timeout(RCE_PLN_REQUEST_TIMEOUT),
+            session.get(rce_url, params=params, headers=headers) as response,
+        ):
+            _LOGGER.debug("PSE API response status: %d", response.status)
+            
+            if response.status != 200:
+                _LOGGER.error("PSE API returned error status: %d", response.status)
+                raise UpdateFailed(f"API returned status {response.status}")
+            
+            data = await response.json()
+            
+            if "value" not in data:
+                _LOGGER.error("PSE API response missing 'value' field")
+                raise UpdateFailed("Invalid API response format")
+            
+            record_count = len(data["value"])
+            _LOGGER.debug("PSE API returned %d records", record_count)
+            
+            if record_count == 0:
+                _LOGGER.warning("PSE API returned no data records")
+            
+            return data["value"]
+
+    async def _fetch_pdgsz_with_timeout(
+        self, session: aiohttp.ClientSession, today: str
+    ) -> list[dict]:
+        async with async_timeout.timeout(PDGSZ_REQUEST_TIMEOUT):
+            return await self._fetch_pdgsz(session, today)
+
+    def _build_snapshot_data(
+        self,
+        rce_records: list[dict],
+        pdgsz_data: list[dict],
+        fetched_at: datetime,
+        reuse_dates: Sequence[str] = (),
+    ) -> dict[str, Any]:
+        series = self._transform_price_records(rce_records)
+        return {
+            "raw_data": series,
+            "pdgsz_data": pdgsz_data,
+            "last_update": fetched_at.isoformat(),
+            "derived": self._build_derived_data(series, reuse_dates),
+            "fingerprint": RCESnapshotFingerprint.from_data(series, pdgsz_data),
+        }
+
+    def _get_snapshot_store(self) -> RCESnapshotStore | None:
+        if self._snapshot_store is None and self.config_entry is not None:
+            self._snapshot_store = RCESnapshotStore(self.hass, self.config_entry.entry_id)
+        return self._snapshot_store
+
+    def _async_save_snapshot(self, snapshot: RCESnapshot) -> None:
         try:
-            async with session.get(
-                rce_url, params=params, headers=headers
-            ) as response:
-                _LOGGER.debug("PSE API response status: %d", response.status)
-                
-                if response.status != 200:
-                    _LOGGER.error("PSE API returned error status: %d", response.status)
-                    raise UpdateFailed(f"API returned status {response.status}")
-                
-                data = await response.json()
-                
-                if "value" not in data:
-                    _LOGGER.error("PSE API response missing 'value' field")
-                    raise UpdateFailed("Invalid API response format")
-                
-                record_count = len(data["value"])
-                _LOGGER.debug("PSE API returned %d records", record_count)
-                
-                if record_count == 0:
-                    _LOGGER.warning("PSE API returned no data records")
-                
-                raw_data = data["value"]
-                
-                use_hourly_prices = self._get_config_value(CONF_USE_HOURLY_PRICES, DEFAULT_USE_HOURLY_PRICES)
-                
-                if use_hourly_prices:
-                    _LOGGER.debug("Hourly prices option enabled, calculating hourly averages")
-                    processed_data = self._calculate_hourly_averages(raw_data)
-                else:
-                    _LOGGER.debug("Hourly prices option disabled, using original 15-minute data")
-                    processed_data = self._add_neg_to_zero_key(raw_data)
-
-                use_gross_prices = self._get_config_value(CONF_USE_GROSS_PRICES, DEFAULT_USE_GROSS_PRICES)
-                if use_gross_prices:
-                    _LOGGER.debug("Gross prices option enabled, applying TAX_RATE %.2f to all price fields", TAX_RATE)
-                    processed_data = self._apply_tax_to_data(processed_data)
-
-                processed_data = self._finalize_price_records(processed_data)
-
-                try:
-                    pdgsz_data = await self._fetch_pdgsz(session, today)
-                except Exception as pdgsz_exception:
-                    _LOGGER.warning("PDGSZ fetch failed, using empty list: %s", pdgsz_exception)
-                    pdgsz_data = []
-                
-                return {
-                    "raw_data": processed_data,
-                    "pdgsz_data": pdgsz_data,
-                    "last_update": dt_util.now().isoformat(),
-                }
-                
-        except aiohttp.ClientError as exception:
-            _LOGGER.error("HTTP client error fetching PSE data: %s", exception)
-            raise UpdateFailed(f"Error fetching data: {exception}") from exception
+            store = self._get_snapshot_store()
+            if store is not None:
+                store.async_schedule_save(snapshot)
+        except (KeyError, TypeError, ValueError) as exception:
+            _LOGGER.warning(
+                "Failed to schedule PSE snapshot save (version %s): %s", SNAPSHOT_STORAGE_VERSION, exception
+            )
+
+    async def async_restore_snapshot(self) -> bool:
+        store = self._get_snapshot_store()
+        if store is None:
+            return False
+        snapshot = await store.async_load()
+        if snapshot is None:
+            _LOGGER.debug("No cached PSE snapshot available")
+            return False
+
+        today = dt_util.now().strftime("%Y-%m-%d")
+        rce_records = [r for r in snapshot.rce_records if r.get("business_date", "") >= today]
+        if not any(r.get("business_date") == today for r in rce_records):
+            _LOGGER.debug("Cached PSE snapshot from %s does not cover %s", snapshot.fetched_at, today)
+            return False
+        pdgsz_data = [r for r in snapshot.pdgsz_records if r.get("business_date", "") >= today]
+
+        self._raw_days = merge_business_days({}, rce_records, today, today)
+        data = await self._async_attach_battery_plan(
+            self._build_snapshot_data(rce_records, pdgsz_data, snapshot.fetched_at)
+        )
+        self._last_api_fetch = snapshot.fetched_at
+        self._schedule_next_poll(snapshot.fetched_at, data)
+        self.last_changes = None
+        self.async_set_updated_data(data)
+        _LOGGER.debug(
+            "Restored cached PSE snapshot from %s with %d records",
+            snapshot.fetched_at,
+            len(rce_records),
+        )
+        return True
+
+    def snapshot_is_stale(self) -> bool:
+        next_fetch = self._next_api_fetch()
+        return next_fetch is None or dt_util.now() >= next_fetch - POLL_TOLERANCE
 
     async def _fetch_pdgsz(self, session: aiohttp.ClientSession, today: str) -> list[dict]:
         pdgsz_first_url = _pse_request_url(PSE_ENDPOINT_PDGSZ)
@@ -216,134 +463,221 @@ class RCEPSEDataUpdateCoordinator(DataUpdateCoordinator):
         _LOGGER.debug("PDGSZ fetched %d active hourly records", len(result))
         return result
 
-    def _calculate_hourly_averages(self, raw_data: list[dict]) -> list[dict]:
-        if not raw_data:
-            return raw_data
-        
-        hourly_groups = defaultdict(list)
-        
-        for record in raw_data:
-            try:
-                dtime = parse_pse_dtime(record["dtime"])
-                period_start = dtime - timedelta(minutes=15)
-                date_hour_key = f"{period_start.strftime('%Y-%m-%d')}_{period_start.hour:02d}"
-                hourly_groups[date_hour_key].append(record)
-            except (ValueError, KeyError) as e:
-                _LOGGER.warning("Failed to parse record dtime: %s, error: %s", record.get("dtime"), e)
-                continue
-        
-        processed_data = []
-        
-        for date_hour_key, records in hourly_groups.items():
-            if not records:
-                continue
-                
-            prices = []
-            for record in records:
-                try:
-                    price = float(record["rce_pln"])
-                    prices.append(price)
-                except (ValueError, KeyError) as e:
-                    _LOGGER.warning("Failed to parse price from record: %s, error: %s", record.get("rce_pln"), e)
-                    continue
-            
-            if not prices:
-                continue
-                
-            average_price = sum(prices) / len(prices)
-            
-            prices_neg_to_zero = [max(0, price) for price in prices]
-            average_price_neg_to_zero = sum(prices_neg_to_zero) / len(prices_neg_to_zero)
-            
-            _LOGGER.debug("Calculated hourly average for %s: %.2f PLN (from %d records)", 
-                         date_hour_key, average_price, len(prices))
-            _LOGGER.debug("Calculated hourly average (neg to zero) for %s: %.2f PLN", 
-                         date_hour_key, average_price_neg_to_zero)
-            
-            for record in records:
-                try:
-                    new_record = record.copy()
-                    new_record["rce_pln"] = format_internal_price(average_price)
-                    new_record["rce_pln_neg_to_zero"] = format_internal_price(average_price_neg_to_zero)
-                    processed_data.append(new_record)
-                except (ValueError, KeyError) as e:
-                    _LOGGER.warning("Failed to process record: %s, error: %s", record, e)
-                    continue
-        
-        _LOGGER.debug("Processed %d records with hourly averages (original: %d)", 
-                     len(processed_data), len(raw_data))
-        
-        return processed_data
+    def get_price_record_at(self, when: datetime) -> Mapping | None:
+        if not self.data or not self.data.get("raw_data"):
+            return None
+        if when.tzinfo is not None:
+            when = dt_util.as_local(when).replace(tzinfo=None)
+        return price_record_at(self.data["raw_data"], when)
 
-    def _add_neg_to_zero_key(self, raw_data: list[dict]) -> list[dict]:
-        if not raw_data:
-            return raw_data
-        
-        processed_data = []
-        
-        for record in raw_data:
-            try:
-                new_record = record.copy()
-                price = float(record["rce_pln"])
-                neg_to_zero_price = max(0, price)
-                new_record["rce_pln_neg_to_zero"] = format_internal_price(neg_to_zero_price)
-                processed_data.append(new_record)
-            except (ValueError, KeyError) as e:
-                _LOGGER.warning("Failed to process record for neg_to_zero: %s, error: %s", record, e)
-                processed_data.append(record)
-        
-        _LOGGER.debug("Added rce_pln_neg_to_zero key to %d records", len(processed_data))
-        
-        return processed_data
+    def find_window(self, query: WindowQuery) -> list[dict]:
+        derived = self.data.get("derived") if self.data else None
+        if not isinstance(derived, RCEDerivedData):
+            return []
+        window = derived.optimal_window(query)
+        if window is not None:
+            return window
+        day = derived.day(query.business_date)
+        if day is None:
+            return []
 
-    def _apply_tax_to_data(self, data: list[dict]) -> list[dict]:
-        if not data:
-            return data
+        def compute() -> list[dict]:
+            return PriceCalculator.find_optimal_window(
+                list(day.records),
+                query.business_date,
+                query.search_start,
+                query.search_end,
+                query.duration_minutes,
+                is_max=query.is_max,
+            )
+
+        fingerprint = self.data.get("fingerprint")
+        if not isinstance(fingerprint, RCESnapshotFingerprint):
+            return compute()
+        return list(self.window_cache.get_or_compute((fingerprint.digest, query), compute))
 
-        processed_data: list[dict] = []
+    def find_schedule(self, query: ScheduleQuery) -> list[list[dict]]:
+        derived = self.data.get("derived") if self.data else None
+        if not isinstance(derived, RCEDerivedData):
+            return []
+        selection = derived.schedule(query)
+        if selection is not None:
+            return selection.segments()
+        day = derived.day(query.business_date)
+        if day is None:
+            return []
 
-        for record in data:
-            try:
-                new_record = record.copy()
-                base_price = float(new_record["rce_pln"])
-                gross_price = base_price * (1 + TAX_RATE)
-                new_record["rce_pln"] = format_internal_price(gross_price)
+        def compute() -> list[tuple[dict, ...]]:
+            return [tuple(segment) for segment in PriceCalculator.find_schedule(list(day.records), *query)]
+
+        fingerprint = self.data.get("fingerprint")
+        if not isinstance(fingerprint, RCESnapshotFingerprint):
+            return [list(segment) for segment in compute()]
+        segments = self.window_cache.get_or_compute((fingerprint.digest, "schedule", query), compute)
+        return [list(segment) for segment in segments]
+
+    def rolling_window_query(self, is_max: bool = False) -> RollingWindowQuery:
+        return RollingWindowQuery(
+            round(60 * float(self._get_config_value(CONF_ROLLING_WINDOW_HORIZON, DEFAULT_ROLLING_WINDOW_HORIZON))),
+            duration_minutes_from_hhmm(
+                str(self._get_config_value(CONF_ROLLING_WINDOW_DURATION, DEFAULT_ROLLING_WINDOW_DURATION))
+            ),
+            is_max,
+        )
 
-                neg_to_zero_value = new_record.get("rce_pln_neg_to_zero")
-                if neg_to_zero_value is not None:
-                    neg_to_zero_price = float(neg_to_zero_value)
-                    gross_neg_to_zero = neg_to_zero_price * (1 + TAX_RATE)
-                    new_record["rce_pln_neg_to_zero"] = format_internal_price(gross_neg_to_zero)
+    def search_rolling_window(self, query: RollingWindowQuery, start: datetime) -> list[dict]:
+        series = self.data.get("raw_data") if self.data else None
+        if not series:
+            return []
+        slot_start = epoch_seconds(start)
+        start = datetime_from_epoch(slot_start - slot_start % SLOT_SECONDS)
 
-                processed_data.append(new_record)
-            except (ValueError, KeyError) as e:
-                _LOGGER.warning("Failed to apply tax to record: %s, error: %s", record, e)
-                processed_data.append(record)
+        def compute() -> list[dict]:
+            return PriceCalculator.find_rolling_window(
+                series,
+                start,
+                start + timedelta(minutes=query.horizon_minutes),
+                query.duration_minutes,
+                is_max=query.is_max,
+            )
 
-        _LOGGER.debug("Applied TAX_RATE to %d records", len(processed_data))
+        fingerprint = self.data.get("fingerprint")
+        if not isinstance(fingerprint, RCESnapshotFingerprint):
+            return compute()
+        return list(self.window_cache.get_or_compute((fingerprint.digest, "rolling", start, query), compute))
 
-        return processed_data
+    def next_window(self, query: RollingWindowQuery, now: datetime) -> list[dict]:
+        fingerprint = self.data.get("fingerprint") if self.data else None
+        digest = fingerprint.digest if isinstance(fingerprint, RCESnapshotFingerprint) else None
+        previous = self._next_windows.get(query)
+        if previous is not None and previous[0] == digest and previous[1]:
+            window = previous[1]
+            if record_period_end(window[0]) - timedelta(seconds=SLOT_SECONDS) <= now < record_period_end(window[-1]):
+                return list(window)
+        window = tuple(self.search_rolling_window(query, now))
+        self._next_windows[query] = (digest, window)
+        return list(window)
+
+    def plan_charging(
+        self, start: datetime, deadline: datetime, energy_kwh: float, power_kw: float, contiguous: bool
+    ) -> list[tuple[dict, float]]:
+        hourly, gross, _ = self.price_variant()
+        series = self.get_price_series(hourly, gross, UNIT_PLN_KWH)
+        if not series:
+            return []
+        return PriceCalculator.plan_charging(series, start, deadline, energy_kwh, power_kw, contiguous)
+
+    def _build_derived_data(
+        self, raw_data: Sequence[Mapping], reuse_dates: Sequence[str] = ()
+    ) -> RCEDerivedData:
+        window_specs = [window_spec(window, self._get_config_value) for window in CONFIGURED_WINDOWS]
+        threshold = float(self._get_config_value(CONF_LOW_PRICE_THRESHOLD, DEFAULT_LOW_PRICE_THRESHOLD))
+        previous = self.data.get("derived") if isinstance(self.data, dict) else None
+        derived = build_derived_data(
+            raw_data,
+            window_specs,
+            threshold,
+            previous=previous if isinstance(previous, RCEDerivedData) else None,
+            reuse_dates=reuse_dates,
+            slot_specs=(window_spec(CHEAPEST_SLOTS, self._get_config_value),),
+            schedule_specs=(schedule_spec(self._get_config_value),),
+        )
+        _LOGGER.debug(
+            "Derived results built for %d business dates and %d windows",
+            len(derived.days),
+            len(derived.windows),
+        )
+        return derived
+
+    def battery_parameters(self) -> BatteryParameters | None:
+        capacity = float(self._get_config_value(CONF_BATTERY_CAPACITY, DEFAULT_BATTERY_CAPACITY))
+        if capacity <= 0:
+            return None
+        return BatteryParameters(
+            capacity_kwh=capacity,
+            charge_power_kw=float(self._get_config_value(CONF_BATTERY_CHARGE_POWER, DEFAULT_BATTERY_CHARGE_POWER)),
+            discharge_power_kw=float(
+                self._get_config_value(CONF_BATTERY_DISCHARGE_POWER, DEFAULT_BATTERY_DISCHARGE_POWER)
+            ),
+            round_trip_efficiency=float(self._get_config_value(CONF_BATTERY_EFFICIENCY, DEFAULT_BATTERY_EFFICIENCY))
+            / 100,
+            min_soc=float(self._get_config_value(CONF_BATTERY_MIN_SOC, DEFAULT_BATTERY_MIN_SOC)) / 100,
+            max_soc=float(self._get_config_value(CONF_BATTERY_MAX_SOC, DEFAULT_BATTERY_MAX_SOC)) / 100,
+            soc_steps=BATTERY_SOC_STEPS,
+        )
 
-    def _finalize_price_records(self, data: list[dict]) -> list[dict]:
-        if not data:
+    async def _async_attach_battery_plan(self, data: dict[str, Any]) -> dict[str, Any]:
+        params = self.battery_parameters()
+        series = data.get("raw_data")
+        if params is None or not isinstance(series, PriceSeries):
             return data
-        unit = self._get_config_value(CONF_PRICE_UNIT, DEFAULT_PRICE_UNIT)
-        scale = 1.0 / MWH_TO_KWH_DIVISOR if unit == UNIT_PLN_KWH else 1.0
-        processed: list[dict] = []
-        for record in data:
-            try:
-                new_record = record.copy()
-                for key in ("rce_pln", "rce_pln_neg_to_zero"):
-                    if key not in new_record or new_record[key] is None:
-                        continue
-                    value = float(new_record[key]) * scale
-                    new_record[key] = format_internal_price(value)
-                processed.append(new_record)
-            except (ValueError, TypeError, KeyError):
-                processed.append(record)
-        return processed
+        now = dt_util.now().replace(tzinfo=None)
+        first = bisect_right(series.starts, epoch_seconds(now) - SLOT_SECONDS)
+        factor = 1.0 if self.price_variant()[2] == UNIT_PLN_KWH else 1 / MWH_TO_KWH_DIVISOR
+        plan = await self.hass.async_add_executor_job(
+            optimize_battery,
+            series.starts[first:],
+            [price * factor for price in series.prices[first:]],
+            params,
+        )
+        return {**data, "battery_plan": plan}
+
+    def battery_plan(self) -> BatteryPlan | None:
+        plan = self.data.get("battery_plan") if self.data else None
+        return plan if isinstance(plan, BatteryPlan) else None
+
+    def price_variant(self) -> tuple[bool, bool, str]:
+        return (
+            bool(self._get_config_value(CONF_USE_HOURLY_PRICES, DEFAULT_USE_HOURLY_PRICES)),
+            bool(self._get_config_value(CONF_USE_GROSS_PRICES, DEFAULT_USE_GROSS_PRICES)),
+            self._get_config_value(CONF_PRICE_UNIT, DEFAULT_PRICE_UNIT),
+        )
+
+    def get_price_series(
+        self, hourly_prices: bool, gross_prices: bool, unit: str
+    ) -> PriceSeries | None:
+        if not self.data or not self.data.get("raw_data"):
+            return None
+        series = self.data["raw_data"]
+        variant = (hourly_prices, gross_prices, unit)
+        if variant == self.price_variant():
+            return series
+        if self._series_variants[0] is not series:
+            self._series_variants = (series, {})
+        variants = self._series_variants[1]
+        if variant not in variants:
+            if not self._raw_days:
+                return None
+            records = [record for day in self._raw_days.values() for record in day]
+            variants[variant] = self._transform_price_records(records, variant)
+        return variants[variant]
+
+    def _transform_price_records(
+        self, raw_data: list[dict], variant: tuple[bool, bool, str] | None = None
+    ) -> PriceSeries:
+        use_hourly_prices, use_gross_prices, unit = variant or self.price_variant()
+        if use_hourly_prices:
+            _LOGGER.debug("Hourly prices option enabled, calculating hourly averages")
+        else:
+            _LOGGER.debug("Hourly prices option disabled, using original 15-minute data")
+
+        price_factor = 1.0
+        if use_gross_prices:
+            _LOGGER.debug("Gross prices option enabled, applying TAX_RATE %.2f to all price fields", TAX_RATE)
+            price_factor *= 1 + TAX_RATE
+
+        if unit == UNIT_PLN_KWH:
+            price_factor /= MWH_TO_KWH_DIVISOR
+
+        series = PriceSeries.from_api_records(
+            raw_data, hourly_prices=use_hourly_prices, price_factor=price_factor
+        )
+        _LOGGER.debug("Processed %d price records (original: %d)", len(series), len(raw_data))
+        return series
 
     async def async_close(self) -> None:
-        _LOGGER.debug("Closing PSE API session")
-        if self.session:
-            await self.session.close() 
\ No newline at end of file
+        if self.slot_scheduler:
+            self.slot_scheduler.async_shutdown()
+        if self.dispatcher:
+            self.dispatcher.async_shutdown()
+        self.session = None
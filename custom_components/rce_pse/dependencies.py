@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_BATTERY_CAPACITY,
+    CONF_BATTERY_CHARGE_POWER,
+    CONF_BATTERY_DISCHARGE_POWER,
+    CONF_BATTERY_EFFICIENCY,
+    CONF_BATTERY_MAX_SOC,
+    CONF_BATTERY_MIN_SOC,
+    CONF_LOW_PRICE_THRESHOLD,
+    CONF_PRICE_UNIT,
+    CONF_ROLLING_WINDOW_DURATION,
+    CONF_ROLLING_WINDOW_HORIZON,
+    CONF_SCHEDULE_END,
+    CONF_SCHEDULE_MAX_SEGMENTS,
+    CONF_SCHEDULE_MIN_SEGMENT,
+    CONF_SCHEDULE_RUNTIME,
+    CONF_SCHEDULE_START,
+    CONF_USE_GROSS_PRICES,
+    CONF_USE_HOURLY_PRICES,
+)
+from .derived import CHEAPEST_SLOTS, CONFIGURED_WINDOWS
+from .fingerprint import RCEDataChanges
+
+if TYPE_CHECKING:
+    from .coordinator import RCEPSEDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Dataset(StrEnum):
+    RCE = "rce"
+    PDGSZ = "pdgsz"
+
+
+class TimeGranularity(StrEnum):
+    NONE = "none"
+    SLOT = "slot"
+    TRANSITION = "transition"
+    DAY = "day"
+
+
+PRICE_OPTIONS = frozenset({CONF_PRICE_UNIT, CONF_USE_GROSS_PRICES, CONF_USE_HOURLY_PRICES})
+CHEAPEST_WINDOW_OPTIONS, EXPENSIVE_WINDOW_OPTIONS, SECOND_EXPENSIVE_WINDOW_OPTIONS = (
+    PRICE_OPTIONS | {window.start_key, window.end_key, window.duration_key}
+    for window in CONFIGURED_WINDOWS
+)
+LOW_PRICE_OPTIONS = PRICE_OPTIONS | {CONF_LOW_PRICE_THRESHOLD}
+CHEAPEST_SLOTS_OPTIONS = PRICE_OPTIONS | {
+    CHEAPEST_SLOTS.start_key,
+    CHEAPEST_SLOTS.end_key,
+    CHEAPEST_SLOTS.duration_key,
+}
+SCHEDULE_OPTIONS = PRICE_OPTIONS | {
+    CONF_SCHEDULE_START,
+    CONF_SCHEDULE_END,
+    CONF_SCHEDULE_RUNTIME,
+    CONF_SCHEDULE_MAX_SEGMENTS,
+    CONF_SCHEDULE_MIN_SEGMENT,
+}
+ROLLING_WINDOW_OPTIONS = PRICE_OPTIONS | {CONF_ROLLING_WINDOW_DURATION, CONF_ROLLING_WINDOW_HORIZON}
+BATTERY_OPTIONS = PRICE_OPTIONS | {
+    CONF_BATTERY_CAPACITY,
+    CONF_BATTERY_CHARGE_POWER,
+    CONF_BATTERY_DISCHARGE_POWER,
+    CONF_BATTERY_EFFICIENCY,
+    CONF_BATTERY_MIN_SOC,
+    CONF_BATTERY_MAX_SOC,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class EntityDependencies:
+    day_offsets: tuple[int, ...] | None = None
+    datasets: frozenset[Dataset] = frozenset({Dataset.RCE})
+    option_keys: frozenset[str] = PRICE_OPTIONS
+    granularity: TimeGranularity = TimeGranularity.DAY
+    fetch_metadata: bool = False
+
+
+def _day_offset(business_date: str, today: date) -> int | None:
+    try:
+        return (date.fromisoformat(business_date) - today).days
+    except ValueError:
+        return None
+
+
+TODAY_PRICES = EntityDependencies(day_offsets=(0,))
+TOMORROW_PRICES = EntityDependencies(day_offsets=(1,))
+TODAY_AND_TOMORROW_PRICES = EntityDependencies(day_offsets=(0, 1))
+CURRENT_PRICE = EntityDependencies(day_offsets=(0,), granularity=TimeGranularity.SLOT)
+
+
+class RCEEntityDispatcher:
+
+    def __init__(self, coordinator: RCEPSEDataUpdateCoordinator) -> None:
+        self.coordinator = coordinator
+        self._entities: dict[CALLBACK_TYPE, tuple[CALLBACK_TYPE, EntityDependencies]] = {}
+        self._index: dict[tuple[Dataset, int | None], dict[CALLBACK_TYPE, None]] = {}
+        self._unsub_coordinator: CALLBACK_TYPE | None = None
+
+    def _keys(self, dependencies: EntityDependencies) -> Iterable[tuple[Dataset, int | None]]:
+        offsets = dependencies.day_offsets if dependencies.day_offsets is not None else (None,)
+        return [(dataset, offset) for dataset in dependencies.datasets for offset in offsets]
+
+    @callback
+    def async_add_entity(
+        self, update_callback: CALLBACK_TYPE, dependencies: EntityDependencies
+    ) -> CALLBACK_TYPE:
+
+        @callback
+        def remove_entity() -> None:
+            self._entities.pop(remove_entity, None)
+            for key in self._keys(dependencies):
+                bucket = self._index.get(key)
+                if bucket is not None:
+                    bucket.pop(remove_entity, None)
+                    if not bucket:
+                        del self._index[key]
+            if not self._entities and self._unsub_coordinator:
+                self._unsub_coordinator()
+                self._unsub_coordinator = None
+
+        if self._unsub_coordinator is None:
+            self._unsub_coordinator = self.coordinator.async_add_listener(
+                self._handle_coordinator_update
+            )
+        self._entities[remove_entity] = (update_callback, dependencies)
+        for key in self._keys(dependencies):
+            self._index.setdefault(key, {})[remove_entity] = None
+        return remove_entity
+
+    def affected(self, changes: RCEDataChanges | None, today: date | None = None) -> list[CALLBACK_TYPE]:
+        if changes is None:
+            return list(self._entities)
+        today = today or dt_util.now().date()
+        affected: dict[CALLBACK_TYPE, None] = {
+            entity: None
+            for entity, (_, dependencies) in self._entities.items()
+            if dependencies.fetch_metadata
+        }
+        if changes.option_keys:
+            affected.update(
+                (entity, None)
+                for entity, (_, dependencies) in self._entities.items()
+                if dependencies.option_keys & changes.option_keys
+            )
+        for dataset, dates in (
+            (Dataset.RCE, changes.business_dates),
+            (Dataset.PDGSZ, changes.pdgsz_dates),
+        ):
+            if not dates:
+                continue
+            affected.update(dict.fromkeys(self._index.get((dataset, None), ())))
+            for bd in dates:
+                offset = _day_offset(bd, today)
+                if offset is not None:
+                    affected.update(dict.fromkeys(self._index.get((dataset, offset), ())))
+        return list(affected)
+
+    @callback
+    def async_dispatch(self, changes: RCEDataChanges | None) -> int:
+        entities = self.affected(changes)
+        for entity in entities:
+            entry = self._entities.get(entity)
+            if entry is not None:
+                entry[0]()
+        _LOGGER.debug("Dispatched coordinator update to %d of %d entities", len(entities), len(self._entities))
+        return len(entities)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self.async_dispatch(self.coordinator.last_changes)
+
+    @callback
+    def async_shutdown(self) -> None:
+        self._entities.clear()
+        self._index.clear()
+        if self._unsub_coordinator:
+            self._unsub_coordinator()
+            self._unsub_coordinator = None
@@ -0,0 +1,522 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, NamedTuple
+
+from .const import (
+    CONF_CHEAPEST_SLOTS_DURATION,
+    CONF_CHEAPEST_SLOTS_END,
+    CONF_CHEAPEST_SLOTS_START,
+    CONF_CHEAPEST_TIME_WINDOW_END,
+    CONF_CHEAPEST_TIME_WINDOW_START,
+    CONF_CHEAPEST_WINDOW_DURATION_HOURS,
+    CONF_EXPENSIVE_TIME_WINDOW_END,
+    CONF_EXPENSIVE_TIME_WINDOW_START,
+    CONF_EXPENSIVE_WINDOW_DURATION_HOURS,
+    CONF_SCHEDULE_END,
+    CONF_SCHEDULE_MAX_SEGMENTS,
+    CONF_SCHEDULE_MIN_SEGMENT,
+    CONF_SCHEDULE_RUNTIME,
+    CONF_SCHEDULE_START,
+    CONF_SECOND_EXPENSIVE_TIME_WINDOW_END,
+    CONF_SECOND_EXPENSIVE_TIME_WINDOW_START,
+    CONF_SECOND_EXPENSIVE_WINDOW_DURATION_HOURS,
+    DEFAULT_CHEAPEST_SLOTS_DURATION,
+    DEFAULT_CHEAPEST_SLOTS_END,
+    DEFAULT_CHEAPEST_SLOTS_START,
+    DEFAULT_SCHEDULE_END,
+    DEFAULT_SCHEDULE_MAX_SEGMENTS,
+    DEFAULT_SCHEDULE_MIN_SEGMENT,
+    DEFAULT_SCHEDULE_RUNTIME,
+    DEFAULT_SCHEDULE_START,
+    DEFAULT_SECOND_EXPENSIVE_TIME_WINDOW_END,
+    DEFAULT_SECOND_EXPENSIVE_TIME_WINDOW_START,
+    DEFAULT_SECOND_EXPENSIVE_WINDOW_DURATION_HOURS,
+    DEFAULT_TIME_WINDOW_END,
+    DEFAULT_TIME_WINDOW_START,
+    DEFAULT_WINDOW_DURATION_HOURS,
+    WINDOW_QUERY_CACHE_SIZE,
+)
+from .price_calculator import PriceCalculator
+from .price_series import (
+    SLOT_SECONDS,
+    PriceSeries,
+    datetime_from_epoch,
+    epoch_seconds,
+    record_period_end,
+    record_price,
+)
+from .time_window import business_date_from_day_data, duration_minutes_from_hhmm, normalize_hhmm
+
+SLOTS_PER_DAY_MAX = 100
+
+
+class WindowConfig(NamedTuple):
+    start_key: str
+    start_default: str
+    end_key: str
+    end_default: str
+    duration_key: str
+    duration_default: str
+    is_max: bool
+    exclude: WindowConfig | None = None
+
+
+
+EXPENSIVE_WINDOW = WindowConfig(
+    CONF_EXPENSIVE_TIME_WINDOW_START,
+    DEFAULT_TIME_WINDOW_START,
+    CONF_EXPENSIVE_TIME_WINDOW_END,
+    DEFAULT_TIME_WINDOW_END,
+    CONF_EXPENSIVE_WINDOW_DURATION_HOURS,
+    DEFAULT_WINDOW_DURATION_HOURS,
+    True,
+)
+
+CONFIGURED_WINDOWS: tuple[WindowConfig, ...] = (
+    WindowConfig(
+        CONF_CHEAPEST_TIME_WINDOW_START,
+        DEFAULT_TIME_WINDOW_START,
+        CONF_CHEAPEST_TIME_WINDOW_END,
+        DEFAULT_TIME_WINDOW_END,
+        CONF_CHEAPEST_WINDOW_DURATION_HOURS,
+        DEFAULT_WINDOW_DURATION_HOURS,
+        False,
+    ),
+    EXPENSIVE_WINDOW,
+    WindowConfig(
+        CONF_SECOND_EXPENSIVE_TIME_WINDOW_START,
+        DEFAULT_SECOND_EXPENSIVE_TIME_WINDOW_START,
+        CONF_SECOND_EXPENSIVE_TIME_WINDOW_END,
+        DEFAULT_SECOND_EXPENSIVE_TIME_WINDOW_END,
+        CONF_SECOND_EXPENSIVE_WINDOW_DURATION_HOURS,
+        DEFAULT_SECOND_EXPENSIVE_WINDOW_DURATION_HOURS,
+        True,
+        exclude=EXPENSIVE_WINDOW,
+    ),
+)
+
+CHEAPEST_SLOTS = WindowConfig(
+    CONF_CHEAPEST_SLOTS_START,
+    DEFAULT_CHEAPEST_SLOTS_START,
+    CONF_CHEAPEST_SLOTS_END,
+    DEFAULT_CHEAPEST_SLOTS_END,
+    CONF_CHEAPEST_SLOTS_DURATION,
+    DEFAULT_CHEAPEST_SLOTS_DURATION,
+    False,
+)
+
+
+def window_spec(window: WindowConfig, get_value: Callable[[str, Any], Any]) -> tuple:
+    spec = (
+        normalize_hhmm(str(get_value(window.start_key, window.start_default))),
+        normalize_hhmm(str(get_value(window.end_key, window.end_default))),
+        duration_minutes_from_hhmm(normalize_hhmm(str(get_value(window.duration_key, window.duration_default)))),
+        window.is_max,
+    )
+    if window.exclude is not None:
+        return (*spec, window_spec(window.exclude, get_value))
+    return spec
+
+
+def schedule_spec(get_value: Callable[[str, Any], Any]) -> tuple[str, str, int, int, int]:
+    return (
+        normalize_hhmm(str(get_value(CONF_SCHEDULE_START, DEFAULT_SCHEDULE_START))),
+        normalize_hhmm(str(get_value(CONF_SCHEDULE_END, DEFAULT_SCHEDULE_END))),
+        duration_minutes_from_hhmm(normalize_hhmm(str(get_value(CONF_SCHEDULE_RUNTIME, DEFAULT_SCHEDULE_RUNTIME)))),
+        int(get_value(CONF_SCHEDULE_MAX_SEGMENTS, DEFAULT_SCHEDULE_MAX_SEGMENTS)),
+        duration_minutes_from_hhmm(
+            normalize_hhmm(str(get_value(CONF_SCHEDULE_MIN_SEGMENT, DEFAULT_SCHEDULE_MIN_SEGMENT)))
+        ),
+    )
+
+
+class ScheduleQuery(NamedTuple):
+    business_date: str
+    search_start: str
+    search_end: str
+    runtime_minutes: int
+    max_segments: int
+    min_segment_minutes: int
+
+
+class WindowQuery(NamedTuple):
+    business_date: str
+    search_start: str
+    search_end: str
+    duration_minutes: int
+    is_max: bool
+    exclude: tuple[str, str, int, bool] | None = None
+
+
+class RollingWindowQuery(NamedTuple):
+    horizon_minutes: int
+    duration_minutes: int
+    is_max: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class RCEDayStats:
+    business_date: str
+    records: tuple[dict, ...]
+    prices: tuple[float, ...]
+    average: float
+    median: float
+    min_price: float
+    max_price: float
+    min_records: tuple[dict, ...]
+    max_records: tuple[dict, ...]
+
+    @classmethod
+    def from_records(cls, business_date: str, records: Iterable[dict]) -> RCEDayStats:
+        records = tuple(records)
+        prices = tuple(PriceCalculator.get_prices_from_data(records))
+        min_price = min(prices) if prices else 0.0
+        max_price = max(prices) if prices else 0.0
+        return cls(
+            business_date=business_date,
+            records=records,
+            prices=prices,
+            average=PriceCalculator.calculate_average(list(prices)),
+            median=PriceCalculator.calculate_median(list(prices)),
+            min_price=min_price,
+            max_price=max_price,
+            min_records=_extreme_records(records, prices, min_price),
+            max_records=_extreme_records(records, prices, max_price),
+        )
+
+
+def _extreme_records(
+    records: tuple[dict, ...], prices: tuple[float, ...], extreme_price: float
+) -> tuple[dict, ...]:
+    matching = [record for record, price in zip(records, prices) if price == extreme_price]
+    return tuple(sorted(matching, key=lambda x: x.get("dtime", "")))
+
+
+@dataclass(frozen=True, slots=True)
+class RCESlotSelection:
+    records: tuple[dict, ...]
+    day_start: int
+    bitmap: bytes
+
+    @classmethod
+    def from_records(cls, business_date: str, records: Iterable[dict]) -> RCESlotSelection:
+        records = tuple(records)
+        day_start = epoch_seconds(datetime.strptime(business_date, "%Y-%m-%d"))
+        bitmap = bytearray(SLOTS_PER_DAY_MAX)
+        for record in records:
+            index = (epoch_seconds(record_period_end(record)) - day_start) // SLOT_SECONDS - 1
+            if 0 <= index < SLOTS_PER_DAY_MAX:
+                bitmap[index] = 1
+        return cls(records=records, day_start=day_start, bitmap=bytes(bitmap))
+
+    def contains(self, when: datetime) -> bool:
+        index = (epoch_seconds(when) - self.day_start) // SLOT_SECONDS
+        return 0 <= index < len(self.bitmap) and self.bitmap[index] == 1
+
+    def segments(self) -> list[list[dict]]:
+        segments: list[list[dict]] = []
+        previous_end = None
+        for record in self.records:
+            period_end = epoch_seconds(record_period_end(record))
+            if previous_end is None or period_end != previous_end + SLOT_SECONDS:
+                segments.append([])
+            segments[-1].append(record)
+            previous_end = period_end
+        return segments
+
+    def runs(self) -> list[tuple[datetime, datetime]]:
+        runs: list[tuple[datetime, datetime]] = []
+        start = None
+        for index, selected in enumerate(self.bitmap + b"\x00"):
+            if selected and start is None:
+                start = index
+            elif not selected and start is not None:
+                runs.append((
+                    datetime_from_epoch(self.day_start + start * SLOT_SECONDS),
+                    datetime_from_epoch(self.day_start + index * SLOT_SECONDS),
+                ))
+                start = None
+        return runs
+
+
+@dataclass(frozen=True, slots=True)
+class ThresholdIntervals:
+    starts: array
+    ends: array
+    runs: tuple[tuple[dict, ...], ...]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def index_at(self, when: datetime) -> int | None:
+        moment = epoch_seconds(when)
+        index = bisect_right(self.starts, moment) - 1
+        if index < 0 or moment >= self.ends[index]:
+            return None
+        return index
+
+    def next_index(self, when: datetime) -> int | None:
+        index = bisect_right(self.starts, epoch_seconds(when))
+        return index if index < len(self.starts) else None
+
+    def interval(self, index: int) -> tuple[datetime, datetime] | None:
+        if not 0 <= index < len(self.starts):
+            return None
+        return datetime_from_epoch(self.starts[index]), datetime_from_epoch(self.ends[index])
+
+    def intervals(self) -> list[tuple[datetime, datetime]]:
+        return [self.interval(index) for index in range(len(self.starts))]
+
+
+class _RunBuilder:
+
+    def __init__(self) -> None:
+        self.starts = array("q")
+        self.ends = array("q")
+        self.runs: list[list[dict]] = []
+
+    def add(self, period_end: int, record: dict) -> None:
+        if self.ends and self.ends[-1] == period_end - SLOT_SECONDS:
+            self.ends[-1] = period_end
+            self.runs[-1].append(record)
+        else:
+            self.starts.append(period_end - SLOT_SECONDS)
+            self.ends.append(period_end)
+            self.runs.append([record])
+
+    def build(self) -> ThresholdIntervals:
+        return ThresholdIntervals(self.starts, self.ends, tuple(tuple(run) for run in self.runs))
+
+
+@dataclass(frozen=True, slots=True)
+class ThresholdIndex:
+    threshold: float
+    below: ThresholdIntervals
+    above: ThresholdIntervals
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict], threshold: float) -> ThresholdIndex:
+        slots = []
+        for record in records:
+            try:
+                slots.append((epoch_seconds(record_period_end(record)), record_price(record), record))
+            except (ValueError, KeyError, TypeError):
+                continue
+        slots.sort(key=lambda slot: slot[0])
+
+        below, above = _RunBuilder(), _RunBuilder()
+        for period_end, price, record in slots:
+            (below if price <= threshold else above).add(period_end, record)
+        return cls(threshold, below.build(), above.build())
+
+
+@dataclass(frozen=True, slots=True)
+class RCEDerivedData:
+    days: Mapping[str, RCEDayStats]
+    windows: Mapping[WindowQuery, tuple[dict, ...]]
+    threshold_indexes: Mapping[tuple[str, float], ThresholdIndex]
+    slot_selections: Mapping[WindowQuery, RCESlotSelection] = field(default_factory=lambda: MappingProxyType({}))
+    schedules: Mapping[ScheduleQuery, RCESlotSelection] = field(default_factory=lambda: MappingProxyType({}))
+
+    def day(self, business_date: str | None) -> RCEDayStats | None:
+        if business_date is None:
+            return None
+        return self.days.get(business_date)
+
+    def optimal_window(self, query: WindowQuery) -> list[dict] | None:
+        window = self.windows.get(query)
+        return None if window is None else list(window)
+
+    def threshold_index(self, business_date: str | None, threshold: float) -> ThresholdIndex | None:
+        if business_date is None:
+            return None
+        return self.threshold_indexes.get((business_date, threshold))
+
+    def low_price_window(self, business_date: str, threshold: float) -> list[dict] | None:
+        index = self.threshold_indexes.get((business_date, threshold))
+        if index is None:
+            return None
+        return list(index.below.runs[0]) if index.below.runs else []
+
+    def slot_selection(self, query: WindowQuery) -> RCESlotSelection | None:
+        return self.slot_selections.get(query)
+
+    def schedule(self, query: ScheduleQuery) -> RCESlotSelection | None:
+        return self.schedules.get(query)
+
+
+class WindowQueryCache:
+
+    def __init__(self, maxsize: int = WINDOW_QUERY_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, tuple] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_compute(
+        self, key: Hashable, compute: Callable[[], Iterable]
+    ) -> tuple:
+        entries = self._entries
+        if key in entries:
+            entries.move_to_end(key)
+            return entries[key]
+        value = entries[key] = tuple(compute())
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def group_records_by_business_date(raw_data: Iterable[dict]) -> dict[str, list[dict]]:
+    if isinstance(raw_data, PriceSeries):
+        return {bd: raw_data.day_records(bd) for bd in raw_data.business_dates}
+    grouped: dict[str, list[dict]] = {}
+    for record in raw_data:
+        bd = record.get("business_date")
+        if not bd:
+            bd = business_date_from_day_data([record])
+        if bd:
+            grouped.setdefault(bd, []).append(record)
+    return grouped
+
+
+def _reuse_day(
+    previous: RCEDerivedData,
+    business_date: str,
+    window_specs: tuple[tuple, ...],
+    low_price_threshold: float | None,
+    days: dict[str, RCEDayStats],
+    windows: dict[WindowQuery, tuple[dict, ...]],
+    threshold_indexes: dict[tuple[str, float], ThresholdIndex],
+    slot_specs: tuple[tuple[str, str, int, bool], ...] = (),
+    slot_selections: dict[WindowQuery, RCESlotSelection] | None = None,
+    schedule_specs: tuple[tuple[str, str, int, int, int], ...] = (),
+    schedules: dict[ScheduleQuery, RCESlotSelection] | None = None,
+) -> bool:
+    day = previous.days.get(business_date)
+    if day is None:
+        return False
+    queries = [WindowQuery(business_date, *spec) for spec in window_specs]
+    if any(query not in previous.windows for query in queries):
+        return False
+    slot_queries = [WindowQuery(business_date, *spec) for spec in slot_specs]
+    if any(query not in previous.slot_selections for query in slot_queries):
+        return False
+    schedule_queries = [ScheduleQuery(business_date, *spec) for spec in schedule_specs]
+    if any(query not in previous.schedules for query in schedule_queries):
+        return False
+    low_price_key = (business_date, low_price_threshold)
+    if low_price_threshold is not None and low_price_key not in previous.threshold_indexes:
+        return False
+
+    days[business_date] = day
+    for query in queries:
+        windows[query] = previous.windows[query]
+    if slot_selections is not None:
+        for query in slot_queries:
+            slot_selections[query] = previous.slot_selections[query]
+    if schedules is not None:
+        for query in schedule_queries:
+            schedules[query] = previous.schedules[query]
+    if low_price_threshold is not None:
+        threshold_indexes[low_price_key] = previous.threshold_indexes[low_price_key]
+    return True
+
+
+def build_derived_data(
+    raw_data: Iterable[dict],
+    window_specs: Iterable[tuple] = (),
+    low_price_threshold: float | None = None,
+    previous: RCEDerivedData | None = None,
+    reuse_dates: Iterable[str] = (),
+    slot_specs: Iterable[tuple[str, str, int, bool]] = (),
+    schedule_specs: Iterable[tuple[str, str, int, int, int]] = (),
+) -> RCEDerivedData:
+    days: dict[str, RCEDayStats] = {}
+    windows: dict[WindowQuery, tuple[dict, ...]] = {}
+    threshold_indexes: dict[tuple[str, float], ThresholdIndex] = {}
+    slot_selections: dict[WindowQuery, RCESlotSelection] = {}
+    schedules: dict[ScheduleQuery, RCESlotSelection] = {}
+    window_specs = tuple(window_specs)
+    slot_specs = tuple(slot_specs)
+    schedule_specs = tuple(schedule_specs)
+    reuse_dates = frozenset(reuse_dates) if previous is not None else frozenset()
+
+    for bd, records in group_records_by_business_date(raw_data).items():
+        if bd in reuse_dates and _reuse_day(
+            previous,
+            bd,
+            window_specs,
+            low_price_threshold,
+            days,
+            windows,
+            threshold_indexes,
+            slot_specs,
+            slot_selections,
+            schedule_specs,
+            schedules,
+        ):
+            continue
+        day = RCEDayStats.from_records(bd, records)
+        days[bd] = day
+        day_records = list(day.records)
+        queries = list(dict.fromkeys(WindowQuery(bd, *spec) for spec in window_specs))
+        excluding = [query for query in queries if query.exclude is not None]
+        plain = list(dict.fromkeys(
+            [query for query in queries if query.exclude is None]
+            + [WindowQuery(bd, *query.exclude) for query in excluding]
+        ))
+        if plain:
+            results = PriceCalculator.find_optimal_windows(
+                day_records, bd, [query[1:5] for query in plain]
+            )
+            for query, window in zip(plain, results):
+                windows[query] = tuple(window)
+        for query in excluding:
+            ranked = PriceCalculator.find_top_windows(
+                day_records,
+                bd,
+                query.search_start,
+                query.search_end,
+                query.duration_minutes,
+                1,
+                query.is_max,
+                exclude=[list(windows[WindowQuery(bd, *query.exclude)])],
+            )
+            windows[query] = tuple(ranked[0]) if ranked else ()
+        if low_price_threshold is not None:
+            threshold_indexes[(bd, low_price_threshold)] = ThresholdIndex.from_records(
+                day.records, low_price_threshold
+            )
+        for search_start, search_end, duration_minutes, is_max in slot_specs:
+            query = WindowQuery(bd, search_start, search_end, duration_minutes, is_max)
+            slot_selections[query] = RCESlotSelection.from_records(
+                bd,
+                PriceCalculator.find_cheapest_slots(
+                    day_records, bd, search_start, search_end, duration_minutes // 15, is_max
+                ),
+            )
+        for spec in schedule_specs:
+            query = ScheduleQuery(bd, *spec)
+            segments = PriceCalculator.find_schedule(day_records, *query)
+            schedules[query] = RCESlotSelection.from_records(
+                bd, [record for segment in segments for record in segment]
+            )
+
+    return RCEDerivedData(
+        days=MappingProxyType(days),
+        windows=MappingProxyType(windows),
+        threshold_indexes=MappingProxyType(threshold_indexes),
+        slot_selections=MappingProxyType(slot_selections),
+        schedules=MappingProxyType(schedules),
+    )
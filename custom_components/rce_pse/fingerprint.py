@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from .price_series import PriceSeries
+
+_DIGEST_SIZE = 16
+
+
+def _digest(parts: Iterable[bytes]) -> str:
+    h = hashlib.blake2b(digest_size=_DIGEST_SIZE)
+    for part in parts:
+        h.update(part)
+    return h.hexdigest()
+
+
+def series_day_fingerprints(raw_data: Sequence[Mapping] | None) -> dict[str, str]:
+    if not raw_data:
+        return {}
+    if isinstance(raw_data, PriceSeries):
+        fingerprints = {}
+        for bd in raw_data.business_dates:
+            day = raw_data.day_range(bd)
+            fingerprints[bd] = _digest((
+                raw_data.starts[day.start : day.stop].tobytes(),
+                raw_data.prices[day.start : day.stop].tobytes(),
+                raw_data.prices_neg_to_zero[day.start : day.stop].tobytes(),
+            ))
+        return fingerprints
+    grouped: dict[str, list[bytes]] = {}
+    for record in raw_data:
+        bd = str(record.get("business_date", ""))
+        grouped.setdefault(bd, []).append(
+            repr((record.get("dtime"), record.get("rce_pln"), record.get("rce_pln_neg_to_zero"))).encode()
+        )
+    return {bd: _digest(parts) for bd, parts in grouped.items()}
+
+
+def pdgsz_day_fingerprints(pdgsz_data: Iterable[Mapping] | None) -> dict[str, str]:
+    grouped: dict[str, list[bytes]] = {}
+    for record in pdgsz_data or ():
+        bd = str(record.get("business_date", ""))
+        grouped.setdefault(bd, []).append(
+            repr((record.get("dtime"), record.get("is_active"), record.get("usage_fcst"))).encode()
+        )
+    return {bd: _digest(parts) for bd, parts in grouped.items()}
+
+
+@dataclass(frozen=True, slots=True)
+class RCEDataChanges:
+    business_dates: frozenset[str]
+    pdgsz_dates: frozenset[str]
+    option_keys: frozenset[str] = frozenset()
+
+    def __bool__(self) -> bool:
+        return bool(self.business_dates or self.pdgsz_dates or self.option_keys)
+
+
+def _changed_keys(current: Mapping[str, str], previous: Mapping[str, str]) -> frozenset[str]:
+    return frozenset(
+        key for key in current.keys() | previous.keys() if current.get(key) != previous.get(key)
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class RCESnapshotFingerprint:
+    days: Mapping[str, str]
+    pdgsz_days: Mapping[str, str]
+    digest: str
+
+    @classmethod
+    def from_data(
+        cls, raw_data: Sequence[Mapping] | None, pdgsz_data: Iterable[Mapping] | None
+    ) -> RCESnapshotFingerprint:
+        days = series_day_fingerprints(raw_data)
+        pdgsz_days = pdgsz_day_fingerprints(pdgsz_data)
+        digest = _digest(
+            f"{kind}:{bd}:{value};".encode()
+            for kind, source in (("rce", days), ("pdgsz", pdgsz_days))
+            for bd, value in sorted(source.items())
+        )
+        return cls(
+            days=MappingProxyType(days),
+            pdgsz_days=MappingProxyType(pdgsz_days),
+            digest=digest,
+        )
+
+    def changes_since(self, previous: RCESnapshotFingerprint) -> RCEDataChanges:
+        if self.digest == previous.digest:
+            return RCEDataChanges(frozenset(), frozenset())
+        return RCEDataChanges(
+            business_dates=_changed_keys(self.days, previous.days),
+            pdgsz_dates=_changed_keys(self.pdgsz_days, previous.pdgsz_days),
+        )
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import random
+from collections import Counter
+from collections.abc import Callable, Mapping, Sequence
+from datetime import date, datetime, time, timedelta
+
+from homeassistant.util import dt as dt_util
+
+from .const import API_UPDATE_INTERVAL
+from .price_series import PriceSeries
+
+MIN_COMPLETE_DAY_SLOTS = 92
+PUBLICATION_WINDOW_START = time(13, 30)
+PUBLICATION_WINDOW_END = time(16, 0)
+PUBLICATION_POLL_MIN = timedelta(minutes=2)
+PUBLICATION_POLL_MAX = timedelta(minutes=5)
+POLL_TOLERANCE = timedelta(seconds=5)
+PDGSZ_POLL_INTERVAL = API_UPDATE_INTERVAL
+
+JitterFunc = Callable[[float, float], float]
+
+
+def complete_business_dates(raw_data: Sequence[Mapping] | None) -> frozenset[str]:
+    if not raw_data:
+        return frozenset()
+    if isinstance(raw_data, PriceSeries):
+        offsets = raw_data.day_offsets
+        return frozenset(
+            bd for i, bd in enumerate(raw_data.business_dates)
+            if offsets[i + 1] - offsets[i] >= MIN_COMPLETE_DAY_SLOTS
+        )
+    counts = Counter(record.get("business_date") for record in raw_data)
+    return frozenset(
+        bd for bd, count in counts.items() if bd and count >= MIN_COMPLETE_DAY_SLOTS
+    )
+
+
+def _local_at(day: date, at: time) -> datetime:
+    return datetime.combine(day, at, tzinfo=dt_util.get_default_time_zone())
+
+
+def _jitter(jitter: JitterFunc, low: timedelta, high: timedelta) -> timedelta:
+    return timedelta(seconds=jitter(low.total_seconds(), high.total_seconds()))
+
+
+def poll_due(scheduled: datetime | None, now: datetime) -> bool:
+    return scheduled is None or now >= scheduled - POLL_TOLERANCE
+
+
+def next_poll_time(
+    now: datetime,
+    complete_dates: frozenset[str],
+    jitter: JitterFunc = random.uniform,
+) -> datetime:
+    local_now = dt_util.as_local(now)
+    today = local_now.date()
+    tomorrow = today + timedelta(days=1)
+
+    if today.isoformat() not in complete_dates:
+        return now + API_UPDATE_INTERVAL
+
+    if tomorrow.isoformat() in complete_dates:
+        return _local_at(tomorrow, PUBLICATION_WINDOW_START) + _jitter(
+            jitter, timedelta(0), PUBLICATION_POLL_MAX
+        )
+
+    window_start = _local_at(today, PUBLICATION_WINDOW_START)
+    if local_now < window_start:
+        return window_start + _jitter(jitter, timedelta(0), PUBLICATION_POLL_MIN)
+
+    if local_now < _local_at(today, PUBLICATION_WINDOW_END):
+        return now + _jitter(jitter, PUBLICATION_POLL_MIN, PUBLICATION_POLL_MAX)
+
+    return now + API_UPDATE_INTERVAL
@@ -1,22 +1,28 @@
 from __future__ import annotations
 
+import heapq
+import math
 import statistics
-from datetime import timedelta
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 
+from .price_series import SLOT_SECONDS, PriceSeries, epoch_seconds, record_period_end, record_price
 from .time_window import (
-    parse_pse_dtime,
-    period_bounds_for_record,
+    period_overlaps_search,
     search_window_exclusive_end,
     search_window_inclusive_start,
-    period_overlaps_search,
 )
 
+PRICE_SCALE = 1_000_000
+
 
 class PriceCalculator:
     
     @staticmethod
     def get_prices_from_data(data: list[dict]) -> list[float]:
-        return [float(record["rce_pln"]) for record in data]
+        return [record_price(record) for record in data]
     
     @staticmethod
     def calculate_average(prices: list[float]) -> float:
@@ -43,7 +49,7 @@ class PriceCalculator:
                 if not hour.isdigit():
                     continue
                 if hour not in hourly_prices:
-                    hourly_prices[hour] = float(record["rce_pln"])
+                    hourly_prices[hour] = record_price(record)
             except (ValueError, KeyError, IndexError):
                 continue
         return hourly_prices
@@ -64,7 +70,7 @@ class PriceCalculator:
         
         extreme_records = [
             record for record in data 
-            if float(record["rce_pln"]) == extreme_price
+            if record_price(record) == extreme_price
         ]
         
         return sorted(extreme_records, key=lambda x: x["dtime"])
@@ -78,70 +84,296 @@ class PriceCalculator:
         duration_minutes: int,
         is_max: bool = False,
     ) -> list[dict]:
-        if not data or duration_minutes <= 0 or duration_minutes % 15 != 0:
+        return PriceCalculator.find_optimal_windows(
+            data, business_date, [(search_start_hhmm, search_end_hhmm, duration_minutes, is_max)]
+        )[0]
+
+    @staticmethod
+    def find_optimal_windows(
+        data: list[dict],
+        business_date: str,
+        queries: Sequence[tuple[str, str, int, bool]],
+    ) -> list[list[dict]]:
+        if not data:
+            return [[] for _ in queries]
+
+        index = _WindowIndex.build(data, business_date)
+        results = []
+        for search_start_hhmm, search_end_hhmm, duration_minutes, is_max in queries:
+            candidates = index.candidates(business_date, search_start_hhmm, search_end_hhmm, duration_minutes)
+            if not candidates:
+                results.append([])
+                continue
+            periods = duration_minutes // 15
+            pick = max if is_max else min
+            best = pick(candidates, key=lambda i: index.prefix[i + periods] - index.prefix[i])
+            results.append(index.window(best, periods))
+        return results
+
+    @staticmethod
+    def find_rolling_window(
+        data: list[dict],
+        search_start: datetime,
+        search_end: datetime,
+        duration_minutes: int,
+        is_max: bool = False,
+    ) -> list[dict]:
+        if not data:
+            return []
+        index = _WindowIndex.build(data)
+        lo, hi = index.range_between(epoch_seconds(search_start), epoch_seconds(search_end))
+        candidates = index.candidates_in(lo, hi, duration_minutes)
+        if not candidates:
             return []
+        periods = duration_minutes // 15
+        pick = max if is_max else min
+        best = pick(candidates, key=lambda i: index.prefix[i + periods] - index.prefix[i])
+        return index.window(best, periods)
 
-        duration_periods = duration_minutes // 15
+    @staticmethod
+    def plan_charging(
+        data: list[dict],
+        search_start: datetime,
+        search_end: datetime,
+        energy_kwh: float,
+        power_kw: float,
+        contiguous: bool = False,
+    ) -> list[tuple[dict, float]]:
+        slot_energy = power_kw * SLOT_SECONDS / 3600
+        if not data or energy_kwh <= 0 or slot_energy <= 0:
+            return []
+        count = math.ceil(energy_kwh / slot_energy - 1e-9)
+        remainder = energy_kwh - (count - 1) * slot_energy
+        index = _WindowIndex.build(data)
+        lo, hi = index.range_within(epoch_seconds(search_start), epoch_seconds(search_end))
 
-        search_start = search_window_inclusive_start(business_date, search_start_hhmm)
-        search_end_exclusive = search_window_exclusive_end(business_date, search_end_hhmm)
+        if contiguous:
+            candidates = index.candidates_in(lo, hi, count * 15)
+            if not candidates:
+                return []
 
-        filtered_data = []
-        for record in data:
-            try:
-                bd = record.get("business_date")
-                if bd is not None and bd != business_date:
+            def cost(i: int) -> float:
+                edge = max(record_price(index.entries[i][1]), record_price(index.entries[i + count - 1][1]))
+                return slot_energy * (index.prefix[i + count] - index.prefix[i]) / PRICE_SCALE - (
+                    slot_energy - remainder
+                ) * edge
+
+            best = min(candidates, key=lambda i: (cost(i), i))
+            chosen = list(range(best, best + count))
+            ends = (chosen[0], chosen[-1])
+        else:
+            priced: list[tuple[float, int]] = []
+            for i in range(lo, hi):
+                try:
+                    priced.append((record_price(index.entries[i][1]), i))
+                except (ValueError, KeyError, TypeError):
                     continue
-                period_start, period_end = period_bounds_for_record(record)
-                if period_overlaps_search(
-                    period_start, period_end, search_start, search_end_exclusive
-                ):
-                    filtered_data.append(record)
-            except (ValueError, KeyError):
+            if len(priced) < count:
+                return []
+            chosen = sorted(i for _, i in heapq.nsmallest(count, priced))
+            ends = chosen
+
+        partial = max(ends, key=lambda i: (record_price(index.entries[i][1]), i))
+        return [
+            (index.entries[i][1], remainder if i == partial else slot_energy)
+            for i in chosen
+        ]
+
+    @staticmethod
+    def find_top_windows(
+        data: list[dict],
+        business_date: str,
+        search_start_hhmm: str,
+        search_end_hhmm: str,
+        duration_minutes: int,
+        count: int,
+        is_max: bool = False,
+        exclude: Sequence[list[dict]] = (),
+    ) -> list[list[dict]]:
+        if not data or count <= 0:
+            return []
+        index = _WindowIndex.build(data, business_date)
+        candidates = index.candidates(business_date, search_start_hhmm, search_end_hhmm, duration_minutes)
+        if not candidates:
+            return []
+        periods = duration_minutes // 15
+        sign = -1 if is_max else 1
+        prefix = index.prefix
+        candidates.sort(key=lambda i: (sign * (prefix[i + periods] - prefix[i]), i))
+
+        taken_starts: list[int] = []
+        taken_ends: list[int] = []
+        for window in sorted(exclude, key=lambda w: record_period_end(w[0]) if w else datetime.min):
+            if not window:
                 continue
+            start = epoch_seconds(record_period_end(window[0])) - SLOT_SECONDS
+            end = epoch_seconds(record_period_end(window[-1]))
+            if taken_ends and taken_ends[-1] >= start:
+                taken_ends[-1] = max(taken_ends[-1], end)
+            else:
+                taken_starts.append(start)
+                taken_ends.append(end)
 
-        if len(filtered_data) < duration_periods:
+        results: list[list[dict]] = []
+        for i in candidates:
+            start = index.ends[i] - SLOT_SECONDS
+            end = index.ends[i + periods - 1]
+            pos = bisect_left(taken_starts, end)
+            if pos and taken_ends[pos - 1] > start:
+                continue
+            taken_starts.insert(pos, start)
+            taken_ends.insert(pos, end)
+            results.append(index.window(i, periods))
+            if len(results) == count:
+                break
+        return results
+
+    @staticmethod
+    def find_schedule(
+        data: list[dict],
+        business_date: str,
+        search_start_hhmm: str,
+        search_end_hhmm: str,
+        runtime_minutes: int,
+        max_segments: int,
+        min_segment_minutes: int = 15,
+    ) -> list[list[dict]]:
+        if (
+            not data
+            or runtime_minutes <= 0
+            or runtime_minutes % 15 != 0
+            or max_segments <= 0
+            or min_segment_minutes % 15 != 0
+        ):
+            return []
+        total = runtime_minutes // 15
+        min_run = max(1, min_segment_minutes // 15)
+        if min_run > total:
+            return []
+        index = _WindowIndex.build(data, business_date)
+        lo, hi = index.search_range(business_date, search_start_hhmm, search_end_hhmm)
+        n = hi - lo
+        if n < total:
             return []
 
-        filtered_data.sort(key=lambda x: parse_pse_dtime(x["dtime"]))
+        width = max_segments + 1
+        states = (total + 1) * width
+        inf = float("inf")
+        prefix = index.prefix
+        run_end = index.run_end
+        start_off = [inf] * states
+        start_off[0] = 0
+        off: list[list[float]] = []
+        on: list[list[float]] = []
+        off_from_on: list[bytearray] = []
+        on_from_block: list[bytearray] = []
 
-        best_window = []
-        best_avg_price = None
+        for j in range(n):
+            i = lo + j
+            prev_off = off[j - 1] if j else start_off
+            prev_on = on[j - 1] if j else [inf] * states
+            cur_off = [inf] * states
+            cur_on = [inf] * states
+            from_on = bytearray(states)
+            from_block = bytearray(states)
+            extends = j > 0 and run_end[i - 1] > i
+            block_start = j - min_run + 1
+            block_ok = block_start >= 0 and run_end[lo + block_start] > i
+            block_cost = prefix[i + 1] - prefix[lo + block_start] if block_ok else 0
+            block_off = None
+            if block_ok and not block_start:
+                block_off = start_off
+            elif block_ok and run_end[lo + block_start - 1] > lo + block_start:
+                block_off = off[block_start - 1]
+            elif block_ok:
+                block_off = list(map(min, off[block_start - 1], on[block_start - 1]))
+            price = prefix[i + 1] - prefix[i]
+            for t in range(min(total, j + 1) + 1):
+                base = t * width
+                for k in range(width):
+                    state = base + k
+                    if prev_on[state] < prev_off[state]:
+                        cur_off[state] = prev_on[state]
+                        from_on[state] = 1
+                    else:
+                        cur_off[state] = prev_off[state]
+                    best = prev_on[state - width] + price if extends and t else inf
+                    if block_off is not None and t >= min_run and k:
+                        before = state - min_run * width - 1
+                        cost = block_off[before] + block_cost
+                        if cost < best:
+                            best = cost
+                            after_on = block_off is not start_off and block_off[before] < off[block_start - 1][before]
+                            from_block[state] = 2 if after_on else 1
+                    cur_on[state] = best
+            off.append(cur_off)
+            on.append(cur_on)
+            off_from_on.append(from_on)
+            on_from_block.append(from_block)
 
-        for i in range(len(filtered_data) - duration_periods + 1):
-            window = filtered_data[i : i + duration_periods]
+        final = total * width
+        best_state, best_cost, is_on = None, inf, False
+        for k in range(1, width):
+            for cost, running in ((off[-1][final + k], False), (on[-1][final + k], True)):
+                if cost < best_cost:
+                    best_state, best_cost, is_on = final + k, cost, running
+        if best_state is None:
+            return []
 
-            is_continuous = True
-            for j in range(len(window) - 1):
-                try:
-                    curr_time = parse_pse_dtime(window[j]["dtime"])
-                    next_time = parse_pse_dtime(window[j + 1]["dtime"])
-                    if next_time != curr_time + timedelta(minutes=15):
-                        is_continuous = False
-                        break
-                except (ValueError, KeyError):
-                    is_continuous = False
-                    break
-
-            if not is_continuous:
-                continue
+        segments: list[list[dict]] = []
+        current: list[int] = []
+        j, state = n - 1, best_state
+        while j >= 0:
+            if not is_on:
+                is_on = bool(off_from_on[j][state])
+                j -= 1
+            elif on_from_block[j][state]:
+                is_on = on_from_block[j][state] == 2
+                current.extend(range(j, j - min_run, -1))
+                segments.append([index.entries[lo + s][1] for s in reversed(current)])
+                current = []
+                state -= min_run * width + 1
+                j -= min_run
+            else:
+                current.append(j)
+                state -= width
+                j -= 1
+        segments.reverse()
+        return segments
 
+    @staticmethod
+    def find_cheapest_slots(
+        data: list[dict],
+        business_date: str,
+        search_start_hhmm: str,
+        search_end_hhmm: str,
+        slot_count: int,
+        is_max: bool = False,
+    ) -> list[dict]:
+        if not data or slot_count <= 0:
+            return []
+        search_start = search_window_inclusive_start(business_date, search_start_hhmm)
+        search_end = search_window_exclusive_end(business_date, search_end_hhmm)
+
+        candidates: list[tuple[float, datetime, dict]] = []
+        for record in data:
             try:
-                window_prices = [float(record["rce_pln"]) for record in window]
-                avg_price = sum(window_prices) / len(window_prices)
-
-                if best_avg_price is None:
-                    best_window = window
-                    best_avg_price = avg_price
-                elif (is_max and avg_price > best_avg_price) or (
-                    not is_max and avg_price < best_avg_price
+                bd = record.get("business_date")
+                if bd is not None and bd != business_date:
+                    continue
+                period_end = record_period_end(record)
+                if not period_overlaps_search(
+                    period_end - timedelta(minutes=15), period_end, search_start, search_end
                 ):
-                    best_window = window
-                    best_avg_price = avg_price
-            except (ValueError, KeyError):
+                    continue
+                price = record_price(record)
+            except (ValueError, KeyError, TypeError):
                 continue
+            candidates.append((-price if is_max else price, period_end, record))
 
-        return best_window
+        selected = heapq.nsmallest(slot_count, candidates, key=lambda x: (x[0], x[1]))
+        selected.sort(key=lambda x: x[1])
+        return [record for _, _, record in selected]
 
     @staticmethod
     def find_first_window_below_threshold(data: list[dict], threshold: float) -> list[dict]:
@@ -151,7 +383,7 @@ class PriceCalculator:
         current_window: list[dict] = []
         for record in sorted_data:
             try:
-                price = float(record["rce_pln"])
+                price = record_price(record)
                 if price > threshold:
                     if current_window:
                         return current_window
@@ -160,8 +392,8 @@ class PriceCalculator:
                 if not current_window:
                     current_window = [record]
                     continue
-                prev_time = parse_pse_dtime(current_window[-1]["dtime"])
-                curr_time = parse_pse_dtime(record["dtime"])
+                prev_time = record_period_end(current_window[-1])
+                curr_time = record_period_end(record)
                 if curr_time == prev_time + timedelta(minutes=15):
                     current_window.append(record)
                 else:
@@ -172,4 +404,92 @@ class PriceCalculator:
                 if current_window:
                     return current_window
                 current_window = []
-        return current_window
\ No newline at end of file
+        return current_window
+
+
+@dataclass(frozen=True, slots=True)
+class _WindowIndex:
+    entries: list[tuple[int, dict]]
+    ends: list[int]
+    prefix: list[int]
+    run_end: list[int]
+
+    @classmethod
+    def build(cls, data: list[dict], business_date: str | None = None) -> _WindowIndex:
+        if business_date is None and isinstance(data, PriceSeries):
+            return cls.from_series(data)
+        entries: list[tuple[int, dict]] = []
+        for record in data:
+            try:
+                bd = record.get("business_date")
+                if business_date is not None and bd is not None and bd != business_date:
+                    continue
+                entries.append((epoch_seconds(record_period_end(record)), record))
+            except (ValueError, KeyError):
+                continue
+        entries.sort(key=lambda x: x[0])
+
+        ends = [end for end, _ in entries]
+        prefix = [0]
+        valid: list[bool] = []
+        for _, record in entries:
+            try:
+                price = round(record_price(record) * PRICE_SCALE)
+                valid.append(True)
+            except (ValueError, KeyError, TypeError):
+                price = 0
+                valid.append(False)
+            prefix.append(prefix[-1] + price)
+
+        run_end = [0] * len(entries)
+        next_end = len(entries)
+        for i in range(len(entries) - 1, -1, -1):
+            if not valid[i]:
+                next_end = i
+            elif i + 1 < len(entries) and (
+                not valid[i + 1] or ends[i + 1] != ends[i] + SLOT_SECONDS
+            ):
+                next_end = i + 1
+            run_end[i] = next_end
+        return cls(entries=entries, ends=ends, prefix=prefix, run_end=run_end)
+
+    @classmethod
+    def from_series(cls, series: PriceSeries) -> _WindowIndex:
+        ends = [start + SLOT_SECONDS for start in series.starts]
+        prefix = [0]
+        for price in series.prices:
+            prefix.append(prefix[-1] + round(price * PRICE_SCALE))
+        run_end = [0] * len(ends)
+        next_end = len(ends)
+        for i in range(len(ends) - 1, -1, -1):
+            if i + 1 < len(ends) and ends[i + 1] != ends[i] + SLOT_SECONDS:
+                next_end = i + 1
+            run_end[i] = next_end
+        return cls(entries=list(zip(ends, series)), ends=ends, prefix=prefix, run_end=run_end)
+
+    def candidates(
+        self, business_date: str, search_start_hhmm: str, search_end_hhmm: str, duration_minutes: int
+    ) -> list[int]:
+        lo, hi = self.search_range(business_date, search_start_hhmm, search_end_hhmm)
+        return self.candidates_in(lo, hi, duration_minutes)
+
+    def candidates_in(self, lo: int, hi: int, duration_minutes: int) -> list[int]:
+        if duration_minutes <= 0 or duration_minutes % 15 != 0:
+            return []
+        periods = duration_minutes // 15
+        return [i for i in range(lo, hi - periods + 1) if self.run_end[i] >= i + periods]
+
+    def search_range(self, business_date: str, search_start_hhmm: str, search_end_hhmm: str) -> tuple[int, int]:
+        return self.range_between(
+            epoch_seconds(search_window_inclusive_start(business_date, search_start_hhmm)),
+            epoch_seconds(search_window_exclusive_end(business_date, search_end_hhmm)),
+        )
+
+    def range_between(self, search_start: int, search_end: int) -> tuple[int, int]:
+        return bisect_right(self.ends, search_start), bisect_left(self.ends, search_end + SLOT_SECONDS)
+
+    def range_within(self, search_start: int, search_end: int) -> tuple[int, int]:
+        return bisect_left(self.ends, search_start + SLOT_SECONDS), bisect_right(self.ends, search_end)
+
+    def window(self, start: int, periods: int) -> list[dict]:
+        return [record for _, record in self.entries[start : start + periods]]
@@ -0,0 +1,380 @@
+from __future__ import annotations
+
+import logging
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from datetime import UTC, datetime, timedelta, tzinfo
+from itertools import pairwise
+from typing import Any, overload
+
+from .const import PRICE_INTERNAL_DECIMALS
+from .time_window import parse_pse_dtime
+
+_LOGGER = logging.getLogger(__name__)
+
+SLOT_SECONDS = 15 * 60
+PRICE_KEY = "rce_pln"
+PRICE_NEG_TO_ZERO_KEY = "rce_pln_neg_to_zero"
+
+_EPOCH = datetime(1970, 1, 1)
+_SECOND = timedelta(seconds=1)
+_SLOT = timedelta(seconds=SLOT_SECONDS)
+_MISSING = object()
+
+
+def format_internal_price(value: float) -> str:
+    return f"{value:.{PRICE_INTERNAL_DECIMALS}f}"
+
+
+def epoch_seconds(value: datetime) -> int:
+    return (value - _EPOCH) // _SECOND
+
+
+def datetime_from_epoch(seconds: int) -> datetime:
+    return _EPOCH + timedelta(seconds=seconds)
+
+
+class PriceRecord(Mapping):
+    __slots__ = ("_index", "_series")
+
+    def __init__(self, series: PriceSeries, index: int) -> None:
+        self._series = series
+        self._index = index
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def price(self) -> float:
+        return self._series.prices[self._index]
+
+    @property
+    def period_start(self) -> datetime:
+        return datetime_from_epoch(self._series.starts[self._index])
+
+    @property
+    def period_end(self) -> datetime:
+        return datetime_from_epoch(self._series.starts[self._index] + SLOT_SECONDS)
+
+    def float_value(self, key: str) -> float:
+        if key == PRICE_KEY:
+            return self._series.prices[self._index]
+        if key == PRICE_NEG_TO_ZERO_KEY:
+            value = self._series.prices_neg_to_zero[self._index]
+            if math.isnan(value):
+                raise KeyError(key)
+            return value
+        return float(self[key])
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._series._value(self._index, key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        series = self._series
+        return (key for key in series._keys if series._value(self._index, key) is not _MISSING)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def copy(self) -> dict[str, Any]:
+        return dict(self)
+
+    def __repr__(self) -> str:
+        return repr(self.copy())
+
+
+class PriceSeries(Sequence):
+    __slots__ = (
+        "_columns",
+        "_dtimes",
+        "_keys",
+        "_regular_grid",
+        "business_dates",
+        "day_offsets",
+        "prices",
+        "prices_neg_to_zero",
+        "starts",
+    )
+
+    def __init__(
+        self,
+        starts: array,
+        prices: array,
+        prices_neg_to_zero: array,
+        business_dates: tuple[str, ...],
+        day_offsets: array,
+        dtimes: tuple[str, ...],
+        columns: dict[str, tuple[Any, ...]],
+        keys: tuple[str, ...],
+    ) -> None:
+        self.starts = starts
+        self.prices = prices
+        self.prices_neg_to_zero = prices_neg_to_zero
+        self.business_dates = business_dates
+        self.day_offsets = day_offsets
+        self._dtimes = dtimes
+        self._columns = columns
+        self._keys = keys
+        self._regular_grid = all(b - a == SLOT_SECONDS for a, b in pairwise(starts))
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping]) -> PriceSeries:
+        rows = []
+        keys: dict[str, None] = {}
+        for record in records:
+            try:
+                period_end = parse_pse_dtime(record["dtime"])
+                price = float(record[PRICE_KEY])
+            except (ValueError, KeyError, TypeError) as e:
+                _LOGGER.warning("Skipping invalid price record: %s, error: %s", record, e)
+                continue
+            try:
+                neg_to_zero = float(record[PRICE_NEG_TO_ZERO_KEY])
+            except (ValueError, KeyError, TypeError):
+                neg_to_zero = math.nan
+            period_start = period_end - _SLOT
+            business_date = record.get("business_date") or period_start.strftime("%Y-%m-%d")
+            rows.append((business_date, epoch_seconds(period_start), price, neg_to_zero, record))
+            keys.update(dict.fromkeys(record))
+        return cls._from_rows(rows, keys)
+
+    @classmethod
+    def from_api_records(
+        cls,
+        records: Iterable[Mapping],
+        hourly_prices: bool = False,
+        price_factor: float = 1.0,
+    ) -> PriceSeries:
+        rows = []
+        keys: dict[str, None] = {}
+        hourly_totals: dict[int, list] = {}
+        for record in records:
+            try:
+                period_end = parse_pse_dtime(record["dtime"])
+            except (ValueError, KeyError, TypeError) as e:
+                _LOGGER.warning("Failed to parse record dtime: %s, error: %s", record.get("dtime"), e)
+                continue
+            try:
+                price = float(record[PRICE_KEY])
+            except (ValueError, KeyError, TypeError) as e:
+                _LOGGER.warning("Failed to parse price from record: %s, error: %s", record.get(PRICE_KEY), e)
+                if not hourly_prices:
+                    continue
+                price = None
+            start = epoch_seconds(period_end) - SLOT_SECONDS
+            business_date = record.get("business_date") or (period_end - _SLOT).strftime("%Y-%m-%d")
+            if hourly_prices:
+                totals = hourly_totals.setdefault(start - start % 3600, [0.0, 0.0, 0])
+                if price is not None:
+                    totals[0] += price
+                    totals[1] += max(0.0, price)
+                    totals[2] += 1
+                rows.append((business_date, start, 0.0, 0.0, record))
+            else:
+                rows.append((
+                    business_date,
+                    start,
+                    round(price * price_factor, PRICE_INTERNAL_DECIMALS),
+                    round(max(0.0, price) * price_factor, PRICE_INTERNAL_DECIMALS),
+                    record,
+                ))
+            keys.update(dict.fromkeys(record))
+
+        if hourly_prices:
+            hourly_rows = []
+            for business_date, start, _, _, record in rows:
+                total, total_neg_to_zero, count = hourly_totals[start - start % 3600]
+                if not count:
+                    continue
+                hourly_rows.append((
+                    business_date,
+                    start,
+                    round(total / count * price_factor, PRICE_INTERNAL_DECIMALS),
+                    round(total_neg_to_zero / count * price_factor, PRICE_INTERNAL_DECIMALS),
+                    record,
+                ))
+            rows = hourly_rows
+        keys.setdefault(PRICE_NEG_TO_ZERO_KEY)
+        return cls._from_rows(rows, keys)
+
+    @classmethod
+    def _from_rows(cls, rows: list[tuple], keys: dict[str, None]) -> PriceSeries:
+        keys.setdefault("business_date")
+        rows.sort(key=lambda row: (row[0], row[1]))
+
+        business_dates: list[str] = []
+        day_offsets = array("q")
+        for i, row in enumerate(rows):
+            if not business_dates or business_dates[-1] != row[0]:
+                business_dates.append(row[0])
+                day_offsets.append(i)
+        day_offsets.append(len(rows))
+
+        column_keys = [
+            key for key in keys
+            if key not in ("dtime", "business_date", PRICE_KEY, PRICE_NEG_TO_ZERO_KEY)
+        ]
+        return cls(
+            starts=array("q", (row[1] for row in rows)),
+            prices=array("d", (row[2] for row in rows)),
+            prices_neg_to_zero=array("d", (row[3] for row in rows)),
+            business_dates=tuple(business_dates),
+            day_offsets=day_offsets,
+            dtimes=tuple(row[4]["dtime"] for row in rows),
+            columns={
+                key: tuple(row[4].get(key, _MISSING) for row in rows) for key in column_keys
+            },
+            keys=tuple(keys),
+        )
+
+    def _value(self, index: int, key: str) -> Any:
+        if key == PRICE_KEY:
+            return format_internal_price(self.prices[index])
+        if key == PRICE_NEG_TO_ZERO_KEY:
+            value = self.prices_neg_to_zero[index]
+            return _MISSING if math.isnan(value) else format_internal_price(value)
+        if key == "dtime":
+            return self._dtimes[index]
+        if key == "business_date":
+            return self.business_dates[bisect_right(self.day_offsets, index) - 1]
+        column = self._columns.get(key)
+        return _MISSING if column is None else column[index]
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    @overload
+    def __getitem__(self, index: int) -> PriceRecord: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[PriceRecord]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [PriceRecord(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return PriceRecord(self, index)
+
+    def __iter__(self) -> Iterator[PriceRecord]:
+        return (PriceRecord(self, i) for i in range(len(self)))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def index_at(self, when: datetime) -> int | None:
+        if not self.starts:
+            return None
+        seconds = (when - _EPOCH).total_seconds()
+        if self._regular_grid:
+            index = max(0, math.ceil((seconds - SLOT_SECONDS - self.starts[0]) / SLOT_SECONDS))
+        else:
+            index = bisect_left(self.starts, seconds - SLOT_SECONDS)
+        if index < len(self.starts) and self.starts[index] <= seconds:
+            return index
+        return None
+
+    def last_ended_index(self, when: datetime) -> int | None:
+        seconds = (when - _EPOCH).total_seconds()
+        index = bisect_right(self.starts, seconds - SLOT_SECONDS) - 1
+        return index if index >= 0 else None
+
+    def record_at(self, when: datetime) -> PriceRecord | None:
+        index = self.index_at(when)
+        return None if index is None else PriceRecord(self, index)
+
+    def day_range(self, business_date: str) -> range:
+        try:
+            day = self.business_dates.index(business_date)
+        except ValueError:
+            return range(0)
+        return range(self.day_offsets[day], self.day_offsets[day + 1])
+
+    def day_records(self, business_date: str) -> list[PriceRecord]:
+        return [PriceRecord(self, i) for i in self.day_range(business_date)]
+
+    def day_prices(self, business_date: str) -> array:
+        day = self.day_range(business_date)
+        return self.prices[day.start : day.stop]
+
+
+def record_price(record: Mapping, key: str = PRICE_KEY) -> float:
+    if type(record) is PriceRecord:
+        return record.float_value(key)
+    return float(record[key])
+
+
+def record_period_end(record: Mapping) -> datetime:
+    if type(record) is PriceRecord:
+        return record.period_end
+    return parse_pse_dtime(record["dtime"])
+
+
+def compact_price_list(records: Sequence[Mapping], tz: tzinfo, decimals: int) -> dict[str, Any]:
+    prices: list[float] = []
+    period_ends: list[datetime] = []
+    dtimes: list[str] = []
+    for record in records:
+        try:
+            price = round(record_price(record), decimals)
+            period_end = record_period_end(record)
+        except (ValueError, KeyError, TypeError):
+            continue
+        prices.append(price)
+        period_ends.append(period_end)
+        dtimes.append(str(record["dtime"]))
+    if not prices:
+        return {"prices": []}
+    start = (period_ends[0] - _SLOT).replace(tzinfo=tz)
+    end = period_ends[-1].replace(tzinfo=tz)
+    if end.astimezone(UTC) - start.astimezone(UTC) == _SLOT * len(prices):
+        return {
+            "prices_start": start.isoformat(),
+            "prices_step_minutes": SLOT_SECONDS // 60,
+            "prices": prices,
+        }
+    return {"prices_dtime": dtimes, "prices": prices}
+
+
+def price_record_at(raw_data: Sequence[Mapping], when: datetime) -> Mapping | None:
+    if isinstance(raw_data, PriceSeries):
+        return raw_data.record_at(when)
+    for record in raw_data:
+        try:
+            period_end = parse_pse_dtime(record["dtime"])
+            if period_end - _SLOT <= when <= period_end:
+                return record
+        except (ValueError, KeyError):
+            continue
+    return None
+
+
+def last_price_record_before(raw_data: Sequence[Mapping], when: datetime) -> Mapping | None:
+    if isinstance(raw_data, PriceSeries):
+        index = raw_data.last_ended_index(when)
+        return None if index is None else raw_data[index]
+    closest_record = None
+    closest_diff = None
+    for record in raw_data:
+        try:
+            period_end = parse_pse_dtime(record["dtime"])
+            if period_end <= when:
+                diff = abs((when - period_end).total_seconds())
+                if closest_diff is None or diff < closest_diff:
+                    closest_diff = diff
+                    closest_record = record
+        except (ValueError, KeyError):
+            continue
+    return closest_record
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import logging
+from array import array
+from bisect import bisect_right
+from collections.abc import Callable
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .const import CONF_USE_HOURLY_PRICES, DEFAULT_USE_HOURLY_PRICES
+from .price_series import SLOT_SECONDS, PriceSeries, datetime_from_epoch, epoch_seconds
+
+if TYPE_CHECKING:
+    from .coordinator import RCEPSEDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+HOUR_SECONDS = 3600
+
+
+def slot_boundaries(series: PriceSeries, step_seconds: int = SLOT_SECONDS) -> array:
+    boundaries = set()
+    for start in series.starts:
+        for boundary in (start, start + SLOT_SECONDS):
+            if boundary % step_seconds == 0:
+                boundaries.add(boundary)
+    return array("q", sorted(boundaries))
+
+
+class RCESlotScheduler:
+
+    def __init__(self, hass: HomeAssistant, coordinator: RCEPSEDataUpdateCoordinator) -> None:
+        self.hass = hass
+        self.coordinator = coordinator
+        self._listeners: dict[
+            CALLBACK_TYPE, tuple[CALLBACK_TYPE, Callable[[datetime], datetime | None]]
+        ] = {}
+        self._due: dict[CALLBACK_TYPE, datetime] = {}
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._armed_at: datetime | None = None
+        self._unsub_coordinator: CALLBACK_TYPE | None = None
+        self._boundaries: array = array("q")
+        self._boundaries_source: PriceSeries | None = None
+
+    def _step_seconds(self) -> int:
+        use_hourly = self.coordinator._get_config_value(
+            CONF_USE_HOURLY_PRICES, DEFAULT_USE_HOURLY_PRICES
+        )
+        return HOUR_SECONDS if use_hourly else SLOT_SECONDS
+
+    def _series(self) -> PriceSeries | None:
+        data = self.coordinator.data
+        if not data:
+            return None
+        series = data.get("raw_data")
+        return series if isinstance(series, PriceSeries) else None
+
+    def next_boundary(self, now: datetime) -> datetime:
+        step = self._step_seconds()
+        local_now = epoch_seconds(dt_util.as_local(now).replace(tzinfo=None))
+
+        series = self._series()
+        if series is not None and series is not self._boundaries_source:
+            self._boundaries = slot_boundaries(series, step)
+            self._boundaries_source = series
+
+        index = bisect_right(self._boundaries, local_now)
+        if series is not None and index < len(self._boundaries):
+            boundary = self._boundaries[index]
+        else:
+            boundary = local_now - local_now % step + step
+        return datetime_from_epoch(boundary).replace(tzinfo=dt_util.get_default_time_zone())
+
+    @callback
+    def async_add_listener(
+        self,
+        update_callback: CALLBACK_TYPE,
+        next_update: Callable[[datetime], datetime | None] | None = None,
+    ) -> CALLBACK_TYPE:
+        subscribe = not self._listeners
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.pop(remove_listener, None)
+            self._due.pop(remove_listener, None)
+            if not self._listeners:
+                self._unschedule()
+            else:
+                self._arm()
+
+        self._listeners[remove_listener] = (update_callback, next_update or self.next_boundary)
+
+        if subscribe:
+            self._unsub_coordinator = self.coordinator.async_add_listener(
+                self._handle_coordinator_update
+            )
+        self._refresh_due(remove_listener, dt_util.utcnow())
+        self._arm()
+
+        return remove_listener
+
+    def _refresh_due(self, listener: CALLBACK_TYPE, now: datetime) -> None:
+        when = self._listeners[listener][1](now)
+        if when is None:
+            self._due.pop(listener, None)
+        else:
+            self._due[listener] = dt_util.as_utc(when)
+
+    @callback
+    def _arm(self) -> None:
+        when = min(self._due.values(), default=None)
+        if when == self._armed_at and self._unsub_timer:
+            return
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._armed_at = when
+        if when is None:
+            return
+        _LOGGER.debug("Next scheduled entity update at %s", when)
+        self._unsub_timer = async_track_point_in_utc_time(self.hass, self._handle_timer, when)
+
+    @callback
+    def _unschedule(self) -> None:
+        self._due.clear()
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._armed_at = None
+        if self._unsub_coordinator:
+            self._unsub_coordinator()
+            self._unsub_coordinator = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        now = dt_util.utcnow()
+        for listener in self._listeners:
+            self._refresh_due(listener, now)
+        self._arm()
+
+    @callback
+    def _handle_timer(self, now: datetime) -> None:
+        self._unsub_timer = None
+        self._armed_at = None
+        due = [listener for listener, when in self._due.items() if when <= now]
+        for listener in due:
+            if listener in self._listeners:
+                self._listeners[listener][0]()
+        for listener in due:
+            if listener in self._listeners:
+                self._refresh_due(listener, now)
+        self._arm()
+
+    @callback
+    def async_shutdown(self) -> None:
+        self._listeners.clear()
+        self._unschedule()
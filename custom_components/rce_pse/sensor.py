@@ -34,11 +34,20 @@ from .sensors import (
     RCETomorrowMedianPriceSensor,
     RCETomorrowTodayAvgComparisonSensor,
 )
+from .sensors.battery_plan import RCEBatteryPlanSensor
+from .sensors.rolling_window import (
+    RCENextCheapestWindowStartSensor,
+    RCENextCheapestWindowEndSensor,
+)
 from .sensors.low_price_threshold_windows import (
     RCETodayLowPriceThresholdWindowStartSensor,
     RCETodayLowPriceThresholdWindowEndSensor,
     RCETomorrowLowPriceThresholdWindowStartSensor,
     RCETomorrowLowPriceThresholdWindowEndSensor,
+    RCETodaySecondLowPriceThresholdWindowStartSensor,
+    RCETodaySecondLowPriceThresholdWindowEndSensor,
+    RCETodayThirdLowPriceThresholdWindowStartSensor,
+    RCETodayThirdLowPriceThresholdWindowEndSensor,
 )
 from .sensors.custom_windows import (
     RCETodayCheapestWindowStartTimestampSensor,
@@ -120,9 +129,17 @@ async def async_setup_entry(
         RCETodayLowPriceThresholdWindowEndSensor(coordinator, config_entry),
         RCETomorrowLowPriceThresholdWindowStartSensor(coordinator, config_entry),
         RCETomorrowLowPriceThresholdWindowEndSensor(coordinator, config_entry),
+        RCETodaySecondLowPriceThresholdWindowStartSensor(coordinator, config_entry),
+        RCETodaySecondLowPriceThresholdWindowEndSensor(coordinator, config_entry),
+        RCETodayThirdLowPriceThresholdWindowStartSensor(coordinator, config_entry),
+        RCETodayThirdLowPriceThresholdWindowEndSensor(coordinator, config_entry),
         RCETodayPeakHoursSensor(coordinator),
         RCETomorrowPeakHoursSensor(coordinator),
+        RCENextCheapestWindowStartSensor(coordinator),
+        RCENextCheapestWindowEndSensor(coordinator),
     ]
+    if coordinator.battery_parameters() is not None:
+        sensors.append(RCEBatteryPlanSensor(coordinator))
     
     _LOGGER.debug("Adding %d RCE PSE sensors to Home Assistant", len(sensors))
     async_add_entities(sensors)
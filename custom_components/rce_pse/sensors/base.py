@@ -11,14 +11,24 @@ from ..const import (
     DEFAULT_USE_HOURLY_PRICES,
     DISPLAY_PRICE_DECIMALS,
 )
-from ..time_window import parse_pse_dtime
+from ..derived import RCEDayStats
+from ..price_series import (
+    compact_price_list,
+    last_price_record_before,
+    price_record_at,
+    record_price,
+)
 from ..shared_base import RCEBaseCommonEntity
+from ..time_window import business_date_from_day_data
 
 if TYPE_CHECKING:
     from ..coordinator import RCEPSEDataUpdateCoordinator
 
+PRICE_LIST_ATTRIBUTES = frozenset({"prices", "prices_start", "prices_step_minutes", "prices_dtime"})
+
 
 class RCEBaseSensor(RCEBaseCommonEntity, SensorEntity):
+    _price_list_cache: tuple[RCEDayStats, dict[str, Any]] | None = None
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, unique_id: str) -> None:
         super().__init__(coordinator, unique_id)
@@ -53,20 +63,8 @@ class RCEBaseSensor(RCEBaseCommonEntity, SensorEntity):
         if not self.coordinator.data or not self.coordinator.data.get("raw_data"):
             return None
         
-        now = dt_util.now()
-        
-        for record in self.coordinator.data["raw_data"]:
-            try:
-                period_end = parse_pse_dtime(record["dtime"])
-                period_start = period_end - timedelta(minutes=15)
-                
-                if period_start <= now.replace(tzinfo=None) <= period_end:
-                    return record
-                    
-            except (ValueError, KeyError):
-                continue
-        
-        return None
+        now = dt_util.now().replace(tzinfo=None)
+        return price_record_at(self.coordinator.data["raw_data"], now)
 
     def get_price_at_future_period(self, periods_ahead: int) -> float | None:
         if not self.coordinator.data or not self.coordinator.data.get("raw_data"):
@@ -74,16 +72,8 @@ class RCEBaseSensor(RCEBaseCommonEntity, SensorEntity):
 
         slots = periods_ahead * self._period_slots_multiplier()
         target_time = dt_util.now().replace(tzinfo=None) + timedelta(minutes=15 * slots)
-
-        for record in self.coordinator.data["raw_data"]:
-            try:
-                period_end = parse_pse_dtime(record["dtime"])
-                period_start = period_end - timedelta(minutes=15)
-                if period_start <= target_time <= period_end:
-                    return float(record["rce_pln"])
-            except (ValueError, KeyError):
-                continue
-        return None
+        record = price_record_at(self.coordinator.data["raw_data"], target_time)
+        return record_price(record) if record else None
 
     def get_price_at_past_period(self, periods_back: int) -> float | None:
         if not self.coordinator.data or not self.coordinator.data.get("raw_data"):
@@ -91,23 +81,24 @@ class RCEBaseSensor(RCEBaseCommonEntity, SensorEntity):
 
         slots = periods_back * self._period_slots_multiplier()
         target_time = dt_util.now().replace(tzinfo=None) - timedelta(minutes=15 * slots)
-        closest_record = None
-        closest_diff = None
-
-        for record in self.coordinator.data["raw_data"]:
-            try:
-                period_end = parse_pse_dtime(record["dtime"])
-                period_start = period_end - timedelta(minutes=15)
-                if period_start <= target_time <= period_end:
-                    return float(record["rce_pln"])
-                if period_end <= target_time:
-                    diff = abs((target_time - period_end).total_seconds())
-                    if closest_diff is None or diff < closest_diff:
-                        closest_diff = diff
-                        closest_record = record
-            except (ValueError, KeyError):
-                continue
-        return float(closest_record["rce_pln"]) if closest_record else None
+        raw_data = self.coordinator.data["raw_data"]
+        record = price_record_at(raw_data, target_time) or last_price_record_before(
+            raw_data, target_time
+        )
+        return record_price(record) if record else None
+
+    def get_price_list_attributes(self, day_data: list[dict]) -> dict[str, Any]:
+        derived = self.get_derived()
+        day = derived.day(business_date_from_day_data(day_data)) if derived is not None else None
+        cached = self._price_list_cache
+        if day is not None and cached is not None and cached[0] is day:
+            return cached[1]
+        payload = compact_price_list(
+            day_data, dt_util.get_default_time_zone(), DISPLAY_PRICE_DECIMALS
+        )
+        if day is not None:
+            self._price_list_cache = (day, payload)
+        return payload
 
     def get_data_summary(self, data: list[dict]) -> dict[str, Any]:
         if not data:
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.util import dt as dt_util
+
+from ..battery import BATTERY_ACTIONS
+from ..dependencies import BATTERY_OPTIONS, EntityDependencies, TimeGranularity
+from .base import RCEBaseSensor
+
+if TYPE_CHECKING:
+    from ..coordinator import RCEPSEDataUpdateCoordinator
+
+
+class RCEBatteryPlanSensor(RCEBaseSensor):
+    _dependencies = EntityDependencies(
+        day_offsets=(0, 1), option_keys=BATTERY_OPTIONS, granularity=TimeGranularity.SLOT
+    )
+
+    def __init__(self, coordinator: RCEPSEDataUpdateCoordinator) -> None:
+        super().__init__(coordinator, "battery_plan")
+        self._attr_device_class = SensorDeviceClass.ENUM
+        self._attr_options = list(BATTERY_ACTIONS)
+        self._attr_icon = "mdi:home-battery"
+
+    @property
+    def native_value(self) -> str | None:
+        plan = self.coordinator.battery_plan()
+        slot = plan.slot_at(dt_util.now().replace(tzinfo=None)) if plan else None
+        return slot.action if slot else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        plan = self.coordinator.battery_plan()
+        if plan is None:
+            return None
+        slot = plan.slot_at(dt_util.now().replace(tzinfo=None))
+        return {
+            "projected_savings": round(plan.savings, 2),
+            "target_soc": round(slot.soc * 100, 1) if slot else None,
+            "grid_energy": round(slot.grid_energy_kwh, 3) if slot else None,
+        }
@@ -6,9 +6,14 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.components.sensor import SensorDeviceClass
 from homeassistant.util import dt as dt_util
 
+from ..dependencies import (
+    CHEAPEST_WINDOW_OPTIONS,
+    EXPENSIVE_WINDOW_OPTIONS,
+    SECOND_EXPENSIVE_WINDOW_OPTIONS,
+    EntityDependencies,
+)
 from ..coordinator import RCEPSEDataUpdateCoordinator
 from ..time_window import (
-    business_date_from_day_data,
     duration_minutes_from_hhmm,
     normalize_hhmm,
     parse_pse_dtime,
@@ -76,13 +81,11 @@ class RCECustomWindowSensor(RCEBaseSensor):
         search_end: str,
         duration_hhmm: str,
         is_max: bool,
+        exclude: tuple[str, str, int, bool] | None = None,
     ) -> list[dict]:
-        bd = business_date_from_day_data(day_data)
-        if not bd:
-            return []
         dm = duration_minutes_from_hhmm(duration_hhmm)
-        return self.calculator.find_optimal_window(
-            day_data, bd, search_start, search_end, dm, is_max=is_max
+        return self.find_optimal_window_for_day(
+            day_data, search_start, search_end, dm, is_max=is_max, exclude=exclude
         )
 
     def window_start_as_local(self, optimal_window: list[dict]) -> datetime | None:
@@ -105,6 +108,7 @@ class RCECustomWindowSensor(RCEBaseSensor):
 
 
 class RCETodayCheapestWindowStartTimestampSensor(RCECustomWindowSensor):
+    _dependencies = EntityDependencies(day_offsets=(0,), option_keys=CHEAPEST_WINDOW_OPTIONS)
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
         super().__init__(coordinator, config_entry, "today_cheapest_window_start")
@@ -132,6 +136,7 @@ class RCETodayCheapestWindowStartTimestampSensor(RCECustomWindowSensor):
 
 
 class RCETodayCheapestWindowEndTimestampSensor(RCECustomWindowSensor):
+    _dependencies = EntityDependencies(day_offsets=(0,), option_keys=CHEAPEST_WINDOW_OPTIONS)
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
         super().__init__(coordinator, config_entry, "today_cheapest_window_end")
@@ -159,6 +164,7 @@ class RCETodayCheapestWindowEndTimestampSensor(RCECustomWindowSensor):
 
 
 class RCETodayExpensiveWindowStartTimestampSensor(RCECustomWindowSensor):
+    _dependencies = EntityDependencies(day_offsets=(0,), option_keys=EXPENSIVE_WINDOW_OPTIONS)
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
         super().__init__(coordinator, config_entry, "today_expensive_window_start")
@@ -186,6 +192,7 @@ class RCETodayExpensiveWindowStartTimestampSensor(RCECustomWindowSensor):
 
 
 class RCETodayExpensiveWindowEndTimestampSensor(RCECustomWindowSensor):
+    _dependencies = EntityDependencies(day_offsets=(0,), option_keys=EXPENSIVE_WINDOW_OPTIONS)
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
         super().__init__(coordinator, config_entry, "today_expensive_window_end")
@@ -213,6 +220,7 @@ class RCETodayExpensiveWindowEndTimestampSensor(RCECustomWindowSensor):
 
 
 class RCETomorrowCheapestWindowStartTimestampSensor(RCECustomWindowSensor):
+    _dependencies = EntityDependencies(day_offsets=(1,), option_keys=CHEAPEST_WINDOW_OPTIONS)
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
         super().__init__(coordinator, config_entry, "tomorrow_cheapest_window_start")
@@ -240,6 +248,7 @@ class RCETomorrowCheapestWindowStartTimestampSensor(RCECustomWindowSensor):
 
 
 class RCETomorrowCheapestWindowEndTimestampSensor(RCECustomWindowSensor):
+    _dependencies = EntityDependencies(day_offsets=(1,), option_keys=CHEAPEST_WINDOW_OPTIONS)
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
         super().__init__(coordinator, config_entry, "tomorrow_cheapest_window_end")
@@ -267,6 +276,7 @@ class RCETomorrowCheapestWindowEndTimestampSensor(RCECustomWindowSensor):
 
 
 class RCETomorrowExpensiveWindowStartTimestampSensor(RCECustomWindowSensor):
+    _dependencies = EntityDependencies(day_offsets=(1,), option_keys=EXPENSIVE_WINDOW_OPTIONS)
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
         super().__init__(coordinator, config_entry, "tomorrow_expensive_window_start")
@@ -294,6 +304,7 @@ class RCETomorrowExpensiveWindowStartTimestampSensor(RCECustomWindowSensor):
 
 
 class RCETomorrowExpensiveWindowEndTimestampSensor(RCECustomWindowSensor):
+    _dependencies = EntityDependencies(day_offsets=(1,), option_keys=EXPENSIVE_WINDOW_OPTIONS)
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
         super().__init__(coordinator, config_entry, "tomorrow_expensive_window_end")
@@ -321,6 +332,7 @@ class RCETomorrowExpensiveWindowEndTimestampSensor(RCECustomWindowSensor):
 
 
 class RCETodaySecondExpensiveWindowStartSensor(RCECustomWindowSensor):
+    _dependencies = EntityDependencies(day_offsets=(0,), option_keys=SECOND_EXPENSIVE_WINDOW_OPTIONS)
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
         super().__init__(coordinator, config_entry, "today_second_expensive_window_start")
@@ -344,7 +356,7 @@ class RCETodaySecondExpensiveWindowStartSensor(RCECustomWindowSensor):
         )
 
         optimal_window = self.find_optimal_window_for_data(
-            today_data, start_s, end_s, duration, is_max=True
+            today_data, start_s, end_s, duration, is_max=True, exclude=self.expensive_window_spec()
         )
 
         if not optimal_window:
@@ -354,6 +366,7 @@ class RCETodaySecondExpensiveWindowStartSensor(RCECustomWindowSensor):
 
 
 class RCETodaySecondExpensiveWindowEndSensor(RCECustomWindowSensor):
+    _dependencies = EntityDependencies(day_offsets=(0,), option_keys=SECOND_EXPENSIVE_WINDOW_OPTIONS)
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
         super().__init__(coordinator, config_entry, "today_second_expensive_window_end")
@@ -377,7 +390,7 @@ class RCETodaySecondExpensiveWindowEndSensor(RCECustomWindowSensor):
         )
 
         optimal_window = self.find_optimal_window_for_data(
-            today_data, start_s, end_s, duration, is_max=True
+            today_data, start_s, end_s, duration, is_max=True, exclude=self.expensive_window_spec()
         )
 
         if not optimal_window:
@@ -387,6 +400,7 @@ class RCETodaySecondExpensiveWindowEndSensor(RCECustomWindowSensor):
 
 
 class RCETomorrowSecondExpensiveWindowStartSensor(RCECustomWindowSensor):
+    _dependencies = EntityDependencies(day_offsets=(1,), option_keys=SECOND_EXPENSIVE_WINDOW_OPTIONS)
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
         super().__init__(coordinator, config_entry, "tomorrow_second_expensive_window_start")
@@ -410,7 +424,7 @@ class RCETomorrowSecondExpensiveWindowStartSensor(RCECustomWindowSensor):
         )
 
         optimal_window = self.find_optimal_window_for_data(
-            tomorrow_data, start_s, end_s, duration, is_max=True
+            tomorrow_data, start_s, end_s, duration, is_max=True, exclude=self.expensive_window_spec()
         )
 
         if not optimal_window:
@@ -420,6 +434,7 @@ class RCETomorrowSecondExpensiveWindowStartSensor(RCECustomWindowSensor):
 
 
 class RCETomorrowSecondExpensiveWindowEndSensor(RCECustomWindowSensor):
+    _dependencies = EntityDependencies(day_offsets=(1,), option_keys=SECOND_EXPENSIVE_WINDOW_OPTIONS)
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
         super().__init__(coordinator, config_entry, "tomorrow_second_expensive_window_end")
@@ -443,7 +458,7 @@ class RCETomorrowSecondExpensiveWindowEndSensor(RCECustomWindowSensor):
         )
 
         optimal_window = self.find_optimal_window_for_data(
-            tomorrow_data, start_s, end_s, duration, is_max=True
+            tomorrow_data, start_s, end_s, duration, is_max=True, exclude=self.expensive_window_spec()
         )
 
         if not optimal_window:
@@ -1,21 +1,27 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Any
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.components.sensor import SensorDeviceClass
 from homeassistant.util import dt as dt_util
 
+from ..dependencies import LOW_PRICE_OPTIONS, EntityDependencies
 from ..coordinator import RCEPSEDataUpdateCoordinator
 from ..const import CONF_LOW_PRICE_THRESHOLD, DEFAULT_LOW_PRICE_THRESHOLD
 from .base import RCEBaseSensor
 
 
 class RCELowPriceThresholdWindowSensor(RCEBaseSensor):
+    _day_offset = 0
+    _rank = 0
+    _is_end = False
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry, sensor_type: str) -> None:
         super().__init__(coordinator, sensor_type)
         self.config_entry = config_entry
+        self._attr_device_class = SensorDeviceClass.TIMESTAMP
+        self._attr_icon = "mdi:clock-end" if self._is_end else "mdi:clock-start"
 
     def get_config_value(self, key: str, default: Any) -> Any:
         value = None
@@ -27,106 +33,86 @@ class RCELowPriceThresholdWindowSensor(RCEBaseSensor):
             return float(value)
         return value
 
+    def get_interval(self) -> tuple[datetime, datetime] | None:
+        day_data = self.get_tomorrow_data() if self._day_offset else self.get_today_data()
+        if not day_data:
+            return None
+        threshold = self.get_config_value(CONF_LOW_PRICE_THRESHOLD, DEFAULT_LOW_PRICE_THRESHOLD)
+        return self.get_threshold_index(day_data, threshold).below.interval(self._rank)
+
+    @property
+    def native_value(self) -> datetime | None:
+        interval = self.get_interval()
+        if interval is None:
+            return None
+        return dt_util.as_local(interval[1] if self._is_end else interval[0])
+
 
 class RCETodayLowPriceThresholdWindowStartSensor(RCELowPriceThresholdWindowSensor):
+    _dependencies = EntityDependencies(day_offsets=(0,), option_keys=LOW_PRICE_OPTIONS)
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
         super().__init__(coordinator, config_entry, "today_low_price_threshold_window_start")
-        self._attr_device_class = SensorDeviceClass.TIMESTAMP
-        self._attr_icon = "mdi:clock-start"
-
-    @property
-    def native_value(self) -> datetime | None:
-        today_data = self.get_today_data()
-        if not today_data:
-            return None
-        threshold = self.get_config_value(CONF_LOW_PRICE_THRESHOLD, DEFAULT_LOW_PRICE_THRESHOLD)
-        window = self.calculator.find_first_window_below_threshold(today_data, threshold)
-        if not window:
-            return None
-        try:
-            start_time_str = window[0]["period"].split(" - ")[0]
-            today_str = dt_util.now().strftime("%Y-%m-%d")
-            datetime_str = f"{today_str} {start_time_str}:00"
-            start_datetime = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M:%S")
-            return dt_util.as_local(start_datetime)
-        except (ValueError, KeyError, IndexError):
-            return None
 
 
 class RCETodayLowPriceThresholdWindowEndSensor(RCELowPriceThresholdWindowSensor):
+    _dependencies = EntityDependencies(day_offsets=(0,), option_keys=LOW_PRICE_OPTIONS)
+    _is_end = True
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
         super().__init__(coordinator, config_entry, "today_low_price_threshold_window_end")
-        self._attr_device_class = SensorDeviceClass.TIMESTAMP
-        self._attr_icon = "mdi:clock-end"
-
-    @property
-    def native_value(self) -> datetime | None:
-        today_data = self.get_today_data()
-        if not today_data:
-            return None
-        threshold = self.get_config_value(CONF_LOW_PRICE_THRESHOLD, DEFAULT_LOW_PRICE_THRESHOLD)
-        window = self.calculator.find_first_window_below_threshold(today_data, threshold)
-        if not window:
-            return None
-        try:
-            end_time_str = window[-1]["period"].split(" - ")[1]
-            today_str = dt_util.now().strftime("%Y-%m-%d")
-            datetime_str = f"{today_str} {end_time_str}:00"
-            end_datetime = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M:%S")
-            return dt_util.as_local(end_datetime)
-        except (ValueError, KeyError, IndexError):
-            return None
 
 
 class RCETomorrowLowPriceThresholdWindowStartSensor(RCELowPriceThresholdWindowSensor):
+    _dependencies = EntityDependencies(day_offsets=(1,), option_keys=LOW_PRICE_OPTIONS)
+    _day_offset = 1
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
         super().__init__(coordinator, config_entry, "tomorrow_low_price_threshold_window_start")
-        self._attr_device_class = SensorDeviceClass.TIMESTAMP
-        self._attr_icon = "mdi:clock-start"
-
-    @property
-    def native_value(self) -> datetime | None:
-        tomorrow_data = self.get_tomorrow_data()
-        if not tomorrow_data:
-            return None
-        threshold = self.get_config_value(CONF_LOW_PRICE_THRESHOLD, DEFAULT_LOW_PRICE_THRESHOLD)
-        window = self.calculator.find_first_window_below_threshold(tomorrow_data, threshold)
-        if not window:
-            return None
-        try:
-            start_time_str = window[0]["period"].split(" - ")[0]
-            tomorrow_str = (dt_util.now() + timedelta(days=1)).strftime("%Y-%m-%d")
-            datetime_str = f"{tomorrow_str} {start_time_str}:00"
-            start_datetime = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M:%S")
-            return dt_util.as_local(start_datetime)
-        except (ValueError, KeyError, IndexError):
-            return None
 
 
 class RCETomorrowLowPriceThresholdWindowEndSensor(RCELowPriceThresholdWindowSensor):
+    _dependencies = EntityDependencies(day_offsets=(1,), option_keys=LOW_PRICE_OPTIONS)
+    _day_offset = 1
+    _is_end = True
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
         super().__init__(coordinator, config_entry, "tomorrow_low_price_threshold_window_end")
-        self._attr_device_class = SensorDeviceClass.TIMESTAMP
-        self._attr_icon = "mdi:clock-end"
 
-    @property
-    def native_value(self) -> datetime | None:
-        tomorrow_data = self.get_tomorrow_data()
-        if not tomorrow_data:
-            return None
-        threshold = self.get_config_value(CONF_LOW_PRICE_THRESHOLD, DEFAULT_LOW_PRICE_THRESHOLD)
-        window = self.calculator.find_first_window_below_threshold(tomorrow_data, threshold)
-        if not window:
-            return None
-        try:
-            end_time_str = window[-1]["period"].split(" - ")[1]
-            tomorrow_str = (dt_util.now() + timedelta(days=1)).strftime("%Y-%m-%d")
-            datetime_str = f"{tomorrow_str} {end_time_str}:00"
-            end_datetime = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M:%S")
-            return dt_util.as_local(end_datetime)
-        except (ValueError, KeyError, IndexError):
-            return None
+
+class RCETodaySecondLowPriceThresholdWindowStartSensor(RCELowPriceThresholdWindowSensor):
+    _dependencies = EntityDependencies(day_offsets=(0,), option_keys=LOW_PRICE_OPTIONS)
+    _attr_entity_registry_enabled_default = False
+    _rank = 1
+
+    def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
+        super().__init__(coordinator, config_entry, "today_second_low_price_threshold_window_start")
+
+
+class RCETodaySecondLowPriceThresholdWindowEndSensor(RCELowPriceThresholdWindowSensor):
+    _dependencies = EntityDependencies(day_offsets=(0,), option_keys=LOW_PRICE_OPTIONS)
+    _attr_entity_registry_enabled_default = False
+    _rank = 1
+    _is_end = True
+
+    def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
+        super().__init__(coordinator, config_entry, "today_second_low_price_threshold_window_end")
+
+
+class RCETodayThirdLowPriceThresholdWindowStartSensor(RCELowPriceThresholdWindowSensor):
+    _dependencies = EntityDependencies(day_offsets=(0,), option_keys=LOW_PRICE_OPTIONS)
+    _attr_entity_registry_enabled_default = False
+    _rank = 2
+
+    def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
+        super().__init__(coordinator, config_entry, "today_third_low_price_threshold_window_start")
+
+
+class RCETodayThirdLowPriceThresholdWindowEndSensor(RCELowPriceThresholdWindowSensor):
+    _dependencies = EntityDependencies(day_offsets=(0,), option_keys=LOW_PRICE_OPTIONS)
+    _attr_entity_registry_enabled_default = False
+    _rank = 2
+    _is_end = True
+
+    def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
+        super().__init__(coordinator, config_entry, "today_third_low_price_threshold_window_end")
@@ -7,6 +7,7 @@ from typing import TYPE_CHECKING, Any
 from homeassistant.util import dt as dt_util
 
 from ..const import PDGSZ_USAGE_FCST_TO_ATTR
+from ..dependencies import Dataset, EntityDependencies, TimeGranularity
 from .base import RCEBaseSensor
 
 if TYPE_CHECKING:
@@ -121,12 +122,17 @@ class RCEPeakHoursSensorBase(RCEBaseSensor):
 
     @property
     def available(self) -> bool:
-        if not self.coordinator.last_update_success or not self.coordinator.data:
-            return False
-        return True
+        return bool(self.coordinator.last_update_success and self.coordinator.data)
 
 
 class RCETodayPeakHoursSensor(RCEPeakHoursSensorBase):
+    _dependencies = EntityDependencies(
+        day_offsets=(0,),
+        datasets=frozenset({Dataset.PDGSZ}),
+        option_keys=frozenset(),
+        granularity=TimeGranularity.SLOT,
+    )
+
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator) -> None:
         super().__init__(coordinator, "today_peak_hours")
 
@@ -135,6 +141,13 @@ class RCETodayPeakHoursSensor(RCEPeakHoursSensorBase):
 
 
 class RCETomorrowPeakHoursSensor(RCEPeakHoursSensorBase):
+    _dependencies = EntityDependencies(
+        day_offsets=(1,),
+        datasets=frozenset({Dataset.PDGSZ}),
+        option_keys=frozenset(),
+        granularity=TimeGranularity.SLOT,
+    )
+
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator) -> None:
         super().__init__(coordinator, "tomorrow_peak_hours")
 
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.util import dt as dt_util
+
+from ..dependencies import ROLLING_WINDOW_OPTIONS, EntityDependencies, TimeGranularity
+from ..price_series import SLOT_SECONDS, record_period_end, record_price
+from .base import RCEBaseSensor
+
+if TYPE_CHECKING:
+    from ..coordinator import RCEPSEDataUpdateCoordinator
+
+
+class RCENextWindowSensor(RCEBaseSensor):
+    _dependencies = EntityDependencies(
+        day_offsets=(0, 1), option_keys=ROLLING_WINDOW_OPTIONS, granularity=TimeGranularity.SLOT
+    )
+
+    def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, unique_id: str) -> None:
+        super().__init__(coordinator, unique_id)
+        self._attr_device_class = SensorDeviceClass.TIMESTAMP
+
+    def get_next_window(self) -> list[dict]:
+        return self.coordinator.next_window(
+            self.coordinator.rolling_window_query(), dt_util.now().replace(tzinfo=None)
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        window = self.get_next_window()
+        if not window:
+            return None
+        prices = [record_price(record) for record in window]
+        return {
+            "average_price": self.round_display_price(sum(prices) / len(prices)),
+            "horizon_hours": self.coordinator.rolling_window_query().horizon_minutes / 60,
+        }
+
+
+class RCENextCheapestWindowStartSensor(RCENextWindowSensor):
+
+    def __init__(self, coordinator: RCEPSEDataUpdateCoordinator) -> None:
+        super().__init__(coordinator, "next_cheapest_window_start")
+        self._attr_icon = "mdi:clock-start"
+
+    @property
+    def native_value(self) -> datetime | None:
+        window = self.get_next_window()
+        if not window:
+            return None
+        return dt_util.as_local(record_period_end(window[0]) - timedelta(seconds=SLOT_SECONDS))
+
+
+class RCENextCheapestWindowEndSensor(RCENextWindowSensor):
+
+    def __init__(self, coordinator: RCEPSEDataUpdateCoordinator) -> None:
+        super().__init__(coordinator, "next_cheapest_window_end")
+        self._attr_icon = "mdi:clock-end"
+
+    @property
+    def native_value(self) -> datetime | None:
+        window = self.get_next_window()
+        if not window:
+            return None
+        return dt_util.as_local(record_period_end(window[-1]))
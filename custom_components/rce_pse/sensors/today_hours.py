@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING
 from homeassistant.components.sensor import SensorDeviceClass
 from homeassistant.util import dt as dt_util
 
+from ..dependencies import TODAY_PRICES
 from .base import RCEBaseSensor
 
 if TYPE_CHECKING:
@@ -13,6 +14,7 @@ if TYPE_CHECKING:
 
 
 class RCETodayHoursSensor(RCEBaseSensor):
+    _dependencies = TODAY_PRICES
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, unique_id: str) -> None:
         super().__init__(coordinator, unique_id)
@@ -32,7 +34,7 @@ class RCETodayMaxPriceHourStartTimestampSensor(RCETodayHoursSensor):
         if not today_data:
             return None
         
-        max_price_records = self.calculator.find_extreme_price_records(today_data, is_max=True)
+        max_price_records = self.get_extreme_price_records(today_data, is_max=True)
         if not max_price_records:
             return None
         
@@ -59,7 +61,7 @@ class RCETodayMaxPriceHourEndTimestampSensor(RCETodayHoursSensor):
         if not today_data:
             return None
         
-        max_price_records = self.calculator.find_extreme_price_records(today_data, is_max=True)
+        max_price_records = self.get_extreme_price_records(today_data, is_max=True)
         if not max_price_records:
             return None
         
@@ -86,7 +88,7 @@ class RCETodayMinPriceHourStartTimestampSensor(RCETodayHoursSensor):
         if not today_data:
             return None
         
-        min_price_records = self.calculator.find_extreme_price_records(today_data, is_max=False)
+        min_price_records = self.get_extreme_price_records(today_data, is_max=False)
         if not min_price_records:
             return None
         
@@ -113,7 +115,7 @@ class RCETodayMinPriceHourEndTimestampSensor(RCETodayHoursSensor):
         if not today_data:
             return None
         
-        min_price_records = self.calculator.find_extreme_price_records(today_data, is_max=False)
+        min_price_records = self.get_extreme_price_records(today_data, is_max=False)
         if not min_price_records:
             return None
         
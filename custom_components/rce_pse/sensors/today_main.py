@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from datetime import timedelta
 from typing import Any, TYPE_CHECKING
 
-from .base import RCEPriceSensor
+from ..dependencies import CURRENT_PRICE, EntityDependencies, TimeGranularity
+from .base import PRICE_LIST_ATTRIBUTES, RCEPriceSensor
+from ..price_series import record_price
 from ..const import CONF_USE_GROSS_PRICES, DEFAULT_USE_GROSS_PRICES, TAX_RATE
 
 if TYPE_CHECKING:
@@ -11,45 +12,36 @@ if TYPE_CHECKING:
 
 
 class RCETodayMainSensor(RCEPriceSensor):
+    _dependencies = EntityDependencies(day_offsets=(0,), granularity=TimeGranularity.SLOT, fetch_metadata=True)
+    _unrecorded_attributes = PRICE_LIST_ATTRIBUTES
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator) -> None:
         super().__init__(coordinator, "today_price")
         self._attr_native_unit_of_measurement = self.native_price_unit()
         self._attr_icon = "mdi:cash"
 
-    @property
-    def should_poll(self) -> bool:
-        return True
-
-    @property
-    def scan_interval(self) -> timedelta:
-        return timedelta(minutes=1)
-
     @property
     def native_value(self) -> float | None:
         current_data = self.get_current_price_data()
         if current_data:
-            return self.round_display_price(float(current_data["rce_pln"]))
+            return self.round_display_price(record_price(current_data))
         return None
 
     @property
     def extra_state_attributes(self) -> dict[str, Any] | None:
         today_data = self.get_today_data()
-        excluded_keys = {"rce_pln_neg_to_zero", "publication_ts"}
-        sanitized_today_data = self.round_price_records_for_attributes(
-            [{k: v for k, v in record.items() if k not in excluded_keys} for record in today_data]
-        )
         
         attributes = {
             "last_update": self.coordinator.data.get("last_update") if self.coordinator.data else None,
             "data_points": len(today_data),
-            "prices": sanitized_today_data,
+            **self.get_price_list_attributes(today_data),
         }
         
         return attributes
 
 
 class RCETodayProsumerSellingPriceSensor(RCEPriceSensor):
+    _dependencies = CURRENT_PRICE
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator) -> None:
         super().__init__(coordinator, "today_prosumer_selling_price")
@@ -60,7 +52,7 @@ class RCETodayProsumerSellingPriceSensor(RCEPriceSensor):
     def native_value(self) -> float | None:
         current_data = self.get_current_price_data()
         if current_data:
-            price = float(current_data["rce_pln_neg_to_zero"])
+            price = record_price(current_data, "rce_pln_neg_to_zero")
             if price <= 0:
                 return 0
 
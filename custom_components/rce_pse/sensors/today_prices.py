@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from ..dependencies import CURRENT_PRICE, EntityDependencies, TimeGranularity
 from .base import RCEPriceSensor
 
 if TYPE_CHECKING:
@@ -9,6 +10,7 @@ if TYPE_CHECKING:
 
 
 class RCENextPeriodPriceSensor(RCEPriceSensor):
+    _dependencies = EntityDependencies(day_offsets=(0, 1), granularity=TimeGranularity.SLOT)
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator) -> None:
         super().__init__(coordinator, "next_period_price")
@@ -22,6 +24,7 @@ class RCENextPeriodPriceSensor(RCEPriceSensor):
 
 
 class RCEPreviousPeriodPriceSensor(RCEPriceSensor):
+    _dependencies = CURRENT_PRICE
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator) -> None:
         super().__init__(coordinator, "previous_period_price")
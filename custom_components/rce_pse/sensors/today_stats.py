@@ -3,6 +3,8 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from ..const import CONF_PRICE_UNIT, DEFAULT_PRICE_UNIT, DISPLAY_PRICE_DECIMALS
+from ..dependencies import CURRENT_PRICE, TODAY_PRICES
+from ..price_series import record_price
 from .base import RCEBaseSensor
 
 if TYPE_CHECKING:
@@ -10,6 +12,7 @@ if TYPE_CHECKING:
 
 
 class RCETodayStatsSensor(RCEBaseSensor):
+    _dependencies = TODAY_PRICES
 
     def __init__(
         self,
@@ -41,8 +44,8 @@ class RCETodayAvgPriceSensor(RCETodayStatsSensor):
         if not today_data:
             return None
         
-        prices = self.calculator.get_prices_from_data(today_data)
-        return self.round_display_price(self.calculator.calculate_average(prices))
+        stats = self.get_day_stats(today_data)
+        return self.round_display_price(stats.average)
 
 
 class RCETodayMaxPriceSensor(RCETodayStatsSensor):
@@ -56,8 +59,8 @@ class RCETodayMaxPriceSensor(RCETodayStatsSensor):
         if not today_data:
             return None
         
-        prices = self.calculator.get_prices_from_data(today_data)
-        return self.round_display_price(max(prices)) if prices else None
+        stats = self.get_day_stats(today_data)
+        return self.round_display_price(stats.max_price) if stats.prices else None
 
 
 class RCETodayMinPriceSensor(RCETodayStatsSensor):
@@ -71,8 +74,8 @@ class RCETodayMinPriceSensor(RCETodayStatsSensor):
         if not today_data:
             return None
         
-        prices = self.calculator.get_prices_from_data(today_data)
-        return self.round_display_price(min(prices)) if prices else None
+        stats = self.get_day_stats(today_data)
+        return self.round_display_price(stats.min_price) if stats.prices else None
 
 
 class RCETodayMedianPriceSensor(RCETodayStatsSensor):
@@ -86,11 +89,12 @@ class RCETodayMedianPriceSensor(RCETodayStatsSensor):
         if not today_data:
             return None
         
-        prices = self.calculator.get_prices_from_data(today_data)
-        return self.round_display_price(self.calculator.calculate_median(prices))
+        stats = self.get_day_stats(today_data)
+        return self.round_display_price(stats.median)
 
 
 class RCETodayCurrentVsAverageSensor(RCETodayStatsSensor):
+    _dependencies = CURRENT_PRICE
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator) -> None:
         super().__init__(coordinator, "today_current_vs_average", "%", "mdi:percent")
@@ -103,9 +107,8 @@ class RCETodayCurrentVsAverageSensor(RCETodayStatsSensor):
         if not current_data or not today_data:
             return None
         
-        current_price = float(current_data["rce_pln"])
-        prices = self.calculator.get_prices_from_data(today_data)
-        avg_price = self.calculator.calculate_average(prices)
+        current_price = record_price(current_data)
+        avg_price = self.get_day_stats(today_data).average
         
         percentage = self.calculator.calculate_percentage_difference(current_price, avg_price)
         return round(percentage, 1) 
\ No newline at end of file
@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING
 from homeassistant.components.sensor import SensorDeviceClass
 from homeassistant.util import dt as dt_util
 
+from ..dependencies import TOMORROW_PRICES
 from .base import RCEBaseSensor
 
 if TYPE_CHECKING:
@@ -13,6 +14,7 @@ if TYPE_CHECKING:
 
 
 class RCETomorrowHoursSensor(RCEBaseSensor):
+    _dependencies = TOMORROW_PRICES
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, unique_id: str) -> None:
         super().__init__(coordinator, unique_id)
@@ -32,7 +34,7 @@ class RCETomorrowMaxPriceHourStartTimestampSensor(RCETomorrowHoursSensor):
         if not tomorrow_data:
             return None
         
-        max_price_records = self.calculator.find_extreme_price_records(tomorrow_data, is_max=True)
+        max_price_records = self.get_extreme_price_records(tomorrow_data, is_max=True)
         if not max_price_records:
             return None
         
@@ -59,7 +61,7 @@ class RCETomorrowMaxPriceHourEndTimestampSensor(RCETomorrowHoursSensor):
         if not tomorrow_data:
             return None
         
-        max_price_records = self.calculator.find_extreme_price_records(tomorrow_data, is_max=True)
+        max_price_records = self.get_extreme_price_records(tomorrow_data, is_max=True)
         if not max_price_records:
             return None
         
@@ -86,7 +88,7 @@ class RCETomorrowMinPriceHourStartTimestampSensor(RCETomorrowHoursSensor):
         if not tomorrow_data:
             return None
         
-        min_price_records = self.calculator.find_extreme_price_records(tomorrow_data, is_max=False)
+        min_price_records = self.get_extreme_price_records(tomorrow_data, is_max=False)
         if not min_price_records:
             return None
         
@@ -113,7 +115,7 @@ class RCETomorrowMinPriceHourEndTimestampSensor(RCETomorrowHoursSensor):
         if not tomorrow_data:
             return None
         
-        min_price_records = self.calculator.find_extreme_price_records(tomorrow_data, is_max=False)
+        min_price_records = self.get_extreme_price_records(tomorrow_data, is_max=False)
         if not min_price_records:
             return None
         
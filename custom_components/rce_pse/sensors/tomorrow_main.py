@@ -1,31 +1,26 @@
 from __future__ import annotations
 
-from datetime import timedelta
 from typing import Any, TYPE_CHECKING
 
 from homeassistant.util import dt as dt_util
 
-from .base import RCEPriceSensor
+from ..dependencies import EntityDependencies, TimeGranularity
+from .base import PRICE_LIST_ATTRIBUTES, RCEPriceSensor
+from ..price_series import record_price
 
 if TYPE_CHECKING:
     from ..coordinator import RCEPSEDataUpdateCoordinator
 
 
 class RCETomorrowMainSensor(RCEPriceSensor):
+    _dependencies = EntityDependencies(day_offsets=(1,), granularity=TimeGranularity.SLOT, fetch_metadata=True)
+    _unrecorded_attributes = PRICE_LIST_ATTRIBUTES
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator) -> None:
         super().__init__(coordinator, "tomorrow_price")
         self._attr_native_unit_of_measurement = self.native_price_unit()
         self._attr_icon = "mdi:cash"
 
-    @property
-    def should_poll(self) -> bool:
-        return True
-
-    @property
-    def scan_interval(self) -> timedelta:
-        return timedelta(minutes=1)
-
     @property
     def native_value(self) -> float | None:
         now = dt_util.now()
@@ -34,7 +29,7 @@ class RCETomorrowMainSensor(RCEPriceSensor):
         if not tomorrow_price_record:
             return None
         
-        return self.round_display_price(float(tomorrow_price_record["rce_pln"]))
+        return self.round_display_price(record_price(tomorrow_price_record))
 
     @property
     def extra_state_attributes(self) -> dict[str, Any] | None:
@@ -53,16 +48,12 @@ class RCETomorrowMainSensor(RCEPriceSensor):
         now = dt_util.now()
         current_hour = now.hour
         tomorrow_data = self.get_tomorrow_data()
-        excluded_keys = {"rce_pln_neg_to_zero", "publication_ts"}
-        sanitized_tomorrow_data = self.round_price_records_for_attributes(
-            [{k: v for k, v in record.items() if k not in excluded_keys} for record in tomorrow_data]
-        )
         tomorrow_price_record = self.get_tomorrow_price_at_time(now)
         
         attributes = {
             "last_update": self.coordinator.data.get("last_update") if self.coordinator.data else None,
             "data_points": len(tomorrow_data),
-            "prices": sanitized_tomorrow_data,
+            **self.get_price_list_attributes(tomorrow_data),
             "available_after": "14:00 CET",
             "status": "Available",
             "current_hour": current_hour,
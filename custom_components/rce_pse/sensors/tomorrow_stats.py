@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from ..const import CONF_PRICE_UNIT, DEFAULT_PRICE_UNIT, DISPLAY_PRICE_DECIMALS
+from ..dependencies import TODAY_AND_TOMORROW_PRICES, TOMORROW_PRICES
 from .base import RCEBaseSensor
 
 if TYPE_CHECKING:
@@ -10,6 +11,7 @@ if TYPE_CHECKING:
 
 
 class RCETomorrowStatsSensor(RCEBaseSensor):
+    _dependencies = TOMORROW_PRICES
 
     def __init__(
         self,
@@ -41,8 +43,8 @@ class RCETomorrowAvgPriceSensor(RCETomorrowStatsSensor):
         if not tomorrow_data:
             return None
         
-        prices = self.calculator.get_prices_from_data(tomorrow_data)
-        return self.round_display_price(self.calculator.calculate_average(prices))
+        stats = self.get_day_stats(tomorrow_data)
+        return self.round_display_price(stats.average)
 
 
 class RCETomorrowMaxPriceSensor(RCETomorrowStatsSensor):
@@ -56,8 +58,8 @@ class RCETomorrowMaxPriceSensor(RCETomorrowStatsSensor):
         if not tomorrow_data:
             return None
         
-        prices = self.calculator.get_prices_from_data(tomorrow_data)
-        return self.round_display_price(max(prices)) if prices else None
+        stats = self.get_day_stats(tomorrow_data)
+        return self.round_display_price(stats.max_price) if stats.prices else None
 
 
 class RCETomorrowMinPriceSensor(RCETomorrowStatsSensor):
@@ -71,8 +73,8 @@ class RCETomorrowMinPriceSensor(RCETomorrowStatsSensor):
         if not tomorrow_data:
             return None
         
-        prices = self.calculator.get_prices_from_data(tomorrow_data)
-        return self.round_display_price(min(prices)) if prices else None
+        stats = self.get_day_stats(tomorrow_data)
+        return self.round_display_price(stats.min_price) if stats.prices else None
 
 
 class RCETomorrowMedianPriceSensor(RCETomorrowStatsSensor):
@@ -86,11 +88,12 @@ class RCETomorrowMedianPriceSensor(RCETomorrowStatsSensor):
         if not tomorrow_data:
             return None
         
-        prices = self.calculator.get_prices_from_data(tomorrow_data)
-        return self.round_display_price(self.calculator.calculate_median(prices))
+        stats = self.get_day_stats(tomorrow_data)
+        return self.round_display_price(stats.median)
 
 
 class RCETomorrowTodayAvgComparisonSensor(RCETomorrowStatsSensor):
+    _dependencies = TODAY_AND_TOMORROW_PRICES
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator) -> None:
         super().__init__(coordinator, "tomorrow_vs_today_avg", "%", "mdi:percent")
@@ -103,11 +106,8 @@ class RCETomorrowTodayAvgComparisonSensor(RCETomorrowStatsSensor):
         if not tomorrow_data or not today_data:
             return None
         
-        tomorrow_prices = self.calculator.get_prices_from_data(tomorrow_data)
-        today_prices = self.calculator.get_prices_from_data(today_data)
-        
-        tomorrow_avg = self.calculator.calculate_average(tomorrow_prices)
-        today_avg = self.calculator.calculate_average(today_prices)
+        tomorrow_avg = self.get_day_stats(tomorrow_data).average
+        today_avg = self.get_day_stats(today_data).average
         
         percentage = self.calculator.calculate_percentage_difference(tomorrow_avg, today_avg)
         return round(percentage, 1) 
\ No newline at end of file
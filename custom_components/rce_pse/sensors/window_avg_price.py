@@ -2,6 +2,12 @@ from __future__ import annotations
 
 from homeassistant.config_entries import ConfigEntry
 
+from ..dependencies import (
+    CHEAPEST_WINDOW_OPTIONS,
+    EXPENSIVE_WINDOW_OPTIONS,
+    SECOND_EXPENSIVE_WINDOW_OPTIONS,
+    EntityDependencies,
+)
 from ..coordinator import RCEPSEDataUpdateCoordinator
 from ..const import (
     CONF_CHEAPEST_TIME_WINDOW_START,
@@ -25,6 +31,7 @@ from .custom_windows import RCECustomWindowSensor
 
 
 class RCETodayCheapestWindowAvgPriceSensor(RCECustomWindowSensor):
+    _dependencies = EntityDependencies(day_offsets=(0,), option_keys=CHEAPEST_WINDOW_OPTIONS)
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
         super().__init__(coordinator, config_entry, "today_cheapest_window_avg_price")
@@ -54,6 +61,7 @@ class RCETodayCheapestWindowAvgPriceSensor(RCECustomWindowSensor):
 
 
 class RCETodayExpensiveWindowAvgPriceSensor(RCECustomWindowSensor):
+    _dependencies = EntityDependencies(day_offsets=(0,), option_keys=EXPENSIVE_WINDOW_OPTIONS)
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
         super().__init__(coordinator, config_entry, "today_expensive_window_avg_price")
@@ -83,6 +91,7 @@ class RCETodayExpensiveWindowAvgPriceSensor(RCECustomWindowSensor):
 
 
 class RCETodaySecondExpensiveWindowAvgPriceSensor(RCECustomWindowSensor):
+    _dependencies = EntityDependencies(day_offsets=(0,), option_keys=SECOND_EXPENSIVE_WINDOW_OPTIONS)
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
         super().__init__(coordinator, config_entry, "today_second_expensive_window_avg_price")
@@ -107,7 +116,7 @@ class RCETodaySecondExpensiveWindowAvgPriceSensor(RCECustomWindowSensor):
         )
 
         optimal_window = self.find_optimal_window_for_data(
-            today_data, start_s, end_s, duration, is_max=True
+            today_data, start_s, end_s, duration, is_max=True, exclude=self.expensive_window_spec()
         )
 
         if not optimal_window:
@@ -118,6 +127,7 @@ class RCETodaySecondExpensiveWindowAvgPriceSensor(RCECustomWindowSensor):
 
 
 class RCETomorrowCheapestWindowAvgPriceSensor(RCECustomWindowSensor):
+    _dependencies = EntityDependencies(day_offsets=(1,), option_keys=CHEAPEST_WINDOW_OPTIONS)
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
         super().__init__(coordinator, config_entry, "tomorrow_cheapest_window_avg_price")
@@ -147,6 +157,7 @@ class RCETomorrowCheapestWindowAvgPriceSensor(RCECustomWindowSensor):
 
 
 class RCETomorrowExpensiveWindowAvgPriceSensor(RCECustomWindowSensor):
+    _dependencies = EntityDependencies(day_offsets=(1,), option_keys=EXPENSIVE_WINDOW_OPTIONS)
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
         super().__init__(coordinator, config_entry, "tomorrow_expensive_window_avg_price")
@@ -176,6 +187,7 @@ class RCETomorrowExpensiveWindowAvgPriceSensor(RCECustomWindowSensor):
 
 
 class RCETomorrowSecondExpensiveWindowAvgPriceSensor(RCECustomWindowSensor):
+    _dependencies = EntityDependencies(day_offsets=(1,), option_keys=SECOND_EXPENSIVE_WINDOW_OPTIONS)
 
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
         super().__init__(coordinator, config_entry, "tomorrow_second_expensive_window_avg_price")
@@ -200,7 +212,7 @@ class RCETomorrowSecondExpensiveWindowAvgPriceSensor(RCECustomWindowSensor):
         )
 
         optimal_window = self.find_optimal_window_for_data(
-            tomorrow_data, start_s, end_s, duration, is_max=True
+            tomorrow_data, start_s, end_s, duration, is_max=True, exclude=self.expensive_window_spec()
         )
 
         if not optimal_window:
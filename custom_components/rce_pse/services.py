@@ -0,0 +1,393 @@
+from __future__ import annotations
+
+import logging
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import Any
+
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.util import dt as dt_util
+
+from .battery import BatteryPlan
+from .const import (
+    DOMAIN,
+    MAX_ROLLING_WINDOW_HORIZON,
+    MAX_SCHEDULE_SEGMENTS,
+    PRICE_INTERNAL_DECIMALS,
+    UNIT_PLN_KWH,
+    UNIT_PLN_MWH,
+)
+from .coordinator import RCEPSEDataUpdateCoordinator
+from .derived import RollingWindowQuery, ScheduleQuery, WindowQuery
+from .price_series import (
+    SLOT_SECONDS,
+    PriceSeries,
+    datetime_from_epoch,
+    epoch_seconds,
+    record_period_end,
+    record_price,
+)
+from .time_window import (
+    duration_minutes_from_hhmm,
+    is_valid_duration_hhmm,
+    is_valid_quarter_step,
+    normalize_hhmm,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_GET_PRICES = "get_prices"
+SERVICE_FIND_WINDOW = "find_window"
+SERVICE_FIND_SCHEDULE = "find_schedule"
+SERVICE_GET_BATTERY_PLAN = "get_battery_plan"
+SERVICE_PLAN_CHARGING = "plan_charging"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_RESOLUTION = "resolution"
+ATTR_UNIT = "unit"
+ATTR_GROSS = "gross"
+ATTR_SEARCH_START = "search_start"
+ATTR_SEARCH_END = "search_end"
+ATTR_DURATION = "duration"
+ATTR_DIRECTION = "direction"
+ATTR_DAY_OFFSET = "day_offset"
+ATTR_HORIZON = "horizon"
+ATTR_ENERGY = "energy"
+ATTR_POWER = "power"
+ATTR_DEADLINE = "deadline"
+ATTR_CONTIGUOUS = "contiguous"
+ATTR_MAX_SEGMENTS = "max_segments"
+ATTR_MIN_SEGMENT = "min_segment"
+
+RESOLUTION_15MIN = "15min"
+RESOLUTION_HOURLY = "hourly"
+
+DIRECTION_CHEAPEST = "cheapest"
+DIRECTION_MOST_EXPENSIVE = "most_expensive"
+
+GET_PRICES_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_RESOLUTION): vol.In([RESOLUTION_15MIN, RESOLUTION_HOURLY]),
+        vol.Optional(ATTR_UNIT): vol.In([UNIT_PLN_MWH, UNIT_PLN_KWH]),
+        vol.Optional(ATTR_GROSS): cv.boolean,
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
+
+
+def _quarter_hhmm(value: Any) -> str:
+    hhmm = normalize_hhmm(value)
+    if not is_valid_quarter_step(hhmm):
+        raise vol.Invalid(f"Expected HH:MM on a 15 minute step, got {value}")
+    return hhmm
+
+
+def _duration_hhmm(value: Any) -> str:
+    hhmm = normalize_hhmm(value)
+    if not is_valid_duration_hhmm(hhmm):
+        raise vol.Invalid(f"Expected a duration of at least 15 minutes in 15 minute steps, got {value}")
+    return hhmm
+
+
+FIND_WINDOW_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_SEARCH_START, default="00:00"): _quarter_hhmm,
+        vol.Optional(ATTR_SEARCH_END, default="00:00"): _quarter_hhmm,
+        vol.Required(ATTR_DURATION): _duration_hhmm,
+        vol.Optional(ATTR_DIRECTION, default=DIRECTION_CHEAPEST): vol.In(
+            [DIRECTION_CHEAPEST, DIRECTION_MOST_EXPENSIVE]
+        ),
+        vol.Optional(ATTR_DAY_OFFSET, default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=1)),
+        vol.Optional(ATTR_HORIZON): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_ROLLING_WINDOW_HORIZON)),
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
+
+FIND_SCHEDULE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_SEARCH_START, default="00:00"): _quarter_hhmm,
+        vol.Optional(ATTR_SEARCH_END, default="00:00"): _quarter_hhmm,
+        vol.Required(ATTR_DURATION): _duration_hhmm,
+        vol.Optional(ATTR_MAX_SEGMENTS, default=1): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_SCHEDULE_SEGMENTS)
+        ),
+        vol.Optional(ATTR_MIN_SEGMENT, default="00:15"): _duration_hhmm,
+        vol.Optional(ATTR_DAY_OFFSET, default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=1)),
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
+
+PLAN_CHARGING_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENERGY): vol.All(vol.Coerce(float), vol.Range(min=0, min_included=False)),
+        vol.Required(ATTR_POWER): vol.All(vol.Coerce(float), vol.Range(min=0, min_included=False)),
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Required(ATTR_DEADLINE): cv.datetime,
+        vol.Optional(ATTR_CONTIGUOUS, default=False): cv.boolean,
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
+
+GET_BATTERY_PLAN_SCHEMA = vol.Schema({vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string})
+
+
+def _get_coordinator(hass: HomeAssistant, call: ServiceCall) -> RCEPSEDataUpdateCoordinator:
+    coordinators = {
+        entry_id: coordinator
+        for entry_id, coordinator in hass.data.get(DOMAIN, {}).items()
+        if isinstance(coordinator, RCEPSEDataUpdateCoordinator)
+    }
+    entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+    if entry_id is not None:
+        if entry_id not in coordinators:
+            raise ServiceValidationError(f"RCE PSE config entry {entry_id} is not loaded")
+        return coordinators[entry_id]
+    if not coordinators:
+        raise ServiceValidationError("RCE PSE is not set up")
+    if len(coordinators) > 1:
+        raise ServiceValidationError("Several RCE PSE entries are loaded, set config_entry_id to choose one")
+    return next(iter(coordinators.values()))
+
+
+def _local_naive(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return dt_util.as_local(value).replace(tzinfo=None)
+
+
+def _local_iso(value: datetime) -> str:
+    return value.replace(tzinfo=dt_util.get_default_time_zone()).isoformat()
+
+
+def series_prices_between(
+    series: PriceSeries, start: datetime, end: datetime, hourly: bool
+) -> list[dict[str, Any]]:
+    starts = series.starts
+    first = bisect_left(starts, epoch_seconds(start) - SLOT_SECONDS + 1)
+    last = bisect_left(starts, epoch_seconds(end))
+    step = 3600 if hourly else SLOT_SECONDS
+    prices: list[tuple[int, int, float]] = []
+    for i in range(first, last):
+        period_start = starts[i] - starts[i] % step
+        if prices and prices[-1][0] == period_start:
+            continue
+        prices.append((period_start, period_start + step, series.prices[i]))
+    return [
+        {
+            "start": _local_iso(datetime_from_epoch(period_start)),
+            "end": _local_iso(datetime_from_epoch(period_end)),
+            "price": price,
+        }
+        for period_start, period_end, price in prices
+    ]
+
+
+def window_response(business_date: str, window: list[dict]) -> dict[str, Any]:
+    if not window:
+        return {
+            "business_date": business_date,
+            "start": None,
+            "end": None,
+            "average_price": None,
+            "prices": [],
+        }
+    prices = [record_price(record) for record in window]
+    return {
+        "business_date": business_date,
+        "start": _local_iso(record_period_end(window[0]) - timedelta(seconds=SLOT_SECONDS)),
+        "end": _local_iso(record_period_end(window[-1])),
+        "average_price": round(sum(prices) / len(prices), PRICE_INTERNAL_DECIMALS),
+        "prices": prices,
+    }
+
+
+def schedule_response(business_date: str, segments: list[list[dict]]) -> dict[str, Any]:
+    prices = [record_price(record) for segment in segments for record in segment]
+    return {
+        "business_date": business_date,
+        "segments": [
+            {key: value for key, value in window_response(business_date, segment).items() if key != "business_date"}
+            for segment in segments
+        ],
+        "average_price": round(sum(prices) / len(prices), PRICE_INTERNAL_DECIMALS) if prices else None,
+    }
+
+
+def battery_plan_response(plan: BatteryPlan, now: datetime) -> dict[str, Any]:
+    return {
+        "projected_savings": round(plan.savings, 2),
+        "currency": "PLN",
+        "slots": [
+            {
+                "start": _local_iso(slot.period_start),
+                "end": _local_iso(slot.period_end),
+                "action": slot.action,
+                "price": round(slot.price, PRICE_INTERNAL_DECIMALS),
+                "grid_energy": round(slot.grid_energy_kwh, 3),
+                "soc": round(slot.soc * 100, 1),
+            }
+            for slot in plan.slots_from(now)
+        ],
+    }
+
+
+def charging_plan_response(plan: list[tuple[dict, float]]) -> dict[str, Any]:
+    energy = sum(kwh for _, kwh in plan)
+    cost = sum(record_price(record) * kwh for record, kwh in plan)
+    return {
+        "start": _local_iso(record_period_end(plan[0][0]) - timedelta(seconds=SLOT_SECONDS)),
+        "end": _local_iso(record_period_end(plan[-1][0])),
+        "energy": round(energy, 3),
+        "expected_cost": round(cost, 2),
+        "average_price": round(cost / energy, PRICE_INTERNAL_DECIMALS),
+        "currency": "PLN",
+        "slots": [
+            {
+                "start": _local_iso(record_period_end(record) - timedelta(seconds=SLOT_SECONDS)),
+                "end": _local_iso(record_period_end(record)),
+                "price": record_price(record),
+                "energy": round(kwh, 3),
+            }
+            for record, kwh in plan
+        ],
+    }
+
+
+def _business_date(day_offset: int) -> str:
+    return (dt_util.now().date() + timedelta(days=day_offset)).isoformat()
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+
+    async def async_get_prices(call: ServiceCall) -> ServiceResponse:
+        coordinator = _get_coordinator(hass, call)
+        hourly, gross, unit = coordinator.price_variant()
+        if ATTR_RESOLUTION in call.data:
+            hourly = call.data[ATTR_RESOLUTION] == RESOLUTION_HOURLY
+        gross = call.data.get(ATTR_GROSS, gross)
+        unit = call.data.get(ATTR_UNIT, unit)
+
+        today = dt_util.start_of_local_day().replace(tzinfo=None)
+        start = _local_naive(call.data.get(ATTR_START, today))
+        end = _local_naive(call.data.get(ATTR_END, today + timedelta(days=2)))
+        if end <= start:
+            raise ServiceValidationError("end must be after start")
+
+        series = coordinator.get_price_series(hourly, gross, unit)
+        prices = series_prices_between(series, start, end, hourly) if series else []
+        _LOGGER.debug("get_prices returned %d periods", len(prices))
+        return {
+            "unit": unit,
+            "gross": gross,
+            "resolution": RESOLUTION_HOURLY if hourly else RESOLUTION_15MIN,
+            "last_update": coordinator.data.get("last_update") if coordinator.data else None,
+            "prices": prices,
+        }
+
+    async def async_find_window(call: ServiceCall) -> ServiceResponse:
+        coordinator = _get_coordinator(hass, call)
+        if ATTR_HORIZON in call.data:
+            rolling = RollingWindowQuery(
+                call.data[ATTR_HORIZON] * 60,
+                duration_minutes_from_hhmm(call.data[ATTR_DURATION]),
+                call.data[ATTR_DIRECTION] == DIRECTION_MOST_EXPENSIVE,
+            )
+            window = coordinator.search_rolling_window(rolling, _local_naive(dt_util.now()))
+            return {
+                **window_response(window[0]["business_date"] if window else _business_date(0), window),
+                "unit": coordinator.price_variant()[2],
+            }
+        business_date = _business_date(call.data[ATTR_DAY_OFFSET])
+        query = WindowQuery(
+            business_date,
+            call.data[ATTR_SEARCH_START],
+            call.data[ATTR_SEARCH_END],
+            duration_minutes_from_hhmm(call.data[ATTR_DURATION]),
+            call.data[ATTR_DIRECTION] == DIRECTION_MOST_EXPENSIVE,
+        )
+        return {
+            **window_response(business_date, coordinator.find_window(query)),
+            "unit": coordinator.price_variant()[2],
+        }
+
+    async def async_find_schedule(call: ServiceCall) -> ServiceResponse:
+        coordinator = _get_coordinator(hass, call)
+        runtime = duration_minutes_from_hhmm(call.data[ATTR_DURATION])
+        min_segment = duration_minutes_from_hhmm(call.data[ATTR_MIN_SEGMENT])
+        if min_segment > runtime:
+            raise ServiceValidationError("min_segment must not be longer than duration")
+        business_date = _business_date(call.data[ATTR_DAY_OFFSET])
+        query = ScheduleQuery(
+            business_date,
+            call.data[ATTR_SEARCH_START],
+            call.data[ATTR_SEARCH_END],
+            runtime,
+            call.data[ATTR_MAX_SEGMENTS],
+            min_segment,
+        )
+        return {
+            **schedule_response(business_date, coordinator.find_schedule(query)),
+            "unit": coordinator.price_variant()[2],
+        }
+
+    async def async_get_battery_plan(call: ServiceCall) -> ServiceResponse:
+        plan = _get_coordinator(hass, call).battery_plan()
+        if plan is None:
+            raise ServiceValidationError("Battery is not configured or no prices are available")
+        return battery_plan_response(plan, _local_naive(dt_util.now()))
+
+    async def async_plan_charging(call: ServiceCall) -> ServiceResponse:
+        coordinator = _get_coordinator(hass, call)
+        start = _local_naive(call.data.get(ATTR_START, dt_util.now()))
+        deadline = _local_naive(call.data[ATTR_DEADLINE])
+        if deadline <= start:
+            raise ServiceValidationError("deadline must be after start")
+        plan = coordinator.plan_charging(
+            start, deadline, call.data[ATTR_ENERGY], call.data[ATTR_POWER], call.data[ATTR_CONTIGUOUS]
+        )
+        if not plan:
+            raise ServiceValidationError("Not enough priced time before the deadline to deliver the requested energy")
+        return charging_plan_response(plan)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_PRICES,
+        async_get_prices,
+        schema=GET_PRICES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FIND_WINDOW,
+        async_find_window,
+        schema=FIND_WINDOW_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FIND_SCHEDULE,
+        async_find_schedule,
+        schema=FIND_SCHEDULE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_BATTERY_PLAN,
+        async_get_battery_plan,
+        schema=GET_BATTERY_PLAN_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PLAN_CHARGING,
+        async_plan_charging,
+        schema=PLAN_CHARGING_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from datetime import timedelta
-from typing import TYPE_CHECKING
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
 
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
@@ -13,12 +14,36 @@ from .const import (
     DOMAIN,
     MANUFACTURER,
 )
+from .dependencies import EntityDependencies, TimeGranularity
+from .derived import (
+    EXPENSIVE_WINDOW,
+    RCEDayStats,
+    RCEDerivedData,
+    RCESlotSelection,
+    ScheduleQuery,
+    ThresholdIndex,
+    WindowQuery,
+    window_spec,
+)
+from .polling import complete_business_dates
 from .price_calculator import PriceCalculator
+from .price_series import PriceSeries, record_price
+from .time_window import business_date_from_day_data
 
 if TYPE_CHECKING:
     from .coordinator import RCEPSEDataUpdateCoordinator
 
+
+def next_local_midnight(now: datetime) -> datetime:
+    local_now = dt_util.as_local(now)
+    return datetime.combine(
+        local_now.date() + timedelta(days=1), datetime.min.time(), tzinfo=local_now.tzinfo
+    )
+
+
 class RCEBaseCommonEntity(CoordinatorEntity):
+    _dependencies = EntityDependencies()
+
     def __init__(self, coordinator: RCEPSEDataUpdateCoordinator, unique_id: str) -> None:
         super().__init__(coordinator)
         self._attr_unique_id = f"rce_pse_{unique_id}"
@@ -26,25 +51,54 @@ class RCEBaseCommonEntity(CoordinatorEntity):
         self._attr_translation_key = f"rce_pse_{unique_id}"
         self.calculator = PriceCalculator()
 
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        dispatcher = self.coordinator.dispatcher
+        if dispatcher is not None:
+            self.async_on_remove(
+                dispatcher.async_add_entity(self._handle_dependency_update, self._dependencies)
+            )
+
+        scheduler = self.coordinator.slot_scheduler
+        if scheduler is None:
+            return
+        granularity = self._dependencies.granularity
+        if granularity is TimeGranularity.SLOT:
+            self.async_on_remove(scheduler.async_add_listener(self._handle_scheduled_update))
+        elif granularity is TimeGranularity.TRANSITION:
+            self.async_on_remove(
+                scheduler.async_add_listener(self._handle_scheduled_update, self.next_transition)
+            )
+        elif granularity is TimeGranularity.DAY:
+            self.async_on_remove(
+                scheduler.async_add_listener(self._handle_scheduled_update, next_local_midnight)
+            )
+
+    def next_transition(self, now: datetime) -> datetime | None:
+        return None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if self.coordinator.dispatcher is None:
+            super()._handle_coordinator_update()
+
+    @callback
+    def _handle_dependency_update(self) -> None:
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_scheduled_update(self) -> None:
+        self.async_write_ha_state()
+
+    def get_config_value(self, key: str, default: Any) -> Any:
+        return self.coordinator._get_config_value(key, default)
+
     def native_price_unit(self) -> str:
         return self.coordinator._get_config_value(CONF_PRICE_UNIT, DEFAULT_PRICE_UNIT)
 
     def round_display_price(self, value: float) -> float:
         return round(value, DISPLAY_PRICE_DECIMALS)
 
-    def round_price_records_for_attributes(self, records: list[dict]) -> list[dict]:
-        out: list[dict] = []
-        for record in records:
-            item = dict(record)
-            for key in ("rce_pln", "rce_pln_neg_to_zero"):
-                if key in item and item[key] is not None:
-                    try:
-                        item[key] = round(float(item[key]), DISPLAY_PRICE_DECIMALS)
-                    except (ValueError, TypeError):
-                        pass
-            out.append(item)
-        return out
-
     def round_price_dict_for_attributes(self, record: dict | None) -> dict | None:
         if record is None:
             return None
@@ -52,7 +106,7 @@ class RCEBaseCommonEntity(CoordinatorEntity):
         for key in ("rce_pln", "rce_pln_neg_to_zero"):
             if key in item and item[key] is not None:
                 try:
-                    item[key] = round(float(item[key]), DISPLAY_PRICE_DECIMALS)
+                    item[key] = round(record_price(record, key), DISPLAY_PRICE_DECIMALS)
                 except (ValueError, TypeError):
                     pass
         return item
@@ -67,25 +121,140 @@ class RCEBaseCommonEntity(CoordinatorEntity):
             "manufacturer": MANUFACTURER,
         }
 
-    def get_today_data(self) -> list[dict]:
+    def get_derived(self) -> RCEDerivedData | None:
+        if not self.coordinator.data:
+            return None
+        derived = self.coordinator.data.get("derived")
+        return derived if isinstance(derived, RCEDerivedData) else None
+
+    def _get_business_date_data(self, business_date: str) -> list[dict]:
         if not self.coordinator.data or not self.coordinator.data.get("raw_data"):
             return []
-        today = dt_util.now().strftime("%Y-%m-%d")
+        derived = self.get_derived()
+        if derived is not None:
+            day = derived.day(business_date)
+            return list(day.records) if day else []
+        raw_data = self.coordinator.data["raw_data"]
+        if isinstance(raw_data, PriceSeries):
+            return raw_data.day_records(business_date)
         return [
             record for record in self.coordinator.data["raw_data"]
-            if record.get("business_date") == today
+            if record.get("business_date") == business_date
         ]
 
+    def get_today_data(self) -> list[dict]:
+        today = dt_util.now().strftime("%Y-%m-%d")
+        return self._get_business_date_data(today)
+
     def get_tomorrow_data(self) -> list[dict]:
         if not self.is_tomorrow_data_available():
             return []
-        if not self.coordinator.data or not self.coordinator.data.get("raw_data"):
-            return []
         tomorrow = (dt_util.now() + timedelta(days=1)).strftime("%Y-%m-%d")
-        return [
-            record for record in self.coordinator.data["raw_data"]
-            if record.get("business_date") == tomorrow
-        ]
+        return self._get_business_date_data(tomorrow)
+
+    def get_day_stats(self, day_data: list[dict]) -> RCEDayStats | None:
+        if not day_data:
+            return None
+        bd = business_date_from_day_data(day_data)
+        derived = self.get_derived()
+        if derived is not None:
+            day = derived.day(bd)
+            if day is not None:
+                return day
+        return RCEDayStats.from_records(bd or "", day_data)
+
+    def get_extreme_price_records(self, day_data: list[dict], is_max: bool) -> list[dict]:
+        derived = self.get_derived()
+        if derived is not None:
+            day = derived.day(business_date_from_day_data(day_data))
+            if day is not None:
+                return list(day.max_records if is_max else day.min_records)
+        return self.calculator.find_extreme_price_records(day_data, is_max=is_max)
+
+    def find_optimal_window_for_day(
+        self,
+        day_data: list[dict],
+        search_start: str,
+        search_end: str,
+        duration_minutes: int,
+        is_max: bool,
+        exclude: tuple[str, str, int, bool] | None = None,
+    ) -> list[dict]:
+        bd = business_date_from_day_data(day_data)
+        if not bd:
+            return []
+        derived = self.get_derived()
+        if derived is not None:
+            window = derived.optimal_window(
+                WindowQuery(bd, search_start, search_end, duration_minutes, is_max, exclude)
+            )
+            if window is not None:
+                return window
+        if exclude is None:
+            return self.calculator.find_optimal_window(
+                day_data, bd, search_start, search_end, duration_minutes, is_max=is_max
+            )
+        ranked = self.calculator.find_top_windows(
+            day_data,
+            bd,
+            search_start,
+            search_end,
+            duration_minutes,
+            1,
+            is_max,
+            exclude=[self.find_optimal_window_for_day(day_data, *exclude)],
+        )
+        return ranked[0] if ranked else []
+
+    def expensive_window_spec(self) -> tuple[str, str, int, bool]:
+        return window_spec(EXPENSIVE_WINDOW, self.get_config_value)
+
+    def find_cheapest_slots_for_day(
+        self,
+        day_data: list[dict],
+        search_start: str,
+        search_end: str,
+        duration_minutes: int,
+    ) -> RCESlotSelection | None:
+        bd = business_date_from_day_data(day_data)
+        if not bd:
+            return None
+        derived = self.get_derived()
+        if derived is not None:
+            selection = derived.slot_selection(
+                WindowQuery(bd, search_start, search_end, duration_minutes, False)
+            )
+            if selection is not None:
+                return selection
+        return RCESlotSelection.from_records(
+            bd,
+            self.calculator.find_cheapest_slots(
+                day_data, bd, search_start, search_end, duration_minutes // 15
+            ),
+        )
+
+    def find_schedule_for_day(
+        self, day_data: list[dict], spec: tuple[str, str, int, int, int]
+    ) -> RCESlotSelection | None:
+        bd = business_date_from_day_data(day_data)
+        if not bd:
+            return None
+        query = ScheduleQuery(bd, *spec)
+        derived = self.get_derived()
+        if derived is not None:
+            selection = derived.schedule(query)
+            if selection is not None:
+                return selection
+        segments = self.calculator.find_schedule(day_data, *query)
+        return RCESlotSelection.from_records(bd, [record for segment in segments for record in segment])
+
+    def get_threshold_index(self, day_data: list[dict], threshold: float) -> ThresholdIndex:
+        derived = self.get_derived()
+        if derived is not None:
+            index = derived.threshold_index(business_date_from_day_data(day_data), threshold)
+            if index is not None:
+                return index
+        return ThresholdIndex.from_records(day_data, threshold)
 
     def get_today_pdgsz_data(self) -> list[dict]:
         if not self.coordinator.data:
@@ -107,6 +276,12 @@ class RCEBaseCommonEntity(CoordinatorEntity):
 
     def is_tomorrow_data_available(self) -> bool:
         now = dt_util.now()
+        data = self.coordinator.data
+        raw_data = data.get("raw_data") if isinstance(data, dict) else None
+        if isinstance(raw_data, PriceSeries):
+            tomorrow = (now + timedelta(days=1)).strftime("%Y-%m-%d")
+            if tomorrow in complete_business_dates(raw_data):
+                return True
         return now.hour >= 14
 
     @property
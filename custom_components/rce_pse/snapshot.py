@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, SNAPSHOT_SAVE_DELAY, SNAPSHOT_STORAGE_VERSION
+from .price_series import SLOT_SECONDS
+from .time_window import parse_pse_dtime
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class RCESnapshot:
+    fetched_at: datetime
+    rce_records: list[dict]
+    pdgsz_records: list[dict]
+
+
+def pack_records(records: Iterable[Mapping]) -> dict[str, list]:
+    records = list(records)
+    fields: dict[str, None] = {}
+    for record in records:
+        fields.update(dict.fromkeys(record))
+    field_list = list(fields)
+    return {
+        "fields": field_list,
+        "rows": [[record.get(field) for field in field_list] for record in records],
+    }
+
+
+def unpack_records(packed: Mapping[str, Any]) -> list[dict]:
+    fields = packed["fields"]
+    return [
+        {field: value for field, value in zip(fields, row) if value is not None}
+        for row in packed["rows"]
+    ]
+
+
+def _business_date_from_dtime(record: Mapping) -> str | None:
+    try:
+        period_start = parse_pse_dtime(record["dtime"]) - timedelta(seconds=SLOT_SECONDS)
+    except (KeyError, TypeError, ValueError):
+        return None
+    return period_start.strftime("%Y-%m-%d")
+
+
+def group_business_days(records: Iterable[Mapping]) -> dict[str, tuple[dict, ...]]:
+    grouped: dict[str, list[dict]] = {}
+    for record in records:
+        business_date = record.get("business_date") or _business_date_from_dtime(record)
+        if business_date:
+            grouped.setdefault(business_date, []).append(record)
+    return {bd: tuple(day) for bd, day in sorted(grouped.items())}
+
+
+def merge_business_days(
+    held: Mapping[str, tuple[dict, ...]],
+    fetched: Iterable[Mapping],
+    today: str,
+    since: str | None,
+) -> dict[str, tuple[dict, ...]]:
+    merged = {bd: day for bd, day in held.items() if today <= bd and (since is None or bd < since)}
+    merged.update(group_business_days(fetched))
+    return dict(sorted(merged.items()))
+
+
+class RCESnapshotStore:
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.snapshot"
+        )
+
+    async def async_load(self) -> RCESnapshot | None:
+        try:
+            data = await self._store.async_load()
+        except (HomeAssistantError, KeyError, TypeError, ValueError) as exception:
+            _LOGGER.warning(
+                "Failed to load cached PSE snapshot (version %s): %s", SNAPSHOT_STORAGE_VERSION, exception
+            )
+            return None
+        if not data:
+            return None
+        try:
+            fetched_at = dt_util.parse_datetime(data["fetched_at"])
+            if fetched_at is None:
+                return None
+            return RCESnapshot(
+                fetched_at=fetched_at,
+                rce_records=unpack_records(data["rce"]),
+                pdgsz_records=unpack_records(data["pdgsz"]),
+            )
+        except (KeyError, TypeError, ValueError) as exception:
+            _LOGGER.warning(
+                "Ignoring malformed cached PSE snapshot (version %s): %s", SNAPSHOT_STORAGE_VERSION, exception
+            )
+            return None
+
+    @callback
+    def async_schedule_save(self, snapshot: RCESnapshot) -> None:
+        self._store.async_delay_save(
+            lambda: {
+                "fetched_at": snapshot.fetched_at.isoformat(),
+                "rce": pack_records(snapshot.rce_records),
+                "pdgsz": pack_records(snapshot.pdgsz_records),
+            },
+            SNAPSHOT_SAVE_DELAY,
+        )
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
@@ -78,11 +78,12 @@ def parse_pse_dtime(dtime_str: str) -> datetime:
         raise ValueError(dtime_str)
     date_part, time_part = dtime_str.split(" ", 1)
     h_str, m_str, s_str = time_part.split(":")
+    y_str, mo_str, d_str = date_part.split("-")
     h = int(h_str)
     if h >= 24:
-        base = datetime.strptime(f"{date_part} 00:00:00", "%Y-%m-%d %H:%M:%S")
+        base = datetime(int(y_str), int(mo_str), int(d_str))
         return base + timedelta(days=1)
-    return datetime.strptime(dtime_str, "%Y-%m-%d %H:%M:%S")
+    return datetime(int(y_str), int(mo_str), int(d_str), h, int(m_str), int(s_str))
 
 
 def business_date_from_day_data(data: list[dict]) -> str | None:
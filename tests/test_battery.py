@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import math
+import random
+import time
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.util import dt as dt_util
+
+from custom_components.rce_pse.battery import (
+    ACTION_CHARGE,
+    ACTION_DISCHARGE,
+    ACTION_IDLE,
+    BatteryParameters,
+    optimize_battery,
+)
+from custom_components.rce_pse.const import CONF_BATTERY_CAPACITY, DOMAIN
+from custom_components.rce_pse.coordinator import RCEPSEDataUpdateCoordinator
+from custom_components.rce_pse.price_series import SLOT_SECONDS, epoch_seconds
+from custom_components.rce_pse.sensors.battery_plan import RCEBatteryPlanSensor
+from custom_components.rce_pse.services import SERVICE_GET_BATTERY_PLAN, async_setup_services
+
+START = epoch_seconds(datetime(2025, 6, 1))
+
+
+def _starts(count: int) -> list[int]:
+    return [START + i * SLOT_SECONDS for i in range(count)]
+
+
+def _reference_savings(prices: list[float], params: BatteryParameters, initial_soc: float) -> float:
+    step = params.step_kwh
+    efficiency = math.sqrt(params.round_trip_efficiency)
+    charge_reach = int(params.charge_power_kw * 0.25 * efficiency / step + 1e-9)
+    discharge_reach = int(params.discharge_power_kw * 0.25 / efficiency / step + 1e-9)
+    start_level = params.soc_level(initial_soc)
+    costs = {start_level: 0.0}
+    for price in prices:
+        following: dict[int, float] = {}
+        for level, cost in costs.items():
+            for target in range(max(level - discharge_reach, 0), min(level + charge_reach, params.soc_steps) + 1):
+                delta = (target - level) * step
+                grid = delta / efficiency if delta > 0 else delta * efficiency
+                following[target] = min(following.get(target, math.inf), cost + grid * price)
+        costs = following
+    return -min(cost for level, cost in costs.items() if level >= start_level)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_optimize_battery_matches_exhaustive_search(seed: int) -> None:
+    rng = random.Random(seed)
+    prices = [rng.choice([-0.2, 0.0, 0.3, 0.6, 1.0]) + rng.random() / 10 for _ in range(rng.randint(1, 10))]
+    params = BatteryParameters(
+        capacity_kwh=rng.choice([5.0, 10.0]),
+        charge_power_kw=rng.choice([2.0, 4.0, 8.0]),
+        discharge_power_kw=rng.choice([2.0, 5.0]),
+        round_trip_efficiency=rng.choice([0.8, 0.9, 1.0]),
+        min_soc=0.1,
+        max_soc=rng.choice([0.9, 1.0]),
+        soc_steps=rng.randint(1, 12),
+    )
+    initial_soc = rng.choice([0.1, 0.5])
+
+    plan = optimize_battery(_starts(len(prices)), prices, params, initial_soc)
+
+    assert plan.savings == pytest.approx(_reference_savings(prices, params, initial_soc))
+    assert plan.savings == pytest.approx(-sum(slot.grid_energy_kwh * slot.price for slot in plan.slots))
+
+
+def test_optimize_battery_charges_low_and_discharges_high() -> None:
+    params = BatteryParameters(10.0, 10.0, 10.0, 1.0, 0.0, 1.0, 100)
+    prices = [0.1] * 4 + [1.0] * 4
+
+    plan = optimize_battery(_starts(8), prices, params)
+
+    assert [slot.action for slot in plan.slots] == [ACTION_CHARGE] * 4 + [ACTION_DISCHARGE] * 4
+    assert plan.slots[0].grid_energy_kwh == pytest.approx(2.5)
+    assert plan.slots[3].soc == pytest.approx(1.0)
+    assert plan.slots[-1].soc == pytest.approx(0.0)
+    assert plan.savings == pytest.approx(9.0)
+
+
+def test_optimize_battery_stays_idle_when_spread_does_not_cover_losses() -> None:
+    params = BatteryParameters(10.0, 5.0, 5.0, 0.8, 0.1, 0.9, 50)
+
+    plan = optimize_battery(_starts(4), [0.50, 0.52, 0.55, 0.58], params)
+
+    assert {slot.action for slot in plan.slots} == {ACTION_IDLE}
+    assert plan.savings == 0.0
+
+
+def test_battery_plan_slot_lookup() -> None:
+    params = BatteryParameters(10.0, 5.0, 5.0, 0.9, 0.1, 0.9, 20)
+    plan = optimize_battery(_starts(4), [0.1, 0.1, 1.0, 1.0], params)
+    day = datetime(2025, 6, 1)
+
+    assert plan.slot_at(day + timedelta(minutes=20)) is plan.slots[1]
+    assert plan.slot_at(day + timedelta(hours=1)) is None
+    assert plan.slots_from(day + timedelta(minutes=40)) == plan.slots[2:]
+    assert optimize_battery([], [], params).slot_at(day) is None
+
+
+@pytest.mark.slow
+def test_optimize_battery_benchmark_two_days() -> None:
+    rng = random.Random(0)
+    prices = [rng.uniform(-0.1, 1.2) for _ in range(192)]
+    params = BatteryParameters(15.0, 6.0, 6.0, 0.9, 0.1, 0.95, 1000)
+
+    started = time.perf_counter()
+    plan = optimize_battery(_starts(192), prices, params)
+    elapsed = time.perf_counter() - started
+
+    assert len(plan.slots) == 192
+    assert plan.savings > 0
+    assert elapsed < 1.0
+
+
+def _day_records(day: datetime) -> list[dict]:
+    return [
+        {
+            "dtime": (day + timedelta(minutes=15 * (i + 1))).strftime("%Y-%m-%d %H:%M:%S"),
+            "rce_pln": f"{100 + 10 * i}.00",
+            "business_date": day.strftime("%Y-%m-%d"),
+        }
+        for i in range(96)
+    ]
+
+
+@pytest.fixture
+def battery_coordinator(mock_hass) -> RCEPSEDataUpdateCoordinator:
+    mock_hass.async_add_executor_job = AsyncMock(side_effect=lambda func, *args: func(*args))
+    coordinator = RCEPSEDataUpdateCoordinator(mock_hass, Mock(options={CONF_BATTERY_CAPACITY: 10.0}, data={}))
+    mock_hass.data[DOMAIN] = {"entry": coordinator}
+    return coordinator
+
+
+@pytest.mark.asyncio
+async def test_coordinator_builds_battery_plan_in_executor(battery_coordinator) -> None:
+    day = dt_util.start_of_local_day().replace(tzinfo=None)
+    data = battery_coordinator._build_snapshot_data(_day_records(day), [], dt_util.now())
+    now = day + timedelta(hours=6, minutes=5)
+
+    with patch("custom_components.rce_pse.coordinator.dt_util.now", return_value=now):
+        data = await battery_coordinator._async_attach_battery_plan(data)
+
+    battery_coordinator.hass.async_add_executor_job.assert_awaited_once()
+    battery_coordinator.data = data
+    plan = battery_coordinator.battery_plan()
+    assert plan.slots[0].period_start == day + timedelta(hours=6)
+    assert plan.slots[0].price == pytest.approx(0.34)
+    assert plan.savings > 0
+
+
+@pytest.mark.asyncio
+async def test_battery_plan_skipped_without_capacity(mock_hass) -> None:
+    mock_hass.async_add_executor_job = AsyncMock()
+    coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+    day = dt_util.start_of_local_day().replace(tzinfo=None)
+    data = coordinator._build_snapshot_data(_day_records(day), [], dt_util.now())
+
+    assert await coordinator._async_attach_battery_plan(data) is data
+    assert coordinator.battery_parameters() is None
+    mock_hass.async_add_executor_job.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_battery_plan_sensor_and_service(battery_coordinator) -> None:
+    day = dt_util.start_of_local_day().replace(tzinfo=None)
+    with patch("custom_components.rce_pse.coordinator.dt_util.now", return_value=day):
+        battery_coordinator.data = await battery_coordinator._async_attach_battery_plan(
+            battery_coordinator._build_snapshot_data(_day_records(day), [], dt_util.now())
+        )
+    sensor = RCEBatteryPlanSensor(battery_coordinator)
+    tz = dt_util.get_default_time_zone()
+    hass = battery_coordinator.hass
+    hass.services = Mock()
+    async_setup_services(hass)
+    handler = next(
+        call.args[2]
+        for call in hass.services.async_register.call_args_list
+        if call.args[1] == SERVICE_GET_BATTERY_PLAN
+    )
+
+    with patch(
+        "custom_components.rce_pse.sensors.battery_plan.dt_util.now",
+        return_value=(day + timedelta(hours=23, minutes=50)).replace(tzinfo=tz),
+    ):
+        assert sensor.native_value == ACTION_DISCHARGE
+        assert sensor.extra_state_attributes["projected_savings"] > 0
+    with patch(
+        "custom_components.rce_pse.services.dt_util.now",
+        return_value=(day + timedelta(hours=23)).replace(tzinfo=tz),
+    ):
+        response = await handler(Mock(data={}))
+
+    assert len(response["slots"]) == 4
+    assert response["slots"][0]["start"] == (day + timedelta(hours=23)).replace(tzinfo=tz).isoformat()
+    assert response["currency"] == "PLN"
+
+
+@pytest.mark.asyncio
+async def test_get_battery_plan_requires_battery(mock_hass) -> None:
+    coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+    mock_hass.data[DOMAIN] = {"entry": coordinator}
+    mock_hass.services = Mock()
+    async_setup_services(mock_hass)
+    handler = next(
+        call.args[2]
+        for call in mock_hass.services.async_register.call_args_list
+        if call.args[1] == SERVICE_GET_BATTERY_PLAN
+    )
+
+    with pytest.raises(ServiceValidationError):
+        await handler(Mock(data={}))
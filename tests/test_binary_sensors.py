@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from unittest.mock import Mock, patch
 
+from homeassistant.util import dt as dt_util
+
 
 from custom_components.rce_pse.binary_sensors.price_windows import (
     RCETodayMinPriceWindowBinarySensor,
@@ -13,6 +15,11 @@ from custom_components.rce_pse.binary_sensors.custom_windows import (
     RCETodayExpensiveWindowBinarySensor,
     RCETodaySecondExpensiveWindowBinarySensor,
 )
+from custom_components.rce_pse.binary_sensors.cheapest_slots import (
+    RCETodayCheapestSlotsBinarySensor,
+)
+from custom_components.rce_pse.binary_sensors.schedule import RCETodayScheduleBinarySensor
+from custom_components.rce_pse.dependencies import TimeGranularity
 from custom_components.rce_pse.binary_sensors.low_price_threshold import (
     RCETodayLowPriceThresholdWindowActiveBinarySensor,
 )
@@ -381,9 +388,9 @@ class TestSecondExpensiveWindowBinarySensor:
                 }
             ]
 
-            with patch.object(sensor.calculator, "find_optimal_window") as mock_find_window:
+            with patch.object(sensor.calculator, "find_top_windows") as mock_find_window:
                 mock_find_window.return_value = [
-                    {"dtime": "2024-01-15 07:15:00"},
+                    [{"dtime": "2024-01-15 07:15:00"}],
                 ]
 
                 with patch.object(sensor, "is_now_within_optimal_window_records") as mock_in_window:
@@ -443,17 +450,13 @@ class TestLowPriceThresholdWindowBinarySensor:
                 {"period": "02:00 - 02:15", "rce_pln": "50.0", "dtime": "2024-01-15 02:15:00"},
                 {"period": "02:15 - 02:30", "rce_pln": "60.0", "dtime": "2024-01-15 02:30:00"},
             ]
-            with patch.object(sensor.calculator, "find_first_window_below_threshold") as mock_find:
-                mock_find.return_value = [
-                    {"period": "02:00 - 02:15", "rce_pln": "50.0"},
-                    {"period": "02:15 - 02:30", "rce_pln": "60.0"},
-                ]
-                with patch("custom_components.rce_pse.binary_sensors.low_price_threshold.dt_util") as mock_dt:
-                    mock_now = Mock()
-                    mock_now.replace.return_value = datetime(2024, 1, 15, 2, 10, 0)
-                    mock_dt.now.return_value = mock_now
-                    mock_dt.now.return_value.strftime.return_value = "2024-01-15"
-                    assert sensor.is_on is True
+            with patch("custom_components.rce_pse.binary_sensors.low_price_threshold.dt_util") as mock_dt:
+                mock_now = Mock()
+                mock_now.replace.return_value = datetime(2024, 1, 15, 2, 10, 0)
+                mock_dt.now.return_value = mock_now
+                assert sensor.is_on is True
+                mock_now.replace.return_value = datetime(2024, 1, 15, 2, 30, 0)
+                assert sensor.is_on is False
 
     def test_low_price_threshold_window_inactive_when_no_window(self, mock_coordinator):
         mock_config_entry = Mock()
@@ -461,10 +464,10 @@ class TestLowPriceThresholdWindowBinarySensor:
         mock_config_entry.options = {}
         sensor = RCETodayLowPriceThresholdWindowActiveBinarySensor(mock_coordinator, mock_config_entry)
         with patch.object(sensor, "get_today_data") as mock_today_data:
-            mock_today_data.return_value = [{"period": "10:00 - 10:15", "rce_pln": "300.0"}]
-            with patch.object(sensor.calculator, "find_first_window_below_threshold") as mock_find:
-                mock_find.return_value = []
-                assert sensor.is_on is False
+            mock_today_data.return_value = [
+                {"period": "10:00 - 10:15", "rce_pln": "300.0", "dtime": "2024-01-15 10:15:00"}
+            ]
+            assert sensor.is_on is False
 
     def test_low_price_threshold_window_inactive_when_no_data(self, mock_coordinator):
         mock_config_entry = Mock()
@@ -474,3 +477,138 @@ class TestLowPriceThresholdWindowBinarySensor:
         with patch.object(sensor, "get_today_data") as mock_today_data:
             mock_today_data.return_value = []
             assert sensor.is_on is False
+
+
+class TestBinarySensorTransitions:
+
+    def test_transition_instants_from_active_window(self, mock_coordinator):
+        sensor = RCETodayMinPriceWindowBinarySensor(mock_coordinator)
+        window = [
+            {"dtime": "2025-06-01 10:15:00", "period": "10:00 - 10:15", "rce_pln": "1.0"},
+            {"dtime": "2025-06-01 10:30:00", "period": "10:15 - 10:30", "rce_pln": "1.0"},
+        ]
+        now = datetime(2025, 6, 1, 9, 0, tzinfo=dt_util.get_default_time_zone())
+
+        with patch("custom_components.rce_pse.binary_sensors.base.dt_util.now", return_value=now), \
+             patch.object(sensor, "get_active_window", return_value=window) as mock_window:
+            assert sensor.transition_instants() == [
+                datetime(2025, 6, 1, 10, 0),
+                datetime(2025, 6, 1, 10, 30),
+                datetime(2025, 6, 2, 0, 0),
+            ]
+            sensor.transition_instants()
+            assert mock_window.call_count == 1
+
+            assert sensor.next_transition(now) == datetime(2025, 6, 1, 10, 0, tzinfo=now.tzinfo)
+            assert sensor.next_transition(now.replace(hour=10, minute=0)) == now.replace(
+                hour=10, minute=30
+            )
+            assert sensor.next_transition(now.replace(day=2)) is None
+
+    def test_transition_index_rebuilt_for_new_snapshot(self, mock_coordinator):
+        sensor = RCETodayCheapestWindowBinarySensor(mock_coordinator, Mock(options={}, data={}))
+
+        with patch.object(sensor, "get_active_window", return_value=[]) as mock_window:
+            sensor.transition_instants()
+            mock_coordinator.data = dict(mock_coordinator.data)
+            sensor.transition_instants()
+
+        assert mock_window.call_count == 2
+
+    def test_binary_sensors_update_on_transitions(self, mock_coordinator):
+        sensor = RCETodayLowPriceThresholdWindowActiveBinarySensor(
+            mock_coordinator, Mock(options={}, data={})
+        )
+
+        assert sensor._dependencies.granularity is TimeGranularity.TRANSITION
+        assert sensor._dependencies.day_offsets == (0,)
+
+
+class TestCheapestSlotsBinarySensor:
+
+    def _records(self) -> list[dict]:
+        prices = [100.0] * 96
+        for i in (8, 9, 40):
+            prices[i] = 1.0
+        start = datetime(2025, 6, 1)
+        return [
+            {
+                "dtime": (start + timedelta(minutes=15 * (i + 1))).strftime("%Y-%m-%d %H:%M:%S"),
+                "period": "",
+                "rce_pln": f"{price:.6f}",
+                "business_date": "2025-06-01",
+            }
+            for i, price in enumerate(prices)
+        ]
+
+    def test_cheapest_slots_state_and_attributes(self, mock_coordinator):
+        sensor = RCETodayCheapestSlotsBinarySensor(
+            mock_coordinator, Mock(options={"cheapest_slots_duration": "00:45"}, data={})
+        )
+        tz = dt_util.get_default_time_zone()
+
+        with patch.object(sensor, "get_today_data", return_value=self._records()), \
+             patch.object(sensor, "get_derived", return_value=None), \
+             patch("custom_components.rce_pse.binary_sensors.cheapest_slots.dt_util.now") as mock_now:
+            mock_now.return_value = datetime(2025, 6, 1, 10, 5, tzinfo=tz)
+            assert sensor.is_on is True
+            mock_now.return_value = datetime(2025, 6, 1, 10, 15, tzinfo=tz)
+            assert sensor.is_on is False
+            attributes = sensor.extra_state_attributes
+
+        assert sensor._attr_unique_id == "rce_pse_today_cheapest_slots_active"
+        assert attributes["slots"] == [
+            datetime(2025, 6, 1, 2, 0, tzinfo=tz).isoformat(),
+            datetime(2025, 6, 1, 2, 15, tzinfo=tz).isoformat(),
+            datetime(2025, 6, 1, 10, 0, tzinfo=tz).isoformat(),
+        ]
+        assert attributes["average_price"] == 1.0
+        assert "slots" in sensor._unrecorded_attributes
+
+    def test_cheapest_slots_transitions_follow_runs(self, mock_coordinator):
+        sensor = RCETodayCheapestSlotsBinarySensor(
+            mock_coordinator, Mock(options={"cheapest_slots_duration": "00:45"}, data={})
+        )
+        now = datetime(2025, 6, 1, 1, 0, tzinfo=dt_util.get_default_time_zone())
+
+        with patch.object(sensor, "get_today_data", return_value=self._records()), \
+             patch.object(sensor, "get_derived", return_value=None), \
+             patch("custom_components.rce_pse.binary_sensors.base.dt_util.now", return_value=now):
+            assert sensor.transition_instants() == [
+                datetime(2025, 6, 1, 2, 0),
+                datetime(2025, 6, 1, 2, 30),
+                datetime(2025, 6, 1, 10, 0),
+                datetime(2025, 6, 1, 10, 15),
+                datetime(2025, 6, 2, 0, 0),
+            ]
+
+    def test_cheapest_slots_without_data(self, mock_coordinator):
+        sensor = RCETodayCheapestSlotsBinarySensor(mock_coordinator, Mock(options={}, data={}))
+
+        with patch.object(sensor, "get_today_data", return_value=[]):
+            assert sensor.is_on is False
+            assert sensor.extra_state_attributes == {"slots": [], "average_price": None}
+
+    def test_schedule_segments_attribute(self, mock_coordinator):
+        sensor = RCETodayScheduleBinarySensor(
+            mock_coordinator,
+            Mock(options={"schedule_runtime": "00:45", "schedule_max_segments": 2.0, "schedule_min_segment": "00:15"}, data={}),
+        )
+        tz = dt_util.get_default_time_zone()
+
+        with patch.object(sensor, "get_today_data", return_value=self._records()), \
+             patch.object(sensor, "get_derived", return_value=None):
+            attributes = sensor.extra_state_attributes
+
+        assert sensor._attr_unique_id == "rce_pse_today_schedule_active"
+        assert sensor._attr_entity_registry_enabled_default is False
+        assert attributes["segments"] == [
+            {
+                "start": datetime(2025, 6, 1, 2, 0, tzinfo=tz).isoformat(),
+                "end": datetime(2025, 6, 1, 2, 30, tzinfo=tz).isoformat(),
+            },
+            {
+                "start": datetime(2025, 6, 1, 10, 0, tzinfo=tz).isoformat(),
+                "end": datetime(2025, 6, 1, 10, 15, tzinfo=tz).isoformat(),
+            },
+        ]
@@ -1,20 +1,21 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import timedelta
+from datetime import datetime, timedelta
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
+import aiohttp
 import pytest
 from homeassistant.helpers.update_coordinator import UpdateFailed
 from homeassistant.util import dt as dt_util
 
-from custom_components.rce_pse.coordinator import (
-    RCEPSEDataUpdateCoordinator,
-    format_internal_price,
-)
+from custom_components.rce_pse.coordinator import RCEPSEDataUpdateCoordinator
+from custom_components.rce_pse.derived import RCEDerivedData
+from custom_components.rce_pse.price_series import PriceSeries, format_internal_price
 from custom_components.rce_pse.const import (
     CONF_PRICE_UNIT,
+    CONF_USE_GROSS_PRICES,
     CONF_USE_HOURLY_PRICES,
     DEFAULT_PRICE_UNIT,
     PSE_API_PAGE_SIZE,
@@ -24,8 +25,20 @@ from custom_components.rce_pse.const import (
 )
 
 
-def _build_record(rce_pln: float, rce_pln_neg_to_zero: float | None = None) -> dict[str, Any]:
+@pytest.fixture(autouse=True)
+def mock_clientsession():
+    with patch("custom_components.rce_pse.coordinator.async_get_clientsession") as mock_get_session:
+        mock_get_session.return_value = Mock()
+        yield mock_get_session
+
+
+def _build_record(
+    rce_pln: float,
+    rce_pln_neg_to_zero: float | None = None,
+    dtime: str = "2024-01-01 00:15:00",
+) -> dict[str, Any]:
     record: dict[str, Any] = {
+        "dtime": dtime,
         "rce_pln": f"{rce_pln:.2f}",
     }
     if rce_pln_neg_to_zero is not None:
@@ -33,29 +46,38 @@ def _build_record(rce_pln: float, rce_pln_neg_to_zero: float | None = None) -> d
     return record
 
 
-def test_apply_tax_to_data_with_and_without_neg_to_zero(mock_hass) -> None:
-    coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+def _build_coordinator(mock_hass, options: dict[str, Any]) -> RCEPSEDataUpdateCoordinator:
+    mock_config_entry = Mock()
+    mock_config_entry.options = options
+    mock_config_entry.data = {}
+    return RCEPSEDataUpdateCoordinator(mock_hass, mock_config_entry)
+
+
+def test_transform_applies_tax_with_and_without_neg_to_zero(mock_hass) -> None:
+    coordinator = _build_coordinator(mock_hass, {CONF_USE_GROSS_PRICES: True})
 
     data = [
-        _build_record(300.0, 280.0),
-        _build_record(0.0, 0.0),
-        _build_record(350.0),
+        _build_record(300.0, dtime="2024-01-01 00:15:00"),
+        _build_record(0.0, dtime="2024-01-01 00:30:00"),
+        _build_record(-50.0, dtime="2024-01-01 00:45:00"),
     ]
 
-    processed = coordinator._apply_tax_to_data(data)
+    processed = coordinator._transform_price_records(data)
 
     assert len(processed) == 3
 
     first = processed[0]
     assert first["rce_pln"] == format_internal_price(300.0 * (1 + TAX_RATE))
-    assert first["rce_pln_neg_to_zero"] == format_internal_price(280.0 * (1 + TAX_RATE))
+    assert first["rce_pln_neg_to_zero"] == format_internal_price(300.0 * (1 + TAX_RATE))
 
     second = processed[1]
     assert second["rce_pln"] == format_internal_price(0.0 * (1 + TAX_RATE))
     assert second["rce_pln_neg_to_zero"] == format_internal_price(0.0 * (1 + TAX_RATE))
 
     third = processed[2]
-    assert third["rce_pln"] == format_internal_price(350.0 * (1 + TAX_RATE))
+    assert third["rce_pln"] == format_internal_price(-50.0 * (1 + TAX_RATE))
+    assert third["rce_pln_neg_to_zero"] == format_internal_price(0.0)
+
 
 class TestRCEPSEDataUpdateCoordinator:
 
@@ -91,13 +113,13 @@ class TestRCEPSEDataUpdateCoordinator:
             assert result["raw_data"][0]["rce_pln"] == "350.00"
 
     @pytest.mark.asyncio
-    async def test_data_fetch_creates_session_if_none(self, mock_hass, sample_api_response):
+    async def test_data_fetch_uses_shared_session(self, mock_hass, sample_api_response):
         coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
         assert coordinator.session is None
         
-        with patch("custom_components.rce_pse.coordinator.aiohttp.ClientSession") as mock_session_class:
-            mock_session = AsyncMock()
-            mock_session_class.return_value = mock_session
+        with patch("custom_components.rce_pse.coordinator.async_get_clientsession") as mock_get_session:
+            mock_session = Mock()
+            mock_get_session.return_value = mock_session
             
             with patch.object(coordinator, '_fetch_data') as mock_fetch:
                 expected_data = {
@@ -109,7 +131,7 @@ class TestRCEPSEDataUpdateCoordinator:
                 
                 result = await coordinator._async_update_data()
                 
-                mock_session_class.assert_called_once()
+                mock_get_session.assert_called_once_with(mock_hass)
                 assert coordinator.session == mock_session
                 assert result["raw_data"] == sample_api_response["value"]
 
@@ -161,6 +183,11 @@ class TestRCEPSEDataUpdateCoordinator:
                 assert "pdgsz_data" in result
                 assert result["pdgsz_data"] == []
                 assert len(result["raw_data"]) == 7
+                assert isinstance(result["raw_data"], PriceSeries)
+                assert isinstance(result["derived"], RCEDerivedData)
+                assert set(result["derived"].days) == {
+                    r["business_date"] for r in result["raw_data"]
+                }
                 
                 for i, record in enumerate(result["raw_data"]):
                     original_record = sample_api_response["value"][i]
@@ -172,7 +199,7 @@ class TestRCEPSEDataUpdateCoordinator:
                     assert record["business_date"] == original_record["business_date"]
 
     @pytest.mark.asyncio
-    async def test_successful_close_session(self, mock_hass):
+    async def test_close_keeps_shared_session_open(self, mock_hass):
         coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
         
         await coordinator.async_close()
@@ -181,7 +208,65 @@ class TestRCEPSEDataUpdateCoordinator:
         coordinator.session = mock_session
         
         await coordinator.async_close()
-        mock_session.close.assert_called_once()
+        mock_session.close.assert_not_called()
+        assert coordinator.session is None
+
+    @pytest.mark.asyncio
+    async def test_fetch_data_requests_endpoints_concurrently(self, mock_hass, sample_api_response):
+        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+        coordinator.session = Mock()
+        both_started = asyncio.Event()
+        started = []
+
+        async def fake_rce(session, today):
+            started.append("rce")
+            if len(started) == 2:
+                both_started.set()
+            await asyncio.wait_for(both_started.wait(), 1)
+            return sample_api_response["value"]
+
+        async def fake_pdgsz(session, today):
+            started.append("pdgsz")
+            if len(started) == 2:
+                both_started.set()
+            await asyncio.wait_for(both_started.wait(), 1)
+            return [{"business_date": "2025-05-29", "dtime": "2025-05-29 01:00:00"}]
+
+        with (
+            patch.object(coordinator, '_fetch_rce_pln', side_effect=fake_rce),
+            patch.object(coordinator, '_fetch_pdgsz', side_effect=fake_pdgsz),
+        ):
+            result = await coordinator._fetch_data()
+
+        assert sorted(started) == ["pdgsz", "rce"]
+        assert len(result["raw_data"]) == 7
+        assert len(result["pdgsz_data"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_fetch_data_pdgsz_timeout_keeps_prices(self, mock_hass, sample_api_response):
+        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+        coordinator.session = Mock()
+
+        with (
+            patch.object(coordinator, '_fetch_rce_pln', new_callable=AsyncMock, return_value=sample_api_response["value"]),
+            patch.object(coordinator, '_fetch_pdgsz', new_callable=AsyncMock, side_effect=TimeoutError()),
+        ):
+            result = await coordinator._fetch_data()
+
+        assert len(result["raw_data"]) == 7
+        assert result["pdgsz_data"] == []
+
+    @pytest.mark.asyncio
+    async def test_fetch_data_rce_client_error(self, mock_hass):
+        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+        coordinator.session = Mock()
+
+        with (
+            patch.object(coordinator, '_fetch_rce_pln', new_callable=AsyncMock, side_effect=aiohttp.ClientError("boom")),
+            patch.object(coordinator, '_fetch_pdgsz', new_callable=AsyncMock, return_value=[]),
+            pytest.raises(UpdateFailed, match="Error fetching data"),
+        ):
+            await coordinator._fetch_data()
 
     @pytest.mark.asyncio 
     async def test_data_processing_with_valid_response(self, mock_hass, sample_api_response):
@@ -260,7 +345,7 @@ class TestRCEPSEDataUpdateCoordinator:
         coordinator._last_api_fetch = dt_util.now() - timedelta(hours=2)
         
         with patch.object(coordinator, '_fetch_data') as mock_fetch:
-            mock_fetch.side_effect = asyncio.TimeoutError("API timeout")
+            mock_fetch.side_effect = TimeoutError("API timeout")
             
             result = await coordinator._async_update_data()
             
@@ -273,7 +358,7 @@ class TestRCEPSEDataUpdateCoordinator:
         object.__setattr__(coordinator, "data", None)
         
         with patch.object(coordinator, '_fetch_data') as mock_fetch:
-            mock_fetch.side_effect = asyncio.TimeoutError("API timeout")
+            mock_fetch.side_effect = TimeoutError("API timeout")
             
             with pytest.raises(UpdateFailed, match="Timeout communicating with API"):
                 await coordinator._async_update_data()
@@ -395,14 +480,14 @@ class TestRCEPSEDataUpdateCoordinator:
                 assert result["pdgsz_data"] == []
                 assert "last_update" in result
 
-    def test_calculate_hourly_averages_empty_data(self, mock_hass):
-        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+    def test_transform_hourly_averages_empty_data(self, mock_hass):
+        coordinator = _build_coordinator(mock_hass, {CONF_USE_HOURLY_PRICES: True})
         
-        result = coordinator._calculate_hourly_averages([])
+        result = coordinator._transform_price_records([])
         assert result == []
 
-    def test_calculate_hourly_averages_single_record(self, mock_hass):
-        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+    def test_transform_hourly_averages_single_record(self, mock_hass):
+        coordinator = _build_coordinator(mock_hass, {CONF_USE_HOURLY_PRICES: True})
         
         data = [{
             "dtime": "2024-01-01 00:15:00",
@@ -411,12 +496,12 @@ class TestRCEPSEDataUpdateCoordinator:
             "business_date": "2024-01-01"
         }]
         
-        result = coordinator._calculate_hourly_averages(data)
+        result = coordinator._transform_price_records(data)
         assert len(result) == 1
         assert result[0]["rce_pln"] == format_internal_price(350.0)
 
-    def test_calculate_hourly_averages_multiple_quarters_same_hour(self, mock_hass):
-        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+    def test_transform_hourly_averages_multiple_quarters_same_hour(self, mock_hass):
+        coordinator = _build_coordinator(mock_hass, {CONF_USE_HOURLY_PRICES: True})
         
         data = [
             {
@@ -445,15 +530,15 @@ class TestRCEPSEDataUpdateCoordinator:
             }
         ]
         
-        result = coordinator._calculate_hourly_averages(data)
+        result = coordinator._transform_price_records(data)
         assert len(result) == 4
 
         for record in result:
             if "00:00" in record["period"] or "00:15" in record["period"] or "00:30" in record["period"] or "00:45" in record["period"]:
                 assert record["rce_pln"] == format_internal_price(330.0)
 
-    def test_calculate_hourly_averages_different_hours(self, mock_hass):
-        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+    def test_transform_hourly_averages_different_hours(self, mock_hass):
+        coordinator = _build_coordinator(mock_hass, {CONF_USE_HOURLY_PRICES: True})
         
         data = [
             {
@@ -482,7 +567,7 @@ class TestRCEPSEDataUpdateCoordinator:
             }
         ]
         
-        result = coordinator._calculate_hourly_averages(data)
+        result = coordinator._transform_price_records(data)
         assert len(result) == 4
         
         hour_0_records = [r for r in result if "00:" in r["period"]]
@@ -492,8 +577,8 @@ class TestRCEPSEDataUpdateCoordinator:
         for record in hour_1_records:
             assert record["rce_pln"] == format_internal_price(410.0)
 
-    def test_calculate_hourly_averages_different_dates(self, mock_hass):
-        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+    def test_transform_hourly_averages_different_dates(self, mock_hass):
+        coordinator = _build_coordinator(mock_hass, {CONF_USE_HOURLY_PRICES: True})
         
         data = [
             {
@@ -522,7 +607,7 @@ class TestRCEPSEDataUpdateCoordinator:
             }
         ]
         
-        result = coordinator._calculate_hourly_averages(data)
+        result = coordinator._transform_price_records(data)
         assert len(result) == 4
         
         jan_1_records = [r for r in result if "2024-01-01" in r["dtime"]]
@@ -532,8 +617,8 @@ class TestRCEPSEDataUpdateCoordinator:
         for record in jan_2_records:
             assert record["rce_pln"] == format_internal_price(410.0)
 
-    def test_calculate_hourly_averages_invalid_data_handling(self, mock_hass):
-        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+    def test_transform_hourly_averages_invalid_data_handling(self, mock_hass):
+        coordinator = _build_coordinator(mock_hass, {CONF_USE_HOURLY_PRICES: True})
         
         data = [
             {
@@ -556,7 +641,7 @@ class TestRCEPSEDataUpdateCoordinator:
             }
         ]
         
-        result = coordinator._calculate_hourly_averages(data)
+        result = coordinator._transform_price_records(data)
         assert len(result) == 2
         for record in result:
             assert record["rce_pln"] == format_internal_price(300.0)
@@ -677,8 +762,8 @@ class TestRCEPSEDataUpdateCoordinator:
                 assert result["raw_data"][0]["rce_pln"] == format_internal_price(300.0)
                 assert result["raw_data"][1]["rce_pln"] == format_internal_price(320.0)
 
-    def test_calculate_hourly_averages_with_negative_values(self, mock_hass):
-        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+    def test_transform_hourly_averages_with_negative_values(self, mock_hass):
+        coordinator = _build_coordinator(mock_hass, {CONF_USE_HOURLY_PRICES: True})
         
         data = [
             {
@@ -707,7 +792,7 @@ class TestRCEPSEDataUpdateCoordinator:
             }
         ]
         
-        result = coordinator._calculate_hourly_averages(data)
+        result = coordinator._transform_price_records(data)
         assert len(result) == 4
         
         expected_normal_average = (300.00 + (-50.00) + 200.00 + 100.00) / 4
@@ -718,8 +803,8 @@ class TestRCEPSEDataUpdateCoordinator:
                 assert record["rce_pln"] == format_internal_price(expected_normal_average)
                 assert record["rce_pln_neg_to_zero"] == format_internal_price(expected_neg_to_zero_average)
 
-    def test_calculate_hourly_averages_all_negative_values(self, mock_hass):
-        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+    def test_transform_hourly_averages_all_negative_values(self, mock_hass):
+        coordinator = _build_coordinator(mock_hass, {CONF_USE_HOURLY_PRICES: True})
         
         data = [
             {
@@ -748,7 +833,7 @@ class TestRCEPSEDataUpdateCoordinator:
             }
         ]
         
-        result = coordinator._calculate_hourly_averages(data)
+        result = coordinator._transform_price_records(data)
         assert len(result) == 4
         
         expected_normal_average = (-100.00 + (-200.00) + (-50.00) + (-150.00)) / 4
@@ -759,8 +844,8 @@ class TestRCEPSEDataUpdateCoordinator:
                 assert record["rce_pln"] == format_internal_price(expected_normal_average)
                 assert record["rce_pln_neg_to_zero"] == format_internal_price(expected_neg_to_zero_average)
 
-    def test_calculate_hourly_averages_mixed_positive_negative_values(self, mock_hass):
-        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+    def test_transform_hourly_averages_mixed_positive_negative_values(self, mock_hass):
+        coordinator = _build_coordinator(mock_hass, {CONF_USE_HOURLY_PRICES: True})
         
         data = [
             {
@@ -789,7 +874,7 @@ class TestRCEPSEDataUpdateCoordinator:
             }
         ]
         
-        result = coordinator._calculate_hourly_averages(data)
+        result = coordinator._transform_price_records(data)
         assert len(result) == 4
         
         expected_normal_average = (500.00 + (-100.00) + 300.00 + (-50.00)) / 4
@@ -800,8 +885,8 @@ class TestRCEPSEDataUpdateCoordinator:
                 assert record["rce_pln"] == format_internal_price(expected_normal_average)
                 assert record["rce_pln_neg_to_zero"] == format_internal_price(expected_neg_to_zero_average)
 
-    def test_calculate_hourly_averages_zero_values(self, mock_hass):
-        coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+    def test_transform_hourly_averages_zero_values(self, mock_hass):
+        coordinator = _build_coordinator(mock_hass, {CONF_USE_HOURLY_PRICES: True})
         
         data = [
             {
@@ -824,7 +909,7 @@ class TestRCEPSEDataUpdateCoordinator:
             }
         ]
         
-        result = coordinator._calculate_hourly_averages(data)
+        result = coordinator._transform_price_records(data)
         assert len(result) == 3
         
         expected_normal_average = (0.00 + (-50.00) + 100.00) / 3
@@ -835,13 +920,13 @@ class TestRCEPSEDataUpdateCoordinator:
                 assert record["rce_pln"] == format_internal_price(expected_normal_average)
                 assert record["rce_pln_neg_to_zero"] == format_internal_price(expected_neg_to_zero_average)
 
-    def test_add_neg_to_zero_key_empty_data(self, mock_hass):
+    def test_transform_neg_to_zero_empty_data(self, mock_hass):
         coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
         
-        result = coordinator._add_neg_to_zero_key([])
+        result = coordinator._transform_price_records([])
         assert result == []
 
-    def test_add_neg_to_zero_key_single_record_positive(self, mock_hass):
+    def test_transform_neg_to_zero_single_record_positive(self, mock_hass):
         coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
         
         data = [{
@@ -851,12 +936,12 @@ class TestRCEPSEDataUpdateCoordinator:
             "business_date": "2024-01-01"
         }]
         
-        result = coordinator._add_neg_to_zero_key(data)
+        result = coordinator._transform_price_records(data)
         assert len(result) == 1
-        assert result[0]["rce_pln"] == "350.00"
+        assert result[0]["rce_pln"] == format_internal_price(350.0)
         assert result[0]["rce_pln_neg_to_zero"] == format_internal_price(350.0)
 
-    def test_add_neg_to_zero_key_single_record_negative(self, mock_hass):
+    def test_transform_neg_to_zero_single_record_negative(self, mock_hass):
         coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
         
         data = [{
@@ -866,12 +951,12 @@ class TestRCEPSEDataUpdateCoordinator:
             "business_date": "2024-01-01"
         }]
         
-        result = coordinator._add_neg_to_zero_key(data)
+        result = coordinator._transform_price_records(data)
         assert len(result) == 1
-        assert result[0]["rce_pln"] == "-50.00"
+        assert result[0]["rce_pln"] == format_internal_price(-50.0)
         assert result[0]["rce_pln_neg_to_zero"] == format_internal_price(0.0)
 
-    def test_add_neg_to_zero_key_mixed_values(self, mock_hass):
+    def test_transform_neg_to_zero_mixed_values(self, mock_hass):
         coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
         
         data = [
@@ -901,22 +986,22 @@ class TestRCEPSEDataUpdateCoordinator:
             }
         ]
         
-        result = coordinator._add_neg_to_zero_key(data)
+        result = coordinator._transform_price_records(data)
         assert len(result) == 4
         
-        assert result[0]["rce_pln"] == "300.00"
+        assert result[0]["rce_pln"] == format_internal_price(300.0)
         assert result[0]["rce_pln_neg_to_zero"] == format_internal_price(300.0)
         
-        assert result[1]["rce_pln"] == "-100.00"
+        assert result[1]["rce_pln"] == format_internal_price(-100.0)
         assert result[1]["rce_pln_neg_to_zero"] == format_internal_price(0.0)
         
-        assert result[2]["rce_pln"] == "0.00"
+        assert result[2]["rce_pln"] == format_internal_price(0.0)
         assert result[2]["rce_pln_neg_to_zero"] == format_internal_price(0.0)
         
-        assert result[3]["rce_pln"] == "-50.00"
+        assert result[3]["rce_pln"] == format_internal_price(-50.0)
         assert result[3]["rce_pln_neg_to_zero"] == format_internal_price(0.0)
 
-    def test_add_neg_to_zero_key_invalid_data_handling(self, mock_hass):
+    def test_transform_neg_to_zero_invalid_data_handling(self, mock_hass):
         coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
         
         data = [
@@ -940,17 +1025,14 @@ class TestRCEPSEDataUpdateCoordinator:
             }
         ]
         
-        result = coordinator._add_neg_to_zero_key(data)
-        assert len(result) == 3
+        result = coordinator._transform_price_records(data)
+        assert len(result) == 2
         
-        assert result[0]["rce_pln"] == "300.00"
+        assert result[0]["rce_pln"] == format_internal_price(300.0)
         assert result[0]["rce_pln_neg_to_zero"] == format_internal_price(300.0)
         
-        assert result[1]["rce_pln"] == "invalid_price"
-        assert "rce_pln_neg_to_zero" not in result[1]
-        
-        assert result[2]["rce_pln"] == "-50.00"
-        assert result[2]["rce_pln_neg_to_zero"] == format_internal_price(0.0)
+        assert result[1]["rce_pln"] == format_internal_price(-50.0)
+        assert result[1]["rce_pln_neg_to_zero"] == format_internal_price(0.0)
 
     @pytest.mark.asyncio
     async def test_fetch_data_with_hourly_prices_disabled_adds_neg_to_zero(self, mock_hass):
@@ -1052,23 +1134,59 @@ class TestRCEPSEDataUpdateCoordinator:
         assert "2025-05-29 09:00" in dtimes
 
 
-def test_finalize_price_records_pln_mwh(mock_hass) -> None:
-    mock_config_entry = Mock()
-    mock_config_entry.options = {CONF_PRICE_UNIT: DEFAULT_PRICE_UNIT}
-    mock_config_entry.data = {}
-    coordinator = RCEPSEDataUpdateCoordinator(mock_hass, mock_config_entry)
-    data = [{"rce_pln": "100.123456", "rce_pln_neg_to_zero": "50.5"}]
-    out = coordinator._finalize_price_records(data)
+def test_transform_price_records_pln_mwh(mock_hass) -> None:
+    coordinator = _build_coordinator(mock_hass, {CONF_PRICE_UNIT: DEFAULT_PRICE_UNIT})
+    data = [{"dtime": "2024-01-01 00:15:00", "rce_pln": "100.123456"}]
+    out = coordinator._transform_price_records(data)
     assert out[0]["rce_pln"] == format_internal_price(100.123456)
-    assert out[0]["rce_pln_neg_to_zero"] == format_internal_price(50.5)
+    assert out[0]["rce_pln_neg_to_zero"] == format_internal_price(100.123456)
 
 
-def test_finalize_price_records_pln_kwh(mock_hass) -> None:
-    mock_config_entry = Mock()
-    mock_config_entry.options = {CONF_PRICE_UNIT: UNIT_PLN_KWH}
-    mock_config_entry.data = {}
-    coordinator = RCEPSEDataUpdateCoordinator(mock_hass, mock_config_entry)
-    data = [{"rce_pln": "1000.000000", "rce_pln_neg_to_zero": "500.000000"}]
-    out = coordinator._finalize_price_records(data)
+def test_transform_price_records_pln_kwh(mock_hass) -> None:
+    coordinator = _build_coordinator(mock_hass, {CONF_PRICE_UNIT: UNIT_PLN_KWH})
+    data = [
+        {"dtime": "2024-01-01 00:15:00", "rce_pln": "1000.000000"},
+        {"dtime": "2024-01-01 00:30:00", "rce_pln": "-500.000000"},
+    ]
+    out = coordinator._transform_price_records(data)
     assert out[0]["rce_pln"] == format_internal_price(1.0)
-    assert out[0]["rce_pln_neg_to_zero"] == format_internal_price(0.5)
\ No newline at end of file
+    assert out[0]["rce_pln_neg_to_zero"] == format_internal_price(1.0)
+    assert out[1]["rce_pln"] == format_internal_price(-0.5)
+    assert out[1]["rce_pln_neg_to_zero"] == format_internal_price(0.0)
+
+
+def test_transform_price_records_hourly_gross_kwh(mock_hass) -> None:
+    coordinator = _build_coordinator(
+        mock_hass,
+        {CONF_USE_HOURLY_PRICES: True, CONF_USE_GROSS_PRICES: True, CONF_PRICE_UNIT: UNIT_PLN_KWH},
+    )
+    data = [
+        _build_record(300.0, dtime="2024-01-01 00:15:00"),
+        _build_record(-100.0, dtime="2024-01-01 00:30:00"),
+        _build_record(500.0, dtime="2024-01-01 01:15:00"),
+    ]
+    out = coordinator._transform_price_records(data)
+    factor = (1 + TAX_RATE) / 1000
+    assert [r["rce_pln"] for r in out] == [
+        format_internal_price(100.0 * factor),
+        format_internal_price(100.0 * factor),
+        format_internal_price(500.0 * factor),
+    ]
+    assert out[0]["rce_pln_neg_to_zero"] == format_internal_price(150.0 * factor)
+
+
+def test_get_price_record_at(mock_hass) -> None:
+    coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+    assert coordinator.get_price_record_at(dt_util.now()) is None
+
+    coordinator.data = {
+        "raw_data": coordinator._transform_price_records([
+            _build_record(300.0, dtime="2024-01-01 00:15:00"),
+            _build_record(320.0, dtime="2024-01-01 00:30:00"),
+        ])
+    }
+    when = datetime(2024, 1, 1, 0, 20, tzinfo=dt_util.get_default_time_zone())
+
+    assert coordinator.get_price_record_at(when)["dtime"] == "2024-01-01 00:30:00"
+    assert coordinator.get_price_record_at(when.replace(tzinfo=None))["rce_pln"] == format_internal_price(320.0)
+    assert coordinator.get_price_record_at(when.replace(hour=1)) is None
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from datetime import date
+from unittest.mock import Mock, patch
+
+import pytest
+
+from custom_components.rce_pse.const import CONF_LOW_PRICE_THRESHOLD
+from custom_components.rce_pse.dependencies import (
+    CURRENT_PRICE,
+    LOW_PRICE_OPTIONS,
+    TODAY_PRICES,
+    TOMORROW_PRICES,
+    Dataset,
+    EntityDependencies,
+    RCEEntityDispatcher,
+)
+from custom_components.rce_pse.fingerprint import RCEDataChanges
+from custom_components.rce_pse.sensors.peak_hours import RCETodayPeakHoursSensor
+from custom_components.rce_pse.sensors.today_stats import RCETodayAvgPriceSensor
+
+TODAY = date(2025, 6, 1)
+
+
+def _changes(rce=(), pdgsz=(), options=()) -> RCEDataChanges:
+    return RCEDataChanges(frozenset(rce), frozenset(pdgsz), frozenset(options))
+
+
+@pytest.fixture
+def dispatcher() -> RCEEntityDispatcher:
+    coordinator = Mock()
+    coordinator.async_add_listener.return_value = Mock()
+    return RCEEntityDispatcher(coordinator)
+
+
+def test_dispatch_targets_entities_for_changed_day(dispatcher) -> None:
+    today, tomorrow, both = Mock(), Mock(), Mock()
+    dispatcher.async_add_entity(today, TODAY_PRICES)
+    dispatcher.async_add_entity(tomorrow, TOMORROW_PRICES)
+    dispatcher.async_add_entity(both, EntityDependencies(day_offsets=(0, 1)))
+
+    with patch("custom_components.rce_pse.dependencies.dt_util.now") as mock_now:
+        mock_now.return_value.date.return_value = TODAY
+        assert dispatcher.async_dispatch(_changes(rce={"2025-06-02"})) == 2
+
+    today.assert_not_called()
+    tomorrow.assert_called_once()
+    both.assert_called_once()
+
+
+def test_unchanged_fetch_updates_only_fetch_metadata_entities(dispatcher) -> None:
+    price, main = Mock(), Mock()
+    dispatcher.async_add_entity(price, CURRENT_PRICE)
+    dispatcher.async_add_entity(main, EntityDependencies(day_offsets=(0,), fetch_metadata=True))
+
+    assert dispatcher.async_dispatch(_changes()) == 1
+
+    price.assert_not_called()
+    main.assert_called_once()
+
+
+def test_pdgsz_changes_skip_price_entities(dispatcher) -> None:
+    price, peak = Mock(), Mock()
+    dispatcher.async_add_entity(price, CURRENT_PRICE)
+    remove_peak = dispatcher.async_add_entity(
+        peak, EntityDependencies(day_offsets=(0,), datasets=frozenset({Dataset.PDGSZ}))
+    )
+
+    assert len(dispatcher.affected(_changes(pdgsz={"2025-06-01"}), TODAY)) == 1
+    remove_peak()
+    assert dispatcher.affected(_changes(pdgsz={"2025-06-01"}), TODAY) == []
+
+
+def test_unscoped_and_option_dependencies(dispatcher) -> None:
+    any_day, low_price = Mock(), Mock()
+    dispatcher.async_add_entity(any_day, EntityDependencies())
+    dispatcher.async_add_entity(low_price, EntityDependencies(day_offsets=(0,), option_keys=LOW_PRICE_OPTIONS))
+
+    assert len(dispatcher.affected(_changes(rce={"2025-07-01"}), TODAY)) == 1
+    assert len(dispatcher.affected(_changes(options={CONF_LOW_PRICE_THRESHOLD}), TODAY)) == 1
+    assert len(dispatcher.affected(None, TODAY)) == 2
+    assert dispatcher.affected(_changes(), TODAY) == []
+
+
+def test_dispatcher_subscribes_once_to_coordinator(dispatcher) -> None:
+    coordinator = dispatcher.coordinator
+    remove_first = dispatcher.async_add_entity(Mock(), TODAY_PRICES)
+    remove_second = dispatcher.async_add_entity(Mock(), TOMORROW_PRICES)
+
+    coordinator.async_add_listener.assert_called_once_with(dispatcher._handle_coordinator_update)
+    remove_first()
+    coordinator.async_add_listener.return_value.assert_not_called()
+    remove_second()
+    coordinator.async_add_listener.return_value.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_entity_registers_with_dispatcher(mock_coordinator) -> None:
+    mock_coordinator.dispatcher = Mock()
+    mock_coordinator.slot_scheduler = Mock()
+    sensor = RCETodayAvgPriceSensor(mock_coordinator)
+    sensor.hass = mock_coordinator.hass
+
+    with patch.object(sensor, "async_on_remove") as mock_on_remove:
+        await sensor.async_added_to_hass()
+
+    mock_coordinator.dispatcher.async_add_entity.assert_called_once_with(
+        sensor._handle_dependency_update, TODAY_PRICES
+    )
+    mock_coordinator.async_add_listener.assert_called_once()
+    mock_on_remove.assert_any_call(mock_coordinator.dispatcher.async_add_entity.return_value)
+
+
+def test_entity_leaves_coordinator_updates_to_dispatcher(mock_coordinator) -> None:
+    sensor = RCETodayAvgPriceSensor(mock_coordinator)
+
+    with patch.object(sensor, "async_write_ha_state") as mock_write:
+        mock_coordinator.dispatcher = Mock()
+        sensor._handle_coordinator_update()
+        mock_write.assert_not_called()
+
+        sensor._handle_dependency_update()
+        mock_write.assert_called_once()
+
+        mock_coordinator.dispatcher = None
+        sensor._handle_coordinator_update()
+        assert mock_write.call_count == 2
+
+
+def test_peak_hours_depend_on_pdgsz_only(mock_coordinator) -> None:
+    dependencies = RCETodayPeakHoursSensor(mock_coordinator)._dependencies
+
+    assert dependencies.datasets == frozenset({Dataset.PDGSZ})
+    assert dependencies.day_offsets == (0,)
@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.rce_pse.derived import (
+    RCEDerivedData,
+    RCESlotSelection,
+    ScheduleQuery,
+    ThresholdIndex,
+    WindowQuery,
+    WindowQueryCache,
+    build_derived_data,
+    group_records_by_business_date,
+)
+from custom_components.rce_pse.price_calculator import PriceCalculator
+from custom_components.rce_pse.sensors.today_stats import RCETodayAvgPriceSensor
+
+
+def _day_records(business_date: str, prices: list[float]) -> list[dict]:
+    start = datetime.strptime(business_date, "%Y-%m-%d")
+    records = []
+    for i, price in enumerate(prices):
+        dtime = start + timedelta(minutes=15 * (i + 1))
+        records.append({
+            "dtime": dtime.strftime("%Y-%m-%d %H:%M:%S"),
+            "period": "",
+            "rce_pln": f"{price:.6f}",
+            "business_date": business_date,
+        })
+    return records
+
+
+def test_group_records_by_business_date() -> None:
+    records = _day_records("2025-06-01", [1.0, 2.0]) + _day_records("2025-06-02", [3.0])
+    grouped = group_records_by_business_date(records)
+    assert list(grouped) == ["2025-06-01", "2025-06-02"]
+    assert len(grouped["2025-06-01"]) == 2
+    assert len(grouped["2025-06-02"]) == 1
+
+
+def test_build_derived_data_day_stats() -> None:
+    records = _day_records("2025-06-01", [300.0, 100.0, 500.0, 100.0])
+    derived = build_derived_data(records)
+
+    day = derived.day("2025-06-01")
+    assert day is not None
+    assert day.average == pytest.approx(250.0)
+    assert day.median == pytest.approx(200.0)
+    assert day.min_price == 100.0
+    assert day.max_price == 500.0
+    assert [r["dtime"] for r in day.min_records] == [records[1]["dtime"], records[3]["dtime"]]
+    assert list(day.max_records) == [records[2]]
+    assert derived.day("2025-06-02") is None
+    assert derived.day(None) is None
+
+
+def test_build_derived_data_windows_match_calculator() -> None:
+    prices = [float(400 - (i % 37) * 7 + (i % 5) * 11) for i in range(96)]
+    records = _day_records("2025-06-01", prices)
+    specs = [("00:00", "00:00", 120, False), ("08:00", "20:00", 60, True)]
+    derived = build_derived_data(records, specs, low_price_threshold=200.0)
+
+    for search_start, search_end, duration, is_max in specs:
+        expected = PriceCalculator.find_optimal_window(
+            records, "2025-06-01", search_start, search_end, duration, is_max=is_max
+        )
+        query = WindowQuery("2025-06-01", search_start, search_end, duration, is_max)
+        assert derived.optimal_window(query) == expected
+
+    assert derived.low_price_window("2025-06-01", 200.0) == (
+        PriceCalculator.find_first_window_below_threshold(records, 200.0)
+    )
+    assert derived.optimal_window(WindowQuery("2025-06-01", "00:00", "00:00", 15, False)) is None
+
+
+def _reference_runs(records: list[dict], threshold: float, below: bool) -> list[list[dict]]:
+    runs: list[list[dict]] = []
+    previous = None
+    for record in sorted(records, key=lambda r: r["dtime"]):
+        end = datetime.strptime(record["dtime"], "%Y-%m-%d %H:%M:%S")
+        if (float(record["rce_pln"]) <= threshold) == below:
+            if previous is None or end - previous != timedelta(minutes=15):
+                runs.append([])
+            runs[-1].append(record)
+            previous = end
+        else:
+            previous = None
+    return runs
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_threshold_index_matches_reference_runs(seed: int) -> None:
+    rng = random.Random(seed)
+    records = [
+        record
+        for record in _day_records("2025-06-01", [rng.choice([50.0, 150.0, 250.0]) for _ in range(96)])
+        if rng.random() > 0.05
+    ]
+    rng.shuffle(records)
+
+    index = ThresholdIndex.from_records(records, 150.0)
+
+    assert [list(run) for run in index.below.runs] == _reference_runs(records, 150.0, True)
+    assert [list(run) for run in index.above.runs] == _reference_runs(records, 150.0, False)
+    first = PriceCalculator.find_first_window_below_threshold(records, 150.0)
+    assert (list(index.below.runs[0]) if index.below else []) == first
+
+
+def test_threshold_intervals_lookups() -> None:
+    prices = [300.0] * 96
+    prices[8:12] = [10.0] * 4
+    prices[40:42] = [20.0] * 2
+    day = datetime(2025, 6, 1)
+    intervals = ThresholdIndex.from_records(_day_records("2025-06-01", prices), 100.0).below
+
+    assert intervals.intervals() == [
+        (day + timedelta(hours=2), day + timedelta(hours=3)),
+        (day + timedelta(hours=10), day + timedelta(hours=10, minutes=30)),
+    ]
+    assert intervals.index_at(day + timedelta(hours=2)) == 0
+    assert intervals.index_at(day + timedelta(hours=3)) is None
+    assert intervals.index_at(day + timedelta(hours=10, minutes=20)) == 1
+    assert intervals.next_index(day) == 0
+    assert intervals.next_index(day + timedelta(hours=2)) == 1
+    assert intervals.next_index(day + timedelta(hours=10)) is None
+    assert intervals.interval(2) is None
+
+
+def test_build_derived_data_threshold_index_reused() -> None:
+    records = _day_records("2025-06-01", [float(i) for i in range(96)])
+    previous = build_derived_data(records, low_price_threshold=10.0)
+    derived = build_derived_data(records, low_price_threshold=10.0, previous=previous, reuse_dates=["2025-06-01"])
+
+    assert derived.threshold_index("2025-06-01", 10.0) is previous.threshold_index("2025-06-01", 10.0)
+    assert derived.threshold_index("2025-06-01", 20.0) is None
+    assert len(derived.threshold_index("2025-06-01", 10.0).below) == 1
+
+def test_second_window_does_not_overlap_excluded_window() -> None:
+    prices = [100.0] * 96
+    prices[30:34] = [900.0] * 4
+    prices[70:74] = [500.0] * 4
+    records = _day_records("2025-06-01", prices)
+    primary = ("00:00", "00:00", 60, True)
+    derived = build_derived_data(records, [primary, ("00:00", "00:00", 60, True, primary)])
+
+    first = derived.optimal_window(WindowQuery("2025-06-01", *primary))
+    second = derived.optimal_window(WindowQuery("2025-06-01", *primary, primary))
+    assert first == records[30:34]
+    assert second == records[70:74]
+
+
+def test_build_derived_data_reuses_unchanged_days() -> None:
+    day_one = _day_records("2025-06-01", [float(i) for i in range(96)])
+    day_two = _day_records("2025-06-02", [float(96 - i) for i in range(96)])
+    specs = [("00:00", "00:00", 60, False)]
+    previous = build_derived_data(day_one, specs, low_price_threshold=10.0)
+
+    with patch.object(PriceCalculator, "find_optimal_windows", wraps=PriceCalculator.find_optimal_windows) as mock_find:
+        derived = build_derived_data(
+            day_one + day_two, specs, 10.0, previous=previous, reuse_dates=["2025-06-01"]
+        )
+
+    assert mock_find.call_count == 1
+    assert derived.days["2025-06-01"] is previous.days["2025-06-01"]
+    query = WindowQuery("2025-06-01", "00:00", "00:00", 60, False)
+    assert derived.windows[query] is previous.windows[query]
+    assert derived.day("2025-06-02").min_price == 1.0
+
+
+def test_build_derived_data_recomputes_when_previous_lacks_query() -> None:
+    records = _day_records("2025-06-01", [float(i) for i in range(96)])
+    previous = build_derived_data(records)
+    derived = build_derived_data(
+        records, [("00:00", "00:00", 60, True)], previous=previous, reuse_dates=["2025-06-01"]
+    )
+    assert derived.days["2025-06-01"] is not previous.days["2025-06-01"]
+    assert derived.optimal_window(WindowQuery("2025-06-01", "00:00", "00:00", 60, True))
+
+
+def test_build_derived_data_slot_selection_bitmap() -> None:
+    prices = [100.0] * 96
+    for i in (8, 9, 40, 95):
+        prices[i] = 1.0
+    records = _day_records("2025-06-01", prices)
+    query = WindowQuery("2025-06-01", "00:00", "00:00", 60, False)
+    derived = build_derived_data(records, slot_specs=[query[1:5]])
+
+    selection = derived.slot_selection(query)
+    assert [r["dtime"] for r in selection.records] == [records[i]["dtime"] for i in (8, 9, 40, 95)]
+    assert selection.contains(datetime(2025, 6, 1, 2, 29))
+    assert not selection.contains(datetime(2025, 6, 1, 2, 30))
+    assert selection.contains(datetime(2025, 6, 1, 23, 59))
+    assert not selection.contains(datetime(2025, 6, 2, 0, 0))
+    assert selection.runs() == [
+        (datetime(2025, 6, 1, 2, 0), datetime(2025, 6, 1, 2, 30)),
+        (datetime(2025, 6, 1, 10, 0), datetime(2025, 6, 1, 10, 15)),
+        (datetime(2025, 6, 1, 23, 45), datetime(2025, 6, 2, 0, 0)),
+    ]
+
+    reused = build_derived_data(
+        records, slot_specs=[query[1:5]], previous=derived, reuse_dates=["2025-06-01"]
+    )
+    assert reused.slot_selection(query) is selection
+
+
+def test_build_derived_data_schedule_segments() -> None:
+    prices = [100.0] * 96
+    prices[8:12] = [1.0] * 4
+    prices[60:62] = [2.0] * 2
+    prices[40] = 0.0
+    records = _day_records("2025-06-01", prices)
+    spec = ("00:00", "00:00", 90, 2, 30)
+    derived = build_derived_data(records, schedule_specs=[spec])
+
+    selection = derived.schedule(ScheduleQuery("2025-06-01", *spec))
+    assert selection.segments() == [records[8:12], records[60:62]]
+    assert selection.contains(datetime(2025, 6, 1, 15, 20))
+    assert not selection.contains(datetime(2025, 6, 1, 10, 5))
+
+
+def test_slot_selection_without_records() -> None:
+    selection = RCESlotSelection.from_records("2025-06-01", [])
+    assert not selection.contains(datetime(2025, 6, 1, 12, 0))
+    assert selection.runs() == []
+
+
+def test_derived_data_is_immutable() -> None:
+    derived = build_derived_data(_day_records("2025-06-01", [1.0]))
+    with pytest.raises(TypeError):
+        derived.days["2025-06-02"] = None
+    with pytest.raises(AttributeError):
+        derived.days = {}
+
+
+def test_window_query_cache_evicts_least_recently_used() -> None:
+    cache = WindowQueryCache(maxsize=2)
+    calls = []
+
+    def compute(key):
+        return lambda: calls.append(key) or [{"key": key}]
+
+    cache.get_or_compute("a", compute("a"))
+    cache.get_or_compute("b", compute("b"))
+    assert cache.get_or_compute("a", compute("a")) == ({"key": "a"},)
+    cache.get_or_compute("c", compute("c"))
+    cache.get_or_compute("b", compute("b"))
+
+    assert calls == ["a", "b", "c", "b"]
+    assert len(cache) == 2
+
+
+def test_entity_uses_precomputed_stats(mock_coordinator) -> None:
+    today = mock_coordinator.data["raw_data"][0]["business_date"]
+    mock_coordinator.data["derived"] = build_derived_data(mock_coordinator.data["raw_data"])
+    assert isinstance(mock_coordinator.data["derived"], RCEDerivedData)
+    sensor = RCETodayAvgPriceSensor(mock_coordinator)
+
+    with patch(
+        "custom_components.rce_pse.shared_base.dt_util.now",
+        return_value=datetime.strptime(today, "%Y-%m-%d"),
+    ), patch.object(PriceCalculator, "calculate_average") as mock_average:
+        value = sensor.native_value
+
+    mock_average.assert_not_called()
+    assert value == round(mock_coordinator.data["derived"].day(today).average, 2)
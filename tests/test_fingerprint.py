@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.rce_pse.coordinator import RCEPSEDataUpdateCoordinator
+from custom_components.rce_pse.fingerprint import RCEDataChanges, RCESnapshotFingerprint
+from custom_components.rce_pse.price_series import PriceSeries
+
+
+def _day_records(business_date: str, price: float = 100.0) -> list[dict]:
+    start = datetime.strptime(business_date, "%Y-%m-%d")
+    return [
+        {
+            "dtime": (start + timedelta(minutes=15 * (i + 1))).strftime("%Y-%m-%d %H:%M:%S"),
+            "rce_pln": f"{price + i:.2f}",
+            "business_date": business_date,
+        }
+        for i in range(96)
+    ]
+
+
+def _fingerprint(records: list[dict], pdgsz: list[dict] | None = None) -> RCESnapshotFingerprint:
+    return RCESnapshotFingerprint.from_data(PriceSeries.from_api_records(records), pdgsz or [])
+
+
+def test_fingerprint_is_stable_for_identical_content() -> None:
+    records = _day_records("2025-06-01")
+    first = _fingerprint(records)
+    second = _fingerprint([dict(record) for record in records])
+
+    assert first.digest == second.digest
+    assert not second.changes_since(first)
+
+
+def test_fingerprint_reports_changed_business_dates() -> None:
+    today = _day_records("2025-06-01")
+    previous = _fingerprint(today)
+    current = _fingerprint(today + _day_records("2025-06-02"))
+
+    changes = current.changes_since(previous)
+    assert changes.business_dates == {"2025-06-02"}
+    assert changes.pdgsz_dates == frozenset()
+
+
+def test_fingerprint_reports_changed_pdgsz_dates() -> None:
+    records = _day_records("2025-06-01")
+    pdgsz = [{"business_date": "2025-06-01", "dtime": "2025-06-01 10:00:00", "usage_fcst": 1}]
+    previous = _fingerprint(records, pdgsz)
+    current = _fingerprint(records, [dict(pdgsz[0], usage_fcst=2)])
+
+    changes = current.changes_since(previous)
+    assert changes.business_dates == frozenset()
+    assert changes.pdgsz_dates == {"2025-06-01"}
+
+
+def test_fingerprint_detects_price_change_within_day() -> None:
+    records = _day_records("2025-06-01")
+    changed = [dict(record) for record in records]
+    changed[10]["rce_pln"] = "999.00"
+
+    assert _fingerprint(changed).changes_since(_fingerprint(records)).business_dates == {
+        "2025-06-01"
+    }
+
+
+@pytest.mark.asyncio
+async def test_coordinator_keeps_snapshot_when_content_unchanged(mock_hass) -> None:
+    today = dt_util.now().strftime("%Y-%m-%d")
+    coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+    coordinator.session = Mock()
+    coordinator._fetch_pdgsz = AsyncMock(return_value=[])
+    coordinator._fetch_rce_pln = AsyncMock(return_value=_day_records(today))
+    coordinator._awaiting_publication = AsyncMock(return_value=False)
+
+    first = await coordinator._async_update_data()
+    coordinator.data = first
+    coordinator._next_poll_at = None
+    coordinator._next_pdgsz_poll_at = None
+    coordinator._last_api_fetch = None
+    later = dt_util.now() + timedelta(seconds=1)
+    with patch("custom_components.rce_pse.coordinator.dt_util.now", return_value=later):
+        second = await coordinator._async_update_data()
+
+    assert second is not first
+    assert second["last_update"] == later.isoformat() != first["last_update"]
+    assert second["raw_data"] is first["raw_data"]
+    assert second["derived"] is first["derived"]
+    assert coordinator.last_changes == RCEDataChanges(frozenset(), frozenset())
+
+
+@pytest.mark.asyncio
+async def test_coordinator_records_changed_dates(mock_hass) -> None:
+    now = dt_util.now()
+    today = now.strftime("%Y-%m-%d")
+    tomorrow = (now + timedelta(days=1)).strftime("%Y-%m-%d")
+    coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+    coordinator.session = Mock()
+    coordinator._fetch_pdgsz = AsyncMock(return_value=[])
+    coordinator._awaiting_publication = AsyncMock(return_value=False)
+    coordinator._fetch_rce_pln = AsyncMock(return_value=_day_records(today))
+    coordinator.data = await coordinator._async_update_data()
+
+    coordinator._next_poll_at = None
+    coordinator._next_pdgsz_poll_at = None
+    coordinator._last_api_fetch = None
+    coordinator._fetch_rce_pln = AsyncMock(return_value=_day_records(tomorrow))
+    await coordinator._async_update_data()
+
+    assert coordinator.last_changes == RCEDataChanges(frozenset({tomorrow}), frozenset())
@@ -8,18 +8,24 @@ from homeassistant.config_entries import ConfigEntry
 from custom_components.rce_pse import async_setup_entry, async_unload_entry
 from custom_components.rce_pse.config_flow import (
     RCEConfigFlow,
+    SECTION_BATTERY,
     SECTION_CHEAPEST_WINDOW,
     SECTION_EXPENSIVE_WINDOW,
     SECTION_PRICING,
+    SECTION_SCHEDULE,
     SECTION_SECOND_EXPENSIVE_WINDOW,
 )
 from custom_components.rce_pse.const import (
+    CONF_BATTERY_MAX_SOC,
+    CONF_BATTERY_MIN_SOC,
     CONF_CHEAPEST_TIME_WINDOW_END,
     CONF_CHEAPEST_TIME_WINDOW_START,
     CONF_CHEAPEST_WINDOW_DURATION_HOURS,
     CONF_EXPENSIVE_TIME_WINDOW_END,
     CONF_EXPENSIVE_TIME_WINDOW_START,
     CONF_EXPENSIVE_WINDOW_DURATION_HOURS,
+    CONF_SCHEDULE_MIN_SEGMENT,
+    CONF_SCHEDULE_RUNTIME,
     CONF_SECOND_EXPENSIVE_TIME_WINDOW_END,
     CONF_SECOND_EXPENSIVE_TIME_WINDOW_START,
     CONF_SECOND_EXPENSIVE_WINDOW_DURATION_HOURS,
@@ -40,6 +46,7 @@ class TestRCEPSEIntegration:
             mock_coordinator = Mock()
             mock_coordinator_class.return_value = mock_coordinator
             mock_coordinator.async_config_entry_first_refresh = AsyncMock()
+            mock_coordinator.async_restore_snapshot = AsyncMock(return_value=False)
             
             mock_hass.config_entries = Mock()
             mock_hass.config_entries.async_forward_entry_setups = AsyncMock(return_value=True)
@@ -217,6 +224,34 @@ class TestRCEPSEConfigFlow:
             assert result.get("type") == "form"
             assert result.get("step_id") == "user"
 
+    @pytest.mark.asyncio
+    async def test_config_flow_rejects_schedule_min_segment_over_runtime(self, mock_hass):
+        flow = RCEConfigFlow()
+        flow.hass = mock_hass
+        user_input = {
+            SECTION_SCHEDULE: {CONF_SCHEDULE_RUNTIME: "01:00", CONF_SCHEDULE_MIN_SEGMENT: "01:30"},
+        }
+
+        with patch.object(flow, "_async_current_entries", return_value=[]):
+            result = await flow.async_step_user(user_input=user_input)
+
+        assert result.get("type") == "form"
+        assert result.get("errors") == {"base": "min_segment_exceeds_runtime"}
+
+    @pytest.mark.asyncio
+    async def test_config_flow_rejects_inverted_battery_soc_range(self, mock_hass):
+        flow = RCEConfigFlow()
+        flow.hass = mock_hass
+        user_input = {
+            SECTION_BATTERY: {CONF_BATTERY_MIN_SOC: 80, CONF_BATTERY_MAX_SOC: 20},
+        }
+
+        with patch.object(flow, "_async_current_entries", return_value=[]):
+            result = await flow.async_step_user(user_input=user_input)
+
+        assert result.get("type") == "form"
+        assert result.get("errors") == {"base": "invalid_soc_range"}
+
     @pytest.mark.asyncio
     async def test_config_flow_already_configured(self, mock_hass):
         flow = RCEConfigFlow()
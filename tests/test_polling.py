@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from unittest.mock import AsyncMock, Mock
+
+import aiohttp
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.rce_pse.const import API_UPDATE_INTERVAL, RCE_PLN_PROBE_SELECT
+from custom_components.rce_pse.coordinator import RCEPSEDataUpdateCoordinator
+from custom_components.rce_pse.polling import (
+    PDGSZ_POLL_INTERVAL,
+    PUBLICATION_POLL_MAX,
+    PUBLICATION_POLL_MIN,
+    complete_business_dates,
+    next_poll_time,
+)
+from custom_components.rce_pse.price_series import PriceSeries
+
+
+def _day_records(day: date, slots: int = 96) -> list[dict]:
+    start = datetime.combine(day, datetime.min.time())
+    return [
+        {
+            "dtime": (start + timedelta(minutes=15 * (i + 1))).strftime("%Y-%m-%d %H:%M:%S"),
+            "rce_pln": "100.00",
+            "business_date": day.isoformat(),
+        }
+        for i in range(slots)
+    ]
+
+
+def _local(day: date, hour: int, minute: int = 0) -> datetime:
+    return datetime(day.year, day.month, day.day, hour, minute, tzinfo=dt_util.get_default_time_zone())
+
+
+def _lowest(low: float, high: float) -> float:
+    return low
+
+
+def _highest(low: float, high: float) -> float:
+    return high
+
+
+DAY = date(2025, 6, 1)
+NEXT_DAY = DAY + timedelta(days=1)
+
+
+def test_complete_business_dates_requires_full_day() -> None:
+    records = _day_records(DAY) + _day_records(NEXT_DAY, slots=40)
+
+    assert complete_business_dates(PriceSeries.from_records(records)) == {DAY.isoformat()}
+    assert complete_business_dates(records) == {DAY.isoformat()}
+    assert complete_business_dates(None) == frozenset()
+
+
+def test_polls_regularly_while_today_is_missing() -> None:
+    now = _local(DAY, 9)
+    assert next_poll_time(now, frozenset()) == now + API_UPDATE_INTERVAL
+
+
+def test_waits_for_publication_window_before_it_opens() -> None:
+    now = _local(DAY, 9)
+    assert next_poll_time(now, frozenset({DAY.isoformat()}), _lowest) == _local(DAY, 13, 30)
+
+
+def test_polls_tightly_with_jitter_inside_publication_window() -> None:
+    now = _local(DAY, 14, 5)
+    complete = frozenset({DAY.isoformat()})
+
+    assert next_poll_time(now, complete, _lowest) == now + PUBLICATION_POLL_MIN
+    assert next_poll_time(now, complete, _highest) == now + PUBLICATION_POLL_MAX
+
+
+def test_falls_back_to_regular_interval_after_publication_window() -> None:
+    now = _local(DAY, 18)
+    assert next_poll_time(now, frozenset({DAY.isoformat()})) == now + API_UPDATE_INTERVAL
+
+
+def test_goes_quiet_once_tomorrow_is_complete() -> None:
+    now = _local(DAY, 14, 10)
+    complete = frozenset({DAY.isoformat(), NEXT_DAY.isoformat()})
+
+    assert next_poll_time(now, complete, _lowest) == _local(NEXT_DAY, 13, 30)
+
+
+@pytest.mark.asyncio
+async def test_coordinator_serves_cache_until_next_poll(mock_hass) -> None:
+    coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+    coordinator.session = Mock()
+    today = dt_util.now().date()
+    data = {"raw_data": PriceSeries.from_records(_day_records(today) + _day_records(today + timedelta(days=1)))}
+    coordinator._fetch_data = Mock(side_effect=AssertionError("unexpected fetch"))
+    coordinator.data = data
+    coordinator._last_api_fetch = dt_util.now()
+    coordinator._schedule_next_poll(dt_util.now(), data)
+
+    assert coordinator._next_poll_at > dt_util.now() + timedelta(hours=10)
+    assert coordinator.update_interval <= PDGSZ_POLL_INTERVAL
+    assert await coordinator._async_update_data() is data
+    assert coordinator.snapshot_is_stale() is False
+
+
+@pytest.mark.asyncio
+async def test_coordinator_refreshes_pdgsz_while_rce_days_are_held(mock_hass) -> None:
+    coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+    coordinator.session = Mock()
+    now = dt_util.now()
+    records = _day_records(now.date()) + _day_records(now.date() + timedelta(days=1))
+    data = {"raw_data": PriceSeries.from_records(records)}
+    fresh = {"raw_data": data["raw_data"]}
+    coordinator._fetch_data = AsyncMock(return_value=fresh)
+    coordinator.data = data
+    coordinator._schedule_next_poll(now - PDGSZ_POLL_INTERVAL, data)
+    next_rce_poll = coordinator._next_poll_at
+
+    assert await coordinator._async_update_data() is fresh
+
+    coordinator._fetch_data.assert_called_once_with(False)
+    assert coordinator._next_poll_at == next_rce_poll
+    assert coordinator._next_pdgsz_poll_at > now
+
+
+@pytest.mark.asyncio
+async def test_fetch_skips_rce_request_when_both_days_are_held(mock_hass) -> None:
+    today = dt_util.now().date()
+    coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+    coordinator.session = Mock()
+    coordinator._fetch_pdgsz = AsyncMock(return_value=[])
+    coordinator._fetch_rce_pln = AsyncMock(return_value=_day_records(today) + _day_records(today + timedelta(days=1)))
+    coordinator.data = await coordinator._fetch_data()
+    held = dict(coordinator._raw_days)
+    pdgsz = [{"dtime": "2025-06-01 08:00", "business_date": today.isoformat(), "usage_fcst": 1}]
+    coordinator._fetch_pdgsz = AsyncMock(return_value=pdgsz)
+    coordinator._fetch_rce_pln = AsyncMock(side_effect=AssertionError("unexpected RCE request"))
+
+    result = await coordinator._fetch_data()
+
+    coordinator._fetch_pdgsz.assert_called_once()
+    assert coordinator._raw_days == held
+    assert all(coordinator._raw_days[bd] is day for bd, day in held.items())
+    assert result["pdgsz_data"] == pdgsz
+    assert len(result["raw_data"]) == 192
+
+
+def _probe_coordinator(mock_hass, probe_value: list[dict]) -> tuple[RCEPSEDataUpdateCoordinator, Mock]:
+    coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+    today = dt_util.now().date()
+    coordinator.data = {"raw_data": PriceSeries.from_records(_day_records(today))}
+    coordinator._last_api_fetch = dt_util.now() - timedelta(hours=1)
+    coordinator._next_pdgsz_poll_at = dt_util.now() + timedelta(minutes=10)
+
+    response = AsyncMock()
+    response.status = 200
+    response.json = AsyncMock(return_value={"value": probe_value})
+    coordinator.session = Mock()
+    coordinator.session.get.return_value.__aenter__ = AsyncMock(return_value=response)
+    coordinator.session.get.return_value.__aexit__ = AsyncMock(return_value=None)
+    return coordinator, coordinator.session
+
+
+@pytest.mark.asyncio
+async def test_probe_skips_full_fetch_until_published(mock_hass) -> None:
+    coordinator, session = _probe_coordinator(mock_hass, [])
+    data = coordinator.data
+    coordinator._fetch_data = AsyncMock()
+
+    assert await coordinator._async_update_data() is data
+
+    coordinator._fetch_data.assert_not_called()
+    tomorrow = (dt_util.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+    params = session.get.call_args[1]["params"]
+    assert params == {
+        "$select": RCE_PLN_PROBE_SELECT,
+        "$filter": f"business_date eq '{tomorrow}'",
+        "$first": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_probe_still_refreshes_pdgsz_when_due(mock_hass) -> None:
+    coordinator, _ = _probe_coordinator(mock_hass, [])
+    coordinator._next_pdgsz_poll_at = None
+    fresh = {"raw_data": coordinator.data["raw_data"]}
+    coordinator._fetch_data = AsyncMock(return_value=fresh)
+
+    assert await coordinator._async_update_data() is fresh
+
+    coordinator._fetch_data.assert_called_once_with(False)
+
+
+@pytest.mark.asyncio
+async def test_probe_escalates_to_full_fetch_when_published(mock_hass) -> None:
+    tomorrow = (dt_util.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+    coordinator, _ = _probe_coordinator(mock_hass, [{"business_date": tomorrow}])
+    fresh = {"raw_data": []}
+    coordinator._fetch_data = AsyncMock(return_value=fresh)
+
+    assert await coordinator._async_update_data() is fresh
+    coordinator._fetch_data.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_probe_failure_falls_back_to_full_fetch(mock_hass) -> None:
+    coordinator, session = _probe_coordinator(mock_hass, [])
+    session.get.return_value.__aenter__ = AsyncMock(side_effect=aiohttp.ClientError("down"))
+    fresh = {"raw_data": []}
+    coordinator._fetch_data = AsyncMock(return_value=fresh)
+
+    assert await coordinator._async_update_data() is fresh
+
+
+@pytest.mark.asyncio
+async def test_fetch_requests_only_missing_business_dates(mock_hass) -> None:
+    today = dt_util.now().date()
+    tomorrow = today + timedelta(days=1)
+    coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+    coordinator.session = Mock()
+    coordinator._fetch_pdgsz = AsyncMock(return_value=[])
+    coordinator._fetch_rce_pln = AsyncMock(return_value=_day_records(today))
+    coordinator.data = await coordinator._fetch_data()
+    held_today = coordinator._raw_days[today.isoformat()]
+    today_stats = coordinator.data["derived"].days[today.isoformat()]
+
+    coordinator._fetch_rce_pln = AsyncMock(return_value=_day_records(tomorrow))
+    result = await coordinator._fetch_data()
+
+    assert coordinator._fetch_rce_pln.call_args[0][1] == tomorrow.isoformat()
+    assert coordinator._raw_days[today.isoformat()] is held_today
+    assert result["raw_data"].business_dates == (today.isoformat(), tomorrow.isoformat())
+    assert result["derived"].days[today.isoformat()] is today_stats
+    assert len(result["raw_data"]) == 192
@@ -0,0 +1,477 @@
+from __future__ import annotations
+
+import itertools
+import random
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from custom_components.rce_pse.price_calculator import PriceCalculator
+from custom_components.rce_pse.price_series import PriceSeries
+from custom_components.rce_pse.time_window import (
+    period_overlaps_search,
+    search_window_exclusive_end,
+    search_window_inclusive_start,
+)
+
+BUSINESS_DATE = "2025-06-01"
+
+
+def _reference_parse_pse_dtime(dtime_str: str) -> datetime:
+    if not dtime_str or " " not in dtime_str:
+        raise ValueError(dtime_str)
+    date_part, time_part = dtime_str.split(" ", 1)
+    if int(time_part.split(":")[0]) >= 24:
+        base = datetime.strptime(f"{date_part} 00:00:00", "%Y-%m-%d %H:%M:%S")
+        return base + timedelta(days=1)
+    return datetime.strptime(dtime_str, "%Y-%m-%d %H:%M:%S")
+
+
+def _reference_find_optimal_window(
+    data: list[dict],
+    business_date: str,
+    search_start_hhmm: str,
+    search_end_hhmm: str,
+    duration_minutes: int,
+    is_max: bool = False,
+) -> list[dict]:
+    if not data or duration_minutes <= 0 or duration_minutes % 15 != 0:
+        return []
+    duration_periods = duration_minutes // 15
+    search_start = search_window_inclusive_start(business_date, search_start_hhmm)
+    search_end_exclusive = search_window_exclusive_end(business_date, search_end_hhmm)
+    filtered_data = []
+    for record in data:
+        try:
+            bd = record.get("business_date")
+            if bd is not None and bd != business_date:
+                continue
+            period_end = _reference_parse_pse_dtime(record["dtime"])
+            period_start = period_end - timedelta(minutes=15)
+            if period_overlaps_search(period_start, period_end, search_start, search_end_exclusive):
+                filtered_data.append(record)
+        except (ValueError, KeyError):
+            continue
+    if len(filtered_data) < duration_periods:
+        return []
+    filtered_data.sort(key=lambda x: _reference_parse_pse_dtime(x["dtime"]))
+    best_window = []
+    best_avg_price = None
+    for i in range(len(filtered_data) - duration_periods + 1):
+        window = filtered_data[i : i + duration_periods]
+        is_continuous = True
+        for j in range(len(window) - 1):
+            try:
+                curr_time = _reference_parse_pse_dtime(window[j]["dtime"])
+                next_time = _reference_parse_pse_dtime(window[j + 1]["dtime"])
+                if next_time != curr_time + timedelta(minutes=15):
+                    is_continuous = False
+                    break
+            except (ValueError, KeyError):
+                is_continuous = False
+                break
+        if not is_continuous:
+            continue
+        try:
+            window_prices = [float(record["rce_pln"]) for record in window]
+            avg_price = sum(window_prices) / len(window_prices)
+            if (
+                best_avg_price is None
+                or (is_max and avg_price > best_avg_price)
+                or (not is_max and avg_price < best_avg_price)
+            ):
+                best_window = window
+                best_avg_price = avg_price
+        except (ValueError, KeyError):
+            continue
+    return best_window
+
+
+def _build_day(prices: list, skip: set[int] = frozenset()) -> list[dict]:
+    start = datetime.strptime(BUSINESS_DATE, "%Y-%m-%d")
+    records = []
+    for i, price in enumerate(prices):
+        if i in skip:
+            continue
+        end = start + timedelta(minutes=15 * (i + 1))
+        records.append({
+            "dtime": end.strftime("%Y-%m-%d %H:%M:%S"),
+            "period": "",
+            "rce_pln": price if isinstance(price, str) else f"{price:.6f}",
+            "business_date": BUSINESS_DATE,
+        })
+    return records
+
+
+@pytest.mark.parametrize("is_max", [False, True])
+def test_find_optimal_window_prefers_earliest_on_tie(is_max) -> None:
+    sign = 1 if is_max else -1
+    data = _build_day([100.0 + sign * 50 * (p == 50.0) for p in [100.0, 50.0, 50.0, 100.0, 50.0, 50.0]])
+
+    result = PriceCalculator.find_optimal_window(data, BUSINESS_DATE, "00:00", "00:00", 30, is_max)
+
+    assert result == data[1:3]
+
+
+def test_find_optimal_window_skips_gaps_and_invalid_prices() -> None:
+    data = _build_day([10.0, 10.0, 500.0, 1.0, 1.0, 900.0, "bad", 2.0, 2.0], skip={4})
+
+    result = PriceCalculator.find_optimal_window(data, BUSINESS_DATE, "00:00", "00:00", 30)
+
+    assert [r["rce_pln"] for r in result] == ["2.000000", "2.000000"]
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_find_optimal_window_matches_reference(seed) -> None:
+    rng = random.Random(seed)
+    prices = [rng.choice([rng.randint(-50, 50) * 10.0, round(rng.uniform(-200, 900), 2)]) for _ in range(96)]
+    if seed % 3 == 0:
+        prices[rng.randrange(96)] = "n/a"
+    skip = {rng.randrange(96) for _ in range(seed % 4)}
+    data = _build_day(prices, skip)
+    rng.shuffle(data)
+
+    for search_start, search_end in (("00:00", "00:00"), ("06:00", "22:00"), ("17:15", "20:45")):
+        for duration in (15, 60, 135, 240):
+            for is_max in (False, True):
+                assert PriceCalculator.find_optimal_window(
+                    data, BUSINESS_DATE, search_start, search_end, duration, is_max
+                ) == _reference_find_optimal_window(
+                    data, BUSINESS_DATE, search_start, search_end, duration, is_max
+                )
+
+
+def _two_days(rng: random.Random) -> list[dict]:
+    records = []
+    for offset, skip in ((0, {rng.randrange(96)}), (1, set())):
+        day = (datetime.strptime(BUSINESS_DATE, "%Y-%m-%d") + timedelta(days=offset)).strftime("%Y-%m-%d")
+        for record in _build_day([round(rng.uniform(-100, 800), 2) for _ in range(96)], skip):
+            start = datetime.strptime(record["dtime"], "%Y-%m-%d %H:%M:%S") + timedelta(days=offset)
+            records.append({**record, "dtime": start.strftime("%Y-%m-%d %H:%M:%S"), "business_date": day})
+    return records
+
+
+def _reference_rolling_window(data, search_start, search_end, duration, is_max):
+    periods = duration // 15
+    ends = [_reference_parse_pse_dtime(r["dtime"]) for r in data]
+    best = None
+    for i in range(len(data) - periods + 1):
+        window = range(i, i + periods)
+        if ends[i] - timedelta(minutes=15) < search_start or ends[i + periods - 1] > search_end:
+            continue
+        if any(ends[k + 1] - ends[k] != timedelta(minutes=15) for k in window[:-1]):
+            continue
+        total = sum(float(data[k]["rce_pln"]) for k in window)
+        if best is None or (total > best[0] if is_max else total < best[0]):
+            best = (total, i)
+    return [] if best is None else data[best[1] : best[1] + periods]
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_find_rolling_window_matches_reference(seed) -> None:
+    rng = random.Random(seed)
+    data = _two_days(rng)
+    series = PriceSeries.from_records(data)
+    midnight = datetime.strptime(BUSINESS_DATE, "%Y-%m-%d") + timedelta(days=1)
+
+    for start_hours, horizon_hours in ((20, 12), (0, 48), (23.75, 1), (30, 4)):
+        start = datetime.strptime(BUSINESS_DATE, "%Y-%m-%d") + timedelta(hours=start_hours)
+        for duration in (15, 180, 300):
+            for is_max in (False, True):
+                expected = _reference_rolling_window(
+                    data, start, start + timedelta(hours=horizon_hours), duration, is_max
+                )
+                for source in (data, series):
+                    result = PriceCalculator.find_rolling_window(
+                        source, start, start + timedelta(hours=horizon_hours), duration, is_max
+                    )
+                    assert [r["dtime"] for r in result] == [r["dtime"] for r in expected]
+    assert any(
+        _reference_parse_pse_dtime(r["dtime"]) == midnight
+        for r in PriceCalculator.find_rolling_window(
+            series, midnight - timedelta(hours=1), midnight + timedelta(hours=1), 120
+        )
+    )
+
+
+def _reference_charging_cost(data, search_start, search_end, energy, power, contiguous):
+    slot_energy = power / 4
+    count = -int(-energy // slot_energy)
+    remainder = energy - (count - 1) * slot_energy
+    ends = [_reference_parse_pse_dtime(r["dtime"]) for r in data]
+    allowed = [i for i in range(len(data)) if ends[i] - timedelta(minutes=15) >= search_start and ends[i] <= search_end]
+    costs = []
+    for chosen in itertools.combinations(allowed, count):
+        if contiguous and any(ends[b] - ends[a] != timedelta(minutes=15) for a, b in itertools.pairwise(chosen)):
+            continue
+        prices = [float(data[i]["rce_pln"]) for i in chosen]
+        partial = max(prices[0], prices[-1]) if contiguous else max(prices)
+        costs.append(slot_energy * sum(prices) - (slot_energy - remainder) * partial)
+    return min(costs, default=None)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_plan_charging_matches_reference(seed) -> None:
+    rng = random.Random(seed)
+    data = [
+        record
+        for record in _build_day([rng.randint(-5, 9) for _ in range(14)])
+        if rng.random() > 0.1
+    ]
+    day = datetime.strptime(BUSINESS_DATE, "%Y-%m-%d")
+    start = day + timedelta(minutes=15 * rng.randint(0, 4))
+    end = day + timedelta(minutes=15 * rng.randint(5, 14))
+    energy, power = round(rng.uniform(0.1, 8), 2), rng.choice([4, 8, 11])
+
+    for contiguous in (False, True):
+        expected = _reference_charging_cost(data, start, end, energy, power, contiguous)
+        for source in (data, PriceSeries.from_records(data)):
+            plan = PriceCalculator.plan_charging(source, start, end, energy, power, contiguous)
+            if expected is None:
+                assert plan == []
+                continue
+            assert sum(float(r["rce_pln"]) * kwh for r, kwh in plan) == pytest.approx(expected)
+            assert sum(kwh for _, kwh in plan) == pytest.approx(energy)
+
+
+def test_plan_charging_across_midnight_places_partial_slot() -> None:
+    data = _two_days(random.Random(0))
+    series = PriceSeries.from_records(data)
+    start = datetime.strptime(BUSINESS_DATE, "%Y-%m-%d") + timedelta(hours=18)
+
+    plan = PriceCalculator.plan_charging(series, start, start + timedelta(hours=13), 10.0, 11.0)
+    block = PriceCalculator.plan_charging(series, start, start + timedelta(hours=13), 10.0, 11.0, True)
+
+    assert [kwh for _, kwh in plan].count(2.75) == 3
+    assert max(plan, key=lambda item: float(item[0]["rce_pln"]))[1] == pytest.approx(1.75)
+    assert len(block) == 4
+    assert [_reference_parse_pse_dtime(r["dtime"]) for r, _ in block] == [
+        _reference_parse_pse_dtime(block[0][0]["dtime"]) + timedelta(minutes=15 * i) for i in range(4)
+    ]
+    assert PriceCalculator.plan_charging(series, start, start + timedelta(minutes=30), 10.0, 11.0) == []
+
+
+@pytest.mark.parametrize("contiguous", [False, True])
+def test_plan_charging_keeps_slots_inside_unaligned_bounds(contiguous) -> None:
+    day = datetime.strptime(BUSINESS_DATE, "%Y-%m-%d")
+
+    for start, deadline, cheap in (
+        (day + timedelta(hours=6), day + timedelta(hours=7, minutes=5), 28),
+        (day + timedelta(hours=6, minutes=5), day + timedelta(hours=8), 24),
+    ):
+        prices = [100.0] * 36
+        prices[cheap - 1 : cheap + 2] = [50.0, 1.0, 50.0]
+        data = _build_day(prices)
+        for source in (data, PriceSeries.from_records(data)):
+            plan = PriceCalculator.plan_charging(source, start, deadline, 2.0 if contiguous else 1.0, 4.0, contiguous)
+            assert plan
+            for record, _ in plan:
+                period_end = _reference_parse_pse_dtime(record["dtime"])
+                assert start <= period_end - timedelta(minutes=15)
+                assert period_end <= deadline
+
+@pytest.mark.slow
+def test_find_optimal_window_benchmark() -> None:
+    rng = random.Random(0)
+    data = _build_day([round(rng.uniform(-100, 900), 2) for _ in range(96)])
+    args = (data, BUSINESS_DATE, "00:00", "00:00", 240, False)
+
+    def _timed(func, rounds: int) -> float:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            func(*args)
+        return (time.perf_counter() - start) / rounds
+
+    reference = _timed(_reference_find_optimal_window, 3)
+    optimized = _timed(PriceCalculator.find_optimal_window, 30)
+    print(f"find_optimal_window: reference {reference * 1000:.2f} ms, prefix-sum {optimized * 1000:.2f} ms, {reference / optimized:.0f}x")
+
+    assert PriceCalculator.find_optimal_window(*args) == _reference_find_optimal_window(*args)
+    assert reference / optimized > 20
+
+
+def _random_queries(rng: random.Random, count: int) -> list[tuple[str, str, int, bool]]:
+    queries = []
+    for _ in range(count):
+        start = rng.randrange(0, 96)
+        end = rng.randrange(start, 97) % 96
+        queries.append((
+            f"{start // 4:02d}:{start % 4 * 15:02d}",
+            f"{end // 4:02d}:{end % 4 * 15:02d}",
+            rng.choice([0, 10, 15, 60, 135, 240, 480]),
+            rng.random() < 0.5,
+        ))
+    return queries
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_find_optimal_windows_matches_single_queries(seed) -> None:
+    rng = random.Random(seed)
+    prices = [round(rng.uniform(-200, 900), 2) for _ in range(96)]
+    prices[rng.randrange(96)] = "n/a"
+    data = _build_day(prices, {rng.randrange(96)})
+    rng.shuffle(data)
+    queries = _random_queries(rng, 40)
+
+    results = PriceCalculator.find_optimal_windows(data, BUSINESS_DATE, queries)
+
+    assert results == [
+        _reference_find_optimal_window(data, BUSINESS_DATE, *query) for query in queries
+    ]
+
+
+def test_find_optimal_windows_without_data() -> None:
+    assert PriceCalculator.find_optimal_windows([], BUSINESS_DATE, [("00:00", "00:00", 60, False)]) == [[]]
+
+
+def _reference_top_windows(data, search_start, search_end, duration, count, is_max):
+    remaining = list(data)
+    windows = []
+    while len(windows) < count:
+        window = _reference_find_optimal_window(remaining, BUSINESS_DATE, search_start, search_end, duration, is_max)
+        if not window:
+            break
+        windows.append(window)
+        remaining = [r for r in remaining if not any(r is w for w in window)]
+    return windows
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_find_top_windows_matches_repeated_solves(seed) -> None:
+    rng = random.Random(seed)
+    data = _build_day([rng.randint(-20, 90) * 10.0 for _ in range(96)], {rng.randrange(96)})
+    rng.shuffle(data)
+
+    for search_start, search_end, duration in (("00:00", "00:00", 120), ("06:00", "22:00", 45)):
+        for is_max in (False, True):
+            result = PriceCalculator.find_top_windows(
+                data, BUSINESS_DATE, search_start, search_end, duration, 4, is_max
+            )
+            assert result == _reference_top_windows(data, search_start, search_end, duration, 4, is_max)
+            assert result[0] == PriceCalculator.find_optimal_window(
+                data, BUSINESS_DATE, search_start, search_end, duration, is_max
+            )
+
+
+def test_find_top_windows_skips_excluded_interval() -> None:
+    data = _build_day([10.0, 90.0, 95.0, 80.0, 10.0, 10.0, 70.0, 75.0, 10.0])
+    peak = PriceCalculator.find_optimal_window(data, BUSINESS_DATE, "00:00", "00:00", 45, True)
+
+    second = PriceCalculator.find_top_windows(
+        data, BUSINESS_DATE, "00:00", "00:00", 30, 1, True, exclude=[peak]
+    )
+
+    assert [r["rce_pln"] for r in peak] == ["90.000000", "95.000000", "80.000000"]
+    assert [r["rce_pln"] for r in second[0]] == ["70.000000", "75.000000"]
+    assert PriceCalculator.find_top_windows(data, BUSINESS_DATE, "00:00", "00:00", 30, 0) == []
+
+
+def _reference_schedule_cost(prices, skip, total, max_segments, min_run):
+    usable = [i for i in range(len(prices)) if i not in skip and not isinstance(prices[i], str)]
+    best = None
+    for chosen in itertools.combinations(usable, total):
+        runs = []
+        for i in chosen:
+            if runs and runs[-1][-1] == i - 1:
+                runs[-1].append(i)
+            else:
+                runs.append([i])
+        if len(runs) > max_segments or any(len(run) < min_run for run in runs):
+            continue
+        cost = sum(prices[i] for i in chosen)
+        if best is None or cost < best:
+            best = cost
+    return best
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_find_schedule_matches_exhaustive_search(seed) -> None:
+    rng = random.Random(seed)
+    n = rng.randint(4, 10)
+    prices = [rng.randint(-5, 20) * 1.0 for _ in range(n)]
+    if seed % 4 == 0:
+        prices[rng.randrange(n)] = "n/a"
+    skip = {rng.randrange(n)} if seed % 3 == 0 else set()
+    total, max_segments, min_run = rng.randint(1, n), rng.randint(1, 3), rng.randint(1, 3)
+    data = _build_day(prices, skip)
+    rng.shuffle(data)
+
+    segments = PriceCalculator.find_schedule(
+        data, BUSINESS_DATE, "00:00", "00:00", total * 15, max_segments, min_run * 15
+    )
+    expected = _reference_schedule_cost(prices, skip, total, max_segments, min_run)
+
+    if expected is None:
+        assert segments == []
+        return
+    assert sum(len(segment) for segment in segments) == total
+    assert len(segments) <= max_segments
+    assert all(len(segment) >= min_run for segment in segments)
+    assert sum(float(r["rce_pln"]) for segment in segments for r in segment) == pytest.approx(expected)
+
+
+def test_find_schedule_respects_search_range() -> None:
+    prices = [1.0, 1.0, 50.0, 50.0, 50.0, 50.0, 2.0, 3.0, 50.0, 2.0, 2.0, 50.0]
+    data = _build_day(prices)
+
+    segments = PriceCalculator.find_schedule(data, BUSINESS_DATE, "01:00", "03:00", 60, 2, 30)
+
+    assert [[r["dtime"][11:16] for r in segment] for segment in segments] == [
+        ["01:45", "02:00"],
+        ["02:30", "02:45"],
+    ]
+    assert PriceCalculator.find_schedule(data, BUSINESS_DATE, "00:00", "00:00", 30, 1, 45) == []
+
+
+@pytest.mark.slow
+def test_find_optimal_windows_benchmark() -> None:
+    rng = random.Random(0)
+    data = _build_day([round(rng.uniform(-100, 900), 2) for _ in range(96)])
+    all_queries = _random_queries(rng, 1000)
+    speedups = {}
+
+    for count in (1, 10, 100, 1000):
+        queries = all_queries[:count]
+        start = time.perf_counter()
+        single = [PriceCalculator.find_optimal_window(data, BUSINESS_DATE, *query) for query in queries]
+        single_time = time.perf_counter() - start
+        start = time.perf_counter()
+        batch = PriceCalculator.find_optimal_windows(data, BUSINESS_DATE, queries)
+        batch_time = time.perf_counter() - start
+        speedups[count] = single_time / batch_time
+        print(f"{count} queries: single {single_time * 1000:.2f} ms, batch {batch_time * 1000:.2f} ms, {speedups[count]:.1f}x")
+        assert batch == single
+
+    assert speedups[1000] > speedups[1]
+    assert speedups[1000] > 3
+
+
+def test_find_cheapest_slots_selects_non_contiguous_slots() -> None:
+    data = _build_day([50.0, 10.0, 40.0, 10.0, "bad", 5.0, 30.0, 10.0], skip={6})
+    data.reverse()
+
+    result = PriceCalculator.find_cheapest_slots(data, BUSINESS_DATE, "00:00", "00:00", 3)
+    most_expensive = PriceCalculator.find_cheapest_slots(data, BUSINESS_DATE, "00:00", "00:00", 2, True)
+
+    assert [r["dtime"][11:16] for r in result] == ["00:30", "01:00", "01:30"]
+    assert [r["rce_pln"] for r in most_expensive] == ["50.000000", "40.000000"]
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_find_cheapest_slots_matches_full_sort(seed) -> None:
+    rng = random.Random(seed)
+    data = _build_day([rng.randint(-20, 20) * 10.0 for _ in range(96)])
+    rng.shuffle(data)
+
+    for search_start, search_end in (("00:00", "00:00"), ("06:00", "22:00")):
+        search = [
+            r for r in data
+            if search_window_inclusive_start(BUSINESS_DATE, search_start)
+            < _reference_parse_pse_dtime(r["dtime"])
+            <= search_window_exclusive_end(BUSINESS_DATE, search_end)
+        ]
+        for count in (1, 8, 200):
+            expected = sorted(search, key=lambda r: (float(r["rce_pln"]), r["dtime"]))[:count]
+            result = PriceCalculator.find_cheapest_slots(data, BUSINESS_DATE, search_start, search_end, count)
+            assert result == sorted(expected, key=lambda r: r["dtime"])
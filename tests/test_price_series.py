@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import random
+import time
+from array import array
+from collections import defaultdict
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from custom_components.rce_pse.const import TAX_RATE
+from custom_components.rce_pse.price_series import (
+    PriceRecord,
+    PriceSeries,
+    compact_price_list,
+    format_internal_price,
+    last_price_record_before,
+    price_record_at,
+    record_period_end,
+    record_price,
+)
+from custom_components.rce_pse.time_window import parse_pse_dtime
+
+
+def _record(dtime: str, price: float, business_date: str, neg_to_zero: bool = True) -> dict:
+    record = {
+        "dtime": dtime,
+        "period": "",
+        "rce_pln": format_internal_price(price),
+        "business_date": business_date,
+    }
+    if neg_to_zero:
+        record["rce_pln_neg_to_zero"] = format_internal_price(max(0.0, price))
+    return record
+
+
+@pytest.fixture
+def records():
+    return [
+        _record("2025-06-02 00:15:00", 120.5, "2025-06-02"),
+        _record("2025-06-01 00:15:00", -10.25, "2025-06-01"),
+        _record("2025-06-01 00:30:00", 300.0, "2025-06-01", neg_to_zero=False),
+        _record("2025-06-01 24:00:00", 410.123456, "2025-06-01"),
+    ]
+
+
+def test_from_records_builds_typed_buffers(records) -> None:
+    series = PriceSeries.from_records(records)
+
+    assert len(series) == 4
+    assert isinstance(series.starts, array) and series.starts.typecode == "q"
+    assert isinstance(series.prices, array) and series.prices.typecode == "d"
+    assert series.business_dates == ("2025-06-01", "2025-06-02")
+    assert list(series.day_offsets) == [0, 3, 4]
+    assert list(series.day_prices("2025-06-01")) == [-10.25, 300.0, 410.123456]
+    assert series.day_range("2025-06-03") == range(0)
+
+
+def test_record_views_are_dict_compatible(records) -> None:
+    series = PriceSeries.from_records(records)
+
+    assert series.day_records("2025-06-01") == records[1:]
+    assert series.day_records("2025-06-02") == records[:1]
+    assert series[0]["rce_pln"] == "-10.250000"
+    assert series[-1].get("business_date") == "2025-06-02"
+    assert "rce_pln_neg_to_zero" not in series[1]
+    assert series[1].copy() == records[2]
+    assert isinstance(series[1].copy(), dict)
+    with pytest.raises(KeyError):
+        series[1]["rce_pln_neg_to_zero"]
+
+
+def test_invalid_records_are_skipped(records) -> None:
+    records.append({"dtime": "broken", "rce_pln": "1.0", "business_date": "2025-06-01"})
+    records.append({"dtime": "2025-06-01 01:00:00", "rce_pln": "n/a", "business_date": "2025-06-01"})
+
+    assert len(PriceSeries.from_records(records)) == 4
+
+
+def test_series_equality(records) -> None:
+    assert PriceSeries.from_records([]) == []
+    assert PriceSeries.from_records(records[1:]) == records[1:]
+    assert PriceSeries.from_records(records[1:]) != records[:1]
+
+
+def test_record_helpers_use_typed_values(records) -> None:
+    series = PriceSeries.from_records(records)
+    view = series[2]
+
+    assert isinstance(view, PriceRecord)
+    assert record_price(view) == 410.123456
+    assert record_price(view, "rce_pln_neg_to_zero") == 410.123456
+    assert record_period_end(view) == datetime(2025, 6, 2, 0, 0)
+    assert view.period_start == datetime(2025, 6, 1, 23, 45)
+    assert record_price(records[0]) == 120.5
+    assert record_period_end(records[0]) == datetime(2025, 6, 2, 0, 15)
+
+
+@pytest.mark.parametrize("gap", [False, True])
+def test_price_record_at_matches_linear_scan(gap) -> None:
+    records = _api_records(2)
+    if gap:
+        del records[40:44]
+    series = PriceSeries.from_records(records)
+    start = datetime(2025, 5, 31, 23, 0)
+
+    for minutes in range(0, 3 * 24 * 60, 5):
+        when = start + timedelta(minutes=minutes, seconds=minutes % 2)
+        for lookup in (price_record_at, last_price_record_before):
+            expected = lookup(records, when)
+            found = lookup(series, when)
+            assert (found and found["dtime"]) == (expected and expected["dtime"])
+
+
+def test_price_record_at_boundary_prefers_ending_slot(records) -> None:
+    series = PriceSeries.from_records(records)
+
+    assert series.index_at(datetime(2025, 6, 1, 0, 15)) == 0
+    assert series.index_at(datetime(2025, 6, 1, 0, 15, 0, 1)) == 1
+    assert series.index_at(datetime(2025, 6, 1, 0, 45)) is None
+    assert series.last_ended_index(datetime(2025, 6, 1, 0, 14)) is None
+    assert series.last_ended_index(datetime(2025, 6, 1, 12, 0)) == 1
+    assert PriceSeries.from_records([]).index_at(datetime(2025, 6, 1)) is None
+
+
+def _day_slots(day: datetime, skip_hour: int | None = None) -> list[dict]:
+    records = []
+    for i in range(96):
+        start = day + timedelta(minutes=15 * i)
+        if start.hour == skip_hour:
+            continue
+        records.append(_record(format(start + timedelta(minutes=15), "%Y-%m-%d %H:%M:%S"), i + 0.004, "2025-03-30"))
+    return records
+
+
+def test_compact_price_list_uses_start_and_step_across_dst() -> None:
+    warsaw = ZoneInfo("Europe/Warsaw")
+    records = _day_slots(datetime(2025, 3, 30), skip_hour=2)
+    series = PriceSeries.from_records(records)
+
+    for source in (records, series):
+        compact = compact_price_list(source, warsaw, 2)
+        assert compact["prices_start"] == "2025-03-30T00:00:00+01:00"
+        assert compact["prices_step_minutes"] == 15
+        assert len(compact["prices"]) == 92
+        assert compact["prices"][:2] == [0.0, 1.0]
+
+
+def test_compact_price_list_keeps_dtimes_for_gaps(records) -> None:
+    compact = compact_price_list(records[1:], ZoneInfo("Europe/Warsaw"), 2)
+
+    assert compact["prices_dtime"] == [r["dtime"] for r in records[1:]]
+    assert compact["prices"] == [-10.25, 300.0, 410.12]
+    assert compact_price_list([], ZoneInfo("Europe/Warsaw"), 2) == {"prices": []}
+
+
+def _reference_neg_to_zero(data: list[dict]) -> list[dict]:
+    processed = []
+    for record in data:
+        new_record = record.copy()
+        new_record["rce_pln_neg_to_zero"] = format_internal_price(max(0, float(record["rce_pln"])))
+        processed.append(new_record)
+    return processed
+
+
+def _reference_hourly_averages(data: list[dict]) -> list[dict]:
+    hourly_groups = defaultdict(list)
+    for record in data:
+        period_start = parse_pse_dtime(record["dtime"]) - timedelta(minutes=15)
+        hourly_groups[f"{period_start.strftime('%Y-%m-%d')}_{period_start.hour:02d}"].append(record)
+    processed = []
+    for records in hourly_groups.values():
+        prices = [float(record["rce_pln"]) for record in records]
+        average = sum(prices) / len(prices)
+        average_neg_to_zero = sum(max(0, price) for price in prices) / len(prices)
+        for record in records:
+            new_record = record.copy()
+            new_record["rce_pln"] = format_internal_price(average)
+            new_record["rce_pln_neg_to_zero"] = format_internal_price(average_neg_to_zero)
+            processed.append(new_record)
+    return processed
+
+
+def _reference_scale(data: list[dict], factor: float) -> list[dict]:
+    processed = []
+    for record in data:
+        new_record = record.copy()
+        for key in ("rce_pln", "rce_pln_neg_to_zero"):
+            new_record[key] = format_internal_price(float(new_record[key]) * factor)
+        processed.append(new_record)
+    return processed
+
+
+def _reference_chain(data: list[dict], hourly: bool, gross: bool, kwh: bool) -> list[dict]:
+    processed = _reference_hourly_averages(data) if hourly else _reference_neg_to_zero(data)
+    if gross:
+        processed = _reference_scale(processed, 1 + TAX_RATE)
+    return _reference_scale(processed, 1 / 1000 if kwh else 1.0)
+
+
+def _api_records(days: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    start = datetime(2025, 6, 1)
+    records = []
+    for i in range(days * 96):
+        period_start = start + timedelta(minutes=15 * i)
+        period_end = period_start + timedelta(minutes=15)
+        records.append({
+            "dtime": period_end.strftime("%Y-%m-%d %H:%M:%S"),
+            "period": f"{period_start:%H:%M} - {period_end:%H:%M}",
+            "rce_pln": f"{rng.uniform(-200, 900):.2f}",
+            "business_date": period_start.strftime("%Y-%m-%d"),
+        })
+    return records
+
+
+@pytest.mark.parametrize("hourly", [False, True])
+@pytest.mark.parametrize("gross", [False, True])
+@pytest.mark.parametrize("kwh", [False, True])
+def test_from_api_records_matches_reference_chain(hourly, gross, kwh) -> None:
+    records = _api_records(2)
+    factor = (1 + TAX_RATE if gross else 1.0) / (1000 if kwh else 1)
+
+    series = PriceSeries.from_api_records(records, hourly_prices=hourly, price_factor=factor)
+    expected = _reference_chain(records, hourly, gross, kwh)
+
+    assert len(series) == len(expected)
+    for view, record in zip(series, expected):
+        assert view["dtime"] == record["dtime"]
+        assert view["period"] == record["period"]
+        assert record_price(view) == pytest.approx(float(record["rce_pln"]), abs=2e-6)
+        assert record_price(view, "rce_pln_neg_to_zero") == pytest.approx(
+            float(record["rce_pln_neg_to_zero"]), abs=2e-6
+        )
+
+
+@pytest.mark.slow
+def test_from_api_records_benchmark() -> None:
+    records = _api_records(30)
+
+    def _timed(func, rounds: int = 5) -> float:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            func()
+        return (time.perf_counter() - start) / rounds
+
+    reference = _timed(lambda: PriceSeries.from_records(_reference_chain(records, True, True, True)))
+    fused = _timed(
+        lambda: PriceSeries.from_api_records(
+            records, hourly_prices=True, price_factor=(1 + TAX_RATE) / 1000
+        )
+    )
+    print(f"price pipeline ({len(records)} records): chained {reference * 1000:.1f} ms, fused {fused * 1000:.1f} ms, {reference / fused:.1f}x")
+
+    assert fused < reference
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.rce_pse.const import CONF_USE_HOURLY_PRICES
+from custom_components.rce_pse.price_series import PriceSeries, epoch_seconds
+from custom_components.rce_pse.scheduler import RCESlotScheduler, slot_boundaries
+
+
+def _series(start: str, count: int) -> PriceSeries:
+    first = datetime.strptime(start, "%Y-%m-%d %H:%M")
+    return PriceSeries.from_records(
+        {
+            "dtime": (first + timedelta(minutes=15 * (i + 1))).strftime("%Y-%m-%d %H:%M:%S"),
+            "rce_pln": "100.000000",
+            "business_date": first.strftime("%Y-%m-%d"),
+        }
+        for i in range(count)
+    )
+
+
+def _coordinator(series: PriceSeries | None, hourly: bool = False) -> Mock:
+    coordinator = Mock()
+    coordinator.data = {"raw_data": series} if series is not None else None
+    coordinator._get_config_value = Mock(
+        side_effect=lambda key, default: hourly if key == CONF_USE_HOURLY_PRICES else default
+    )
+    coordinator.async_add_listener = Mock(return_value=Mock())
+    return coordinator
+
+
+def _local(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%d %H:%M:%S").replace(tzinfo=dt_util.get_default_time_zone())
+
+
+def test_slot_boundaries_quarter_and_hourly() -> None:
+    series = _series("2025-06-01 10:00", 6)
+    base = epoch_seconds(datetime(2025, 6, 1, 10, 0))
+
+    assert list(slot_boundaries(series)) == [base + 900 * i for i in range(7)]
+    assert list(slot_boundaries(series, 3600)) == [base, base + 3600]
+
+
+def test_next_boundary_follows_data() -> None:
+    scheduler = RCESlotScheduler(Mock(), _coordinator(_series("2025-06-01 10:00", 8)))
+
+    assert scheduler.next_boundary(_local("2025-06-01 10:07:30")) == _local("2025-06-01 10:15:00")
+    assert scheduler.next_boundary(_local("2025-06-01 10:15:00")) == _local("2025-06-01 10:30:00")
+    assert scheduler.next_boundary(_local("2025-06-01 11:59:00")) == _local("2025-06-01 12:00:00")
+    assert scheduler.next_boundary(_local("2025-06-01 12:05:00")) == _local("2025-06-01 12:15:00")
+
+
+def test_next_boundary_hourly_prices() -> None:
+    scheduler = RCESlotScheduler(Mock(), _coordinator(_series("2025-06-01 10:00", 8), hourly=True))
+
+    assert scheduler.next_boundary(_local("2025-06-01 10:07:30")) == _local("2025-06-01 11:00:00")
+
+
+def test_next_boundary_without_data() -> None:
+    scheduler = RCESlotScheduler(Mock(), _coordinator(None))
+
+    assert scheduler.next_boundary(_local("2025-06-01 10:44:59")) == _local("2025-06-01 10:45:00")
+
+
+def test_listeners_share_one_timer() -> None:
+    coordinator = _coordinator(_series("2025-06-01 10:00", 8))
+    scheduler = RCESlotScheduler(Mock(), coordinator)
+    first, second = Mock(), Mock()
+
+    with patch(
+        "custom_components.rce_pse.scheduler.async_track_point_in_utc_time"
+    ) as mock_track:
+        remove_first = scheduler.async_add_listener(first)
+        remove_second = scheduler.async_add_listener(second)
+        assert mock_track.call_count == 1
+        coordinator.async_add_listener.assert_called_once()
+
+        handle_timer, when = mock_track.call_args[0][1:]
+        handle_timer(when)
+        first.assert_called_once()
+        second.assert_called_once()
+        assert mock_track.call_count == 2
+
+        unsub_timer = mock_track.return_value
+        remove_first()
+        unsub_timer.assert_not_called()
+        remove_second()
+        unsub_timer.assert_called_once()
+        coordinator.async_add_listener.return_value.assert_called_once()
+
+
+def test_transition_listeners_fire_only_when_due() -> None:
+    coordinator = _coordinator(None)
+    scheduler = RCESlotScheduler(Mock(), coordinator)
+    now = dt_util.utcnow()
+    soon, later = Mock(), Mock()
+    soon_at = now + timedelta(minutes=5)
+    later_at = now + timedelta(hours=2)
+
+    with patch(
+        "custom_components.rce_pse.scheduler.async_track_point_in_utc_time"
+    ) as mock_track:
+        scheduler.async_add_listener(soon, lambda t: soon_at if t < soon_at else None)
+        scheduler.async_add_listener(later, lambda t: later_at if t < later_at else None)
+        assert mock_track.call_args[0][2] == soon_at
+
+        mock_track.call_args[0][1](soon_at)
+        soon.assert_called_once()
+        later.assert_not_called()
+        assert mock_track.call_args[0][2] == later_at
+
+        mock_track.call_args[0][1](later_at)
+        later.assert_called_once()
+        assert mock_track.call_count == 2
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from datetime import timedelta
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import pytest
+from homeassistant.util import dt as dt_util
 
 from custom_components.rce_pse.sensors.today_main import RCETodayMainSensor, RCETodayProsumerSellingPriceSensor
 from custom_components.rce_pse.sensors.tomorrow_main import RCETomorrowMainSensor
@@ -18,7 +19,30 @@ from custom_components.rce_pse.sensors.today_prices import (
     RCENextPeriodPriceSensor,
     RCEPreviousPeriodPriceSensor,
 )
-from custom_components.rce_pse.const import CONF_USE_GROSS_PRICES, CONF_USE_HOURLY_PRICES
+from custom_components.rce_pse.const import (
+    CONF_LOW_PRICE_THRESHOLD,
+    CONF_ROLLING_WINDOW_DURATION,
+    CONF_ROLLING_WINDOW_HORIZON,
+    CONF_USE_GROSS_PRICES,
+    CONF_USE_HOURLY_PRICES,
+)
+from custom_components.rce_pse.coordinator import RCEPSEDataUpdateCoordinator
+from custom_components.rce_pse.sensors.rolling_window import (
+    RCENextCheapestWindowEndSensor,
+    RCENextCheapestWindowStartSensor,
+)
+from custom_components.rce_pse.sensors.low_price_threshold_windows import (
+    RCETodayLowPriceThresholdWindowStartSensor,
+    RCETodaySecondLowPriceThresholdWindowEndSensor,
+    RCETodaySecondLowPriceThresholdWindowStartSensor,
+    RCETodayThirdLowPriceThresholdWindowStartSensor,
+)
+from custom_components.rce_pse.binary_sensors.low_price_threshold import (
+    RCETodayLowPriceThresholdWindowActiveBinarySensor,
+)
+from custom_components.rce_pse.dependencies import TimeGranularity
+from custom_components.rce_pse.derived import build_derived_data
+from custom_components.rce_pse.shared_base import next_local_midnight
 class TestTodayMainSensors:
 
     def test_today_main_price_sensor_initialization(self, mock_coordinator):
@@ -380,9 +404,9 @@ class TestSensorAttributes:
         
         with patch.object(sensor, "get_today_data") as mock_today_data:
             mock_today_data.return_value = [
-                {"rce_pln": "300.00", "rce_pln_neg_to_zero": "0.00", "publication_ts": "2024-01-01T10:00:00Z"},
-                {"rce_pln": "350.00", "publication_ts": "2024-01-01T10:15:00Z"},
-                {"rce_pln": "400.00", "rce_pln_neg_to_zero": "0.00"},
+                {"dtime": "2024-01-01 00:15:00", "rce_pln": "300.00", "rce_pln_neg_to_zero": "0.00", "publication_ts": "2024-01-01T10:00:00Z"},
+                {"dtime": "2024-01-01 00:30:00", "rce_pln": "350.004", "publication_ts": "2024-01-01T10:15:00Z"},
+                {"dtime": "2024-01-01 00:45:00", "rce_pln": "400.00", "rce_pln_neg_to_zero": "0.00"},
             ]
             
             attrs = sensor.extra_state_attributes
@@ -392,9 +416,52 @@ class TestSensorAttributes:
             assert "last_update" in attrs
             assert "prices" in attrs
             assert attrs["data_points"] == 3
-            for rec in attrs["prices"]:
-                assert "rce_pln_neg_to_zero" not in rec
-                assert "publication_ts" not in rec
+            assert attrs["prices"] == [300.0, 350.0, 400.0]
+            assert attrs["prices_step_minutes"] == 15
+            assert attrs["prices_start"].startswith("2024-01-01T00:00:00")
+            assert "publication_ts" not in attrs
+
+    def test_price_list_attributes_are_not_recorded(self, mock_coordinator):
+        for sensor in (RCETodayMainSensor(mock_coordinator), RCETomorrowMainSensor(mock_coordinator)):
+            assert {"prices", "prices_start", "prices_dtime"} <= sensor._unrecorded_attributes
+
+    def test_price_list_attributes_fall_back_to_dtimes_for_gaps(self, mock_coordinator):
+        sensor = RCETodayMainSensor(mock_coordinator)
+        records = [
+            {"dtime": "2024-01-01 00:15:00", "rce_pln": "300.00"},
+            {"dtime": "2024-01-01 01:00:00", "rce_pln": "310.00"},
+        ]
+
+        attrs = sensor.get_price_list_attributes(records)
+
+        assert attrs == {
+            "prices_dtime": ["2024-01-01 00:15:00", "2024-01-01 01:00:00"],
+            "prices": [300.0, 310.0],
+        }
+
+    def test_price_list_attributes_cached_per_day_snapshot(self, mock_coordinator):
+        today = dt_util.now().strftime("%Y-%m-%d")
+        records = [{"dtime": f"{today} 00:15:00", "rce_pln": "300.00", "business_date": today}]
+        mock_coordinator.data = {
+            "raw_data": records,
+            "derived": build_derived_data(records),
+        }
+        sensor = RCETodayMainSensor(mock_coordinator)
+
+        with patch(
+            "custom_components.rce_pse.sensors.base.compact_price_list",
+            return_value={"prices": [300.0]},
+        ) as mock_compact:
+            first = sensor.get_price_list_attributes(sensor.get_today_data())
+            second = sensor.get_price_list_attributes(sensor.get_today_data())
+            mock_coordinator.data = {
+                "raw_data": records,
+                "derived": build_derived_data(records),
+            }
+            sensor.get_price_list_attributes(sensor.get_today_data())
+
+        assert first is second
+        assert mock_compact.call_count == 2
 
     def test_sensor_device_info_consistency(self, mock_coordinator):
         sensors = [
@@ -515,9 +582,7 @@ class TestTomorrowMainSensor:
                         assert attrs["available_after"] == "14:00 CET"
                         assert "tomorrow_price_for_hour" in attrs
                         assert attrs["tomorrow_price_for_hour"]["rce_pln"] == 350.0
-                        for rec in attrs["prices"]:
-                            assert "rce_pln_neg_to_zero" not in rec
-                            assert "publication_ts" not in rec
+                        assert attrs["prices"] == []
 
     def test_tomorrow_price_extra_state_attributes_data_not_available(self, mock_coordinator):
         sensor = RCETomorrowMainSensor(mock_coordinator)
@@ -553,11 +618,27 @@ class TestTomorrowMainSensor:
                     price = sensor.native_value
                     assert price == 350.46 
 
-    def test_tomorrow_price_sensor_scan_interval(self, mock_coordinator):
+    def test_tomorrow_price_sensor_updates_on_slot_change(self, mock_coordinator):
         sensor = RCETomorrowMainSensor(mock_coordinator)
         
-        assert sensor.scan_interval == timedelta(minutes=1)
-        assert sensor.should_poll is True
+        assert sensor.should_poll is False
+        assert sensor._dependencies.granularity is TimeGranularity.SLOT
+
+    @pytest.mark.asyncio
+    async def test_tomorrow_price_sensor_registers_slot_listener(self, mock_coordinator):
+        sensor = RCETomorrowMainSensor(mock_coordinator)
+        sensor.hass = mock_coordinator.hass
+        remove_listener = Mock()
+        mock_coordinator.slot_scheduler = Mock()
+        mock_coordinator.slot_scheduler.async_add_listener.return_value = remove_listener
+
+        with patch.object(sensor, "async_on_remove") as mock_on_remove:
+            await sensor.async_added_to_hass()
+
+        mock_coordinator.slot_scheduler.async_add_listener.assert_called_once_with(
+            sensor._handle_scheduled_update
+        )
+        mock_on_remove.assert_any_call(remove_listener)
 
     def test_tomorrow_price_updates_every_15_minutes(self, mock_coordinator):
         sensor = RCETomorrowMainSensor(mock_coordinator)
@@ -599,4 +680,129 @@ class TestTomorrowMainSensor:
                         mock_get_price.return_value = {"rce_pln": "330.00"}
                         price = sensor.native_value
                         assert price == 330.00
-                        mock_get_price.assert_called_once_with(mock_now.return_value) 
\ No newline at end of file
+                        mock_get_price.assert_called_once_with(mock_now.return_value) 
+
+class TestDayChangeUpdates:
+
+    @pytest.mark.asyncio
+    async def test_stats_sensor_registers_midnight_listener(self, mock_coordinator):
+        sensor = RCETodayAvgPriceSensor(mock_coordinator)
+        sensor.hass = mock_coordinator.hass
+        mock_coordinator.slot_scheduler = Mock()
+
+        with patch.object(sensor, "async_on_remove"):
+            await sensor.async_added_to_hass()
+
+        mock_coordinator.slot_scheduler.async_add_listener.assert_called_once_with(
+            sensor._handle_scheduled_update, next_local_midnight
+        )
+
+    def test_next_local_midnight(self):
+        now = dt_util.now().replace(hour=15, minute=20)
+        midnight = next_local_midnight(now)
+
+        assert midnight.date() == (now + timedelta(days=1)).date()
+        assert (midnight.hour, midnight.minute) == (0, 0)
+
+    def test_clock_driven_sensors_update_on_slot_change(self, mock_coordinator):
+        for sensor_class in (
+            RCETodayProsumerSellingPriceSensor,
+            RCETodayCurrentVsAverageSensor,
+            RCENextPeriodPriceSensor,
+            RCEPreviousPeriodPriceSensor,
+        ):
+            assert sensor_class(mock_coordinator)._dependencies.granularity is TimeGranularity.SLOT
+
+
+class TestNextCheapestWindowSensors:
+
+    @staticmethod
+    def _coordinator(mock_hass) -> RCEPSEDataUpdateCoordinator:
+        day = dt_util.start_of_local_day().replace(tzinfo=None)
+        records = []
+        for offset in (0, 1):
+            for i in range(96):
+                end = day + timedelta(days=offset, minutes=15 * (i + 1))
+                cheap = offset == 1 and i < 8 or offset == 0 and 60 <= i < 68
+                records.append({
+                    "dtime": end.strftime("%Y-%m-%d %H:%M:%S"),
+                    "rce_pln": "10.00" if cheap else "300.00",
+                    "business_date": (day + timedelta(days=offset)).strftime("%Y-%m-%d"),
+                })
+        coordinator = RCEPSEDataUpdateCoordinator(
+            mock_hass,
+            Mock(options={CONF_ROLLING_WINDOW_DURATION: "02:00", CONF_ROLLING_WINDOW_HORIZON: 12}, data={}),
+        )
+        coordinator.data = coordinator._build_snapshot_data(records, [], dt_util.now())
+        return coordinator
+
+    def test_window_spans_midnight_and_stays_until_it_ends(self, mock_hass):
+        coordinator = self._coordinator(mock_hass)
+        start_sensor = RCENextCheapestWindowStartSensor(coordinator)
+        end_sensor = RCENextCheapestWindowEndSensor(coordinator)
+        midnight = dt_util.start_of_local_day() + timedelta(days=1)
+
+        with patch("custom_components.rce_pse.sensors.rolling_window.dt_util.now",
+                   return_value=midnight - timedelta(hours=3)):
+            assert start_sensor.native_value == midnight
+            assert end_sensor.native_value == midnight + timedelta(hours=2)
+            assert start_sensor.extra_state_attributes == {"average_price": 10.0, "horizon_hours": 12.0}
+
+        with patch("custom_components.rce_pse.sensors.rolling_window.dt_util.now",
+                   return_value=midnight + timedelta(minutes=50)):
+            assert start_sensor.native_value == midnight
+            assert end_sensor.native_value == midnight + timedelta(hours=2)
+
+        with patch("custom_components.rce_pse.sensors.rolling_window.dt_util.now",
+                   return_value=midnight - timedelta(hours=12)):
+            assert start_sensor.native_value == midnight - timedelta(hours=9)
+            assert start_sensor._dependencies.granularity is TimeGranularity.SLOT
+
+
+class TestLowPriceThresholdIntervals:
+
+    def test_ranked_windows_and_active_state_use_snapshot_index(self, mock_hass):
+        day = dt_util.start_of_local_day().replace(tzinfo=None)
+        records = [
+            {
+                "dtime": (day + timedelta(minutes=15 * (i + 1))).strftime("%Y-%m-%d %H:%M:%S"),
+                "rce_pln": "10.00" if 8 <= i < 12 or 40 <= i < 42 else "300.00",
+                "business_date": day.strftime("%Y-%m-%d"),
+            }
+            for i in range(96)
+        ]
+        config_entry = Mock(options={CONF_LOW_PRICE_THRESHOLD: 100.0}, data={})
+        coordinator = RCEPSEDataUpdateCoordinator(mock_hass, config_entry)
+        coordinator.data = coordinator._build_snapshot_data(records, [], dt_util.now())
+        binary_sensor = RCETodayLowPriceThresholdWindowActiveBinarySensor(coordinator, config_entry)
+        local = day.replace(tzinfo=dt_util.get_default_time_zone())
+
+        with patch(
+            "custom_components.rce_pse.derived.ThresholdIndex.from_records"
+        ) as mock_build:
+            assert RCETodayLowPriceThresholdWindowStartSensor(coordinator, config_entry).native_value == (
+                local + timedelta(hours=2)
+            )
+            assert RCETodaySecondLowPriceThresholdWindowStartSensor(
+                coordinator, config_entry
+            ).native_value == local + timedelta(hours=10)
+            assert RCETodaySecondLowPriceThresholdWindowEndSensor(
+                coordinator, config_entry
+            ).native_value == local + timedelta(hours=10, minutes=30)
+            assert RCETodayThirdLowPriceThresholdWindowStartSensor(coordinator, config_entry).native_value is None
+            with patch(
+                "custom_components.rce_pse.binary_sensors.low_price_threshold.dt_util.now",
+                return_value=local + timedelta(hours=2, minutes=50),
+            ):
+                assert binary_sensor.is_on is True
+            with patch(
+                "custom_components.rce_pse.binary_sensors.low_price_threshold.dt_util.now",
+                return_value=local + timedelta(hours=10, minutes=5),
+            ):
+                assert binary_sensor.is_on is False
+            assert binary_sensor.active_bounds() == [(day + timedelta(hours=2), day + timedelta(hours=3))]
+
+        mock_build.assert_not_called()
+        assert RCETodaySecondLowPriceThresholdWindowStartSensor(
+            coordinator, config_entry
+        )._attr_entity_registry_enabled_default is False
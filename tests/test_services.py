@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+import voluptuous as vol
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.util import dt as dt_util
+
+from custom_components.rce_pse.const import (
+    CONF_USE_HOURLY_PRICES,
+    DOMAIN,
+    UNIT_PLN_KWH,
+)
+from custom_components.rce_pse.coordinator import RCEPSEDataUpdateCoordinator
+from custom_components.rce_pse.price_calculator import PriceCalculator
+from custom_components.rce_pse.services import (
+    FIND_SCHEDULE_SCHEMA,
+    FIND_WINDOW_SCHEMA,
+    PLAN_CHARGING_SCHEMA,
+    SERVICE_FIND_SCHEDULE,
+    SERVICE_FIND_WINDOW,
+    SERVICE_GET_PRICES,
+    SERVICE_PLAN_CHARGING,
+    async_setup_services,
+    series_prices_between,
+)
+
+
+def _day_records(day: datetime) -> list[dict]:
+    return [
+        {
+            "dtime": (day + timedelta(minutes=15 * (i + 1))).strftime("%Y-%m-%d %H:%M:%S"),
+            "rce_pln": f"{100 + i}.00",
+            "business_date": day.strftime("%Y-%m-%d"),
+        }
+        for i in range(96)
+    ]
+
+
+@pytest.fixture
+def coordinator(mock_hass) -> RCEPSEDataUpdateCoordinator:
+    coordinator = RCEPSEDataUpdateCoordinator(mock_hass)
+    records = _day_records(dt_util.start_of_local_day().replace(tzinfo=None))
+    coordinator._raw_days = {records[0]["business_date"]: tuple(records)}
+    coordinator.data = coordinator._build_snapshot_data(records, [], dt_util.now())
+    mock_hass.data[DOMAIN] = {"entry": coordinator}
+    return coordinator
+
+
+def _service_handler(mock_hass, name: str = SERVICE_GET_PRICES):
+    mock_hass.services = Mock()
+    async_setup_services(mock_hass)
+    handlers = {
+        call.args[1]: call.args[2]
+        for call in mock_hass.services.async_register.call_args_list
+        if call.args[0] == DOMAIN
+    }
+    return handlers[name]
+
+
+def test_series_prices_between_selects_overlapping_slots(coordinator) -> None:
+    series = coordinator.data["raw_data"]
+    day = dt_util.start_of_local_day().replace(tzinfo=None)
+
+    prices = series_prices_between(series, day + timedelta(minutes=20), day + timedelta(hours=1), False)
+
+    assert [p["price"] for p in prices] == [101.0, 102.0, 103.0]
+    assert prices[0]["start"] == (day + timedelta(minutes=15)).replace(
+        tzinfo=dt_util.get_default_time_zone()
+    ).isoformat()
+
+
+@pytest.mark.asyncio
+async def test_get_prices_defaults_to_configured_variant(mock_hass, coordinator) -> None:
+    handler = _service_handler(mock_hass)
+
+    response = await handler(Mock(data={}))
+
+    assert response["resolution"] == "15min"
+    assert response["gross"] is False
+    assert len(response["prices"]) == 96
+    assert response["prices"][0]["price"] == 100.0
+
+
+@pytest.mark.asyncio
+async def test_get_prices_builds_requested_variant_once(mock_hass, coordinator) -> None:
+    handler = _service_handler(mock_hass)
+    call = Mock(data={"resolution": "hourly", "unit": UNIT_PLN_KWH, "gross": True})
+
+    response = await handler(call)
+    series = coordinator.get_price_series(True, True, UNIT_PLN_KWH)
+
+    assert len(response["prices"]) == 24
+    assert response["prices"][0]["price"] == pytest.approx(101.5 * 1.23 / 1000)
+    assert coordinator.get_price_series(True, True, UNIT_PLN_KWH) is series
+    assert coordinator.get_price_series(False, False, "PLN/MWh") is coordinator.data["raw_data"]
+
+
+@pytest.mark.asyncio
+async def test_get_prices_matches_configured_hourly_series(mock_hass, coordinator) -> None:
+    coordinator.config_entry = Mock(options={CONF_USE_HOURLY_PRICES: True}, data={})
+    records = list(next(iter(coordinator._raw_days.values())))
+    coordinator.data = coordinator._build_snapshot_data(records, [], dt_util.now())
+    handler = _service_handler(mock_hass)
+
+    response = await handler(Mock(data={}))
+
+    assert response["resolution"] == "hourly"
+    assert [p["price"] for p in response["prices"][:2]] == [101.5, 105.5]
+
+
+@pytest.mark.asyncio
+async def test_get_prices_rejects_empty_range(mock_hass, coordinator) -> None:
+    handler = _service_handler(mock_hass)
+    now = dt_util.now()
+
+    with pytest.raises(ServiceValidationError):
+        await handler(Mock(data={"start": now, "end": now}))
+
+
+@pytest.mark.asyncio
+async def test_get_prices_requires_loaded_entry(mock_hass) -> None:
+    handler = _service_handler(mock_hass)
+
+    with pytest.raises(ServiceValidationError):
+        await handler(Mock(data={}))
+
+
+@pytest.mark.asyncio
+async def test_get_prices_selects_entry_by_config_entry_id(mock_hass, coordinator) -> None:
+    other = RCEPSEDataUpdateCoordinator(mock_hass)
+    records = [
+        {**record, "rce_pln": "500.00"}
+        for record in _day_records(dt_util.start_of_local_day().replace(tzinfo=None))
+    ]
+    other._raw_days = {records[0]["business_date"]: tuple(records)}
+    other.data = other._build_snapshot_data(records, [], dt_util.now())
+    mock_hass.data[DOMAIN]["other"] = other
+    handler = _service_handler(mock_hass)
+
+    with pytest.raises(ServiceValidationError):
+        await handler(Mock(data={}))
+    with pytest.raises(ServiceValidationError):
+        await handler(Mock(data={"config_entry_id": "missing"}))
+
+    response = await handler(Mock(data={"config_entry_id": "other"}))
+    assert response["prices"][0]["price"] == 500.0
+    response = await handler(Mock(data={"config_entry_id": "entry"}))
+    assert response["prices"][0]["price"] == 100.0
+
+
+@pytest.mark.asyncio
+async def test_find_window_returns_cheapest_window(mock_hass, coordinator) -> None:
+    handler = _service_handler(mock_hass, SERVICE_FIND_WINDOW)
+    call = Mock(data=FIND_WINDOW_SCHEMA({"search_start": "06:00", "duration": "01:00"}))
+
+    response = await handler(call)
+
+    day = dt_util.start_of_local_day()
+    assert response["start"] == (day + timedelta(hours=6)).isoformat()
+    assert response["end"] == (day + timedelta(hours=7)).isoformat()
+    assert response["prices"] == [124.0, 125.0, 126.0, 127.0]
+    assert response["average_price"] == 125.5
+    assert response["unit"] == "PLN/MWh"
+
+
+@pytest.mark.asyncio
+async def test_find_window_caches_queries_per_snapshot(mock_hass, coordinator) -> None:
+    handler = _service_handler(mock_hass, SERVICE_FIND_WINDOW)
+    call = Mock(data=FIND_WINDOW_SCHEMA({"duration": "03:00", "direction": "most_expensive"}))
+
+    with patch(
+        "custom_components.rce_pse.coordinator.PriceCalculator.find_optimal_window",
+        wraps=PriceCalculator.find_optimal_window,
+    ) as mock_find:
+        first = await handler(call)
+        second = await handler(call)
+        configured = await handler(Mock(data=FIND_WINDOW_SCHEMA({"duration": "02:00"})))
+
+    assert first == second
+    assert first["start"] == (dt_util.start_of_local_day() + timedelta(hours=21)).isoformat()
+    assert configured["start"] == dt_util.start_of_local_day().isoformat()
+    assert mock_find.call_count == 1
+    assert len(coordinator.window_cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_find_window_without_tomorrow_data(mock_hass, coordinator) -> None:
+    handler = _service_handler(mock_hass, SERVICE_FIND_WINDOW)
+
+    response = await handler(Mock(data=FIND_WINDOW_SCHEMA({"duration": "01:00", "day_offset": 1})))
+
+    assert response["start"] is None
+    assert response["prices"] == []
+
+
+@pytest.mark.asyncio
+async def test_find_window_with_horizon_searches_from_now(mock_hass, coordinator) -> None:
+    handler = _service_handler(mock_hass, SERVICE_FIND_WINDOW)
+    day = dt_util.start_of_local_day()
+    call = Mock(data=FIND_WINDOW_SCHEMA({"duration": "01:00", "horizon": 3, "search_start": "00:00"}))
+
+    with patch(
+        "custom_components.rce_pse.services.dt_util.now",
+        return_value=day + timedelta(hours=10, minutes=5),
+    ):
+        response = await handler(call)
+
+    assert response["start"] == (day + timedelta(hours=10)).isoformat()
+    assert response["business_date"] == day.strftime("%Y-%m-%d")
+    assert response["prices"] == [140.0, 141.0, 142.0, 143.0]
+
+
+def test_find_window_schema_rejects_unaligned_values() -> None:
+    with pytest.raises(vol.Invalid):
+        FIND_WINDOW_SCHEMA({"duration": "00:10"})
+    with pytest.raises(vol.Invalid):
+        FIND_WINDOW_SCHEMA({"duration": "01:00", "search_start": "06:05"})
+
+
+@pytest.mark.asyncio
+async def test_find_schedule_splits_runtime_into_segments(mock_hass, coordinator) -> None:
+    handler = _service_handler(mock_hass, SERVICE_FIND_SCHEDULE)
+    call = Mock(data=FIND_SCHEDULE_SCHEMA({
+        "search_start": "06:00",
+        "duration": "01:00",
+        "max_segments": 3,
+        "min_segment": "00:30",
+    }))
+
+    with patch(
+        "custom_components.rce_pse.coordinator.PriceCalculator.find_schedule",
+        wraps=PriceCalculator.find_schedule,
+    ) as mock_find:
+        response = await handler(call)
+        assert await handler(call) == response
+
+    day = dt_util.start_of_local_day()
+    assert [segment["start"] for segment in response["segments"]] == [(day + timedelta(hours=6)).isoformat()]
+    assert response["segments"][0]["prices"] == [124.0, 125.0, 126.0, 127.0]
+    assert response["average_price"] == 125.5
+    assert response["unit"] == "PLN/MWh"
+    assert mock_find.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_find_schedule_rejects_min_segment_over_runtime(mock_hass, coordinator) -> None:
+    handler = _service_handler(mock_hass, SERVICE_FIND_SCHEDULE)
+    call = Mock(data=FIND_SCHEDULE_SCHEMA({"duration": "00:30", "min_segment": "01:00"}))
+
+    with pytest.raises(ServiceValidationError):
+        await handler(call)
+
+
+@pytest.mark.asyncio
+async def test_plan_charging_picks_cheapest_slots_after_start(mock_hass, coordinator) -> None:
+    handler = _service_handler(mock_hass, SERVICE_PLAN_CHARGING)
+    day = dt_util.start_of_local_day()
+    call = Mock(data=PLAN_CHARGING_SCHEMA({
+        "energy": 5,
+        "power": 8,
+        "start": day + timedelta(hours=6, minutes=5),
+        "deadline": day + timedelta(hours=12),
+    }))
+
+    response = await handler(call)
+
+    assert [slot["start"] for slot in response["slots"]] == [
+        (day + timedelta(hours=6, minutes=15 * i)).isoformat() for i in range(1, 4)
+    ]
+    assert [slot["energy"] for slot in response["slots"]] == [2.0, 2.0, 1.0]
+    assert response["end"] == (day + timedelta(hours=7)).isoformat()
+    assert response["expected_cost"] == round(0.125 * 2 + 0.126 * 2 + 0.127, 2)
+    assert response["energy"] == 5.0
+    assert response["currency"] == "PLN"
+
+
+@pytest.mark.asyncio
+async def test_plan_charging_rejects_unreachable_energy(mock_hass, coordinator) -> None:
+    handler = _service_handler(mock_hass, SERVICE_PLAN_CHARGING)
+    day = dt_util.start_of_local_day()
+
+    with pytest.raises(ServiceValidationError):
+        await handler(Mock(data=PLAN_CHARGING_SCHEMA({
+            "energy": 50, "power": 11, "start": day, "deadline": day + timedelta(hours=1),
+        })))
+    with pytest.raises(ServiceValidationError):
+        await handler(Mock(data=PLAN_CHARGING_SCHEMA({
+            "energy": 5, "power": 11, "start": day + timedelta(hours=2), "deadline": day,
+        })))
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from custom_components.rce_pse import async_setup_entry
+from custom_components.rce_pse.const import API_UPDATE_INTERVAL
+from custom_components.rce_pse.coordinator import RCEPSEDataUpdateCoordinator
+from custom_components.rce_pse.price_series import PriceSeries
+from custom_components.rce_pse.snapshot import (
+    RCESnapshot,
+    RCESnapshotStore,
+    merge_business_days,
+    pack_records,
+    unpack_records,
+)
+
+
+def _rce_records(business_date: str) -> list[dict]:
+    return [
+        {
+            "dtime": f"{business_date} 00:15:00",
+            "period": "00:00 - 00:15",
+            "rce_pln": "350.00",
+            "business_date": business_date,
+        },
+        {
+            "dtime": f"{business_date} 00:30:00",
+            "period": "00:15 - 00:30",
+            "rce_pln": "-12.50",
+            "business_date": business_date,
+        },
+    ]
+
+
+def _build_coordinator(mock_hass, store: Mock) -> RCEPSEDataUpdateCoordinator:
+    config_entry = Mock()
+    config_entry.options = {}
+    config_entry.data = {}
+    config_entry.entry_id = "test_entry_id"
+    coordinator = RCEPSEDataUpdateCoordinator(mock_hass, config_entry)
+    coordinator._snapshot_store = store
+    coordinator.async_set_updated_data = Mock()
+    return coordinator
+
+
+def test_pack_unpack_round_trip() -> None:
+    records = _rce_records("2025-06-01")
+    records[1]["extra"] = 1
+
+    packed = pack_records(records)
+
+    assert packed["fields"] == ["dtime", "period", "rce_pln", "business_date", "extra"]
+    assert len(packed["rows"]) == 2
+    assert unpack_records(packed) == records
+
+
+def test_pack_empty_records() -> None:
+    assert unpack_records(pack_records([])) == []
+
+
+def test_merge_business_days_shares_unchanged_days() -> None:
+    held = {
+        "2025-05-31": tuple(_rce_records("2025-05-31")),
+        "2025-06-01": tuple(_rce_records("2025-06-01")),
+        "2025-06-02": tuple(_rce_records("2025-06-02")[:1]),
+    }
+    merged = merge_business_days(held, _rce_records("2025-06-02"), "2025-06-01", "2025-06-02")
+
+    assert list(merged) == ["2025-06-01", "2025-06-02"]
+    assert merged["2025-06-01"] is held["2025-06-01"]
+    assert merged["2025-06-02"] == tuple(_rce_records("2025-06-02"))
+
+
+def test_merge_business_days_replaces_refetched_range() -> None:
+    held = {"2025-06-01": tuple(_rce_records("2025-06-01"))}
+    merged = merge_business_days(held, [], "2025-06-01", "2025-06-01")
+    assert merged == {}
+
+
+@pytest.mark.asyncio
+async def test_store_load_returns_snapshot(mock_hass) -> None:
+    fetched_at = dt_util.now().replace(microsecond=0)
+    stored = {
+        "fetched_at": fetched_at.isoformat(),
+        "rce": pack_records(_rce_records("2025-06-01")),
+        "pdgsz": pack_records([]),
+    }
+    with patch("custom_components.rce_pse.snapshot.Store") as mock_store_class:
+        mock_store_class.return_value.async_load = AsyncMock(return_value=stored)
+        snapshot = await RCESnapshotStore(mock_hass, "entry").async_load()
+
+    assert snapshot == RCESnapshot(fetched_at, _rce_records("2025-06-01"), [])
+
+
+@pytest.mark.asyncio
+async def test_store_load_ignores_malformed_data(mock_hass) -> None:
+    with patch("custom_components.rce_pse.snapshot.Store") as mock_store_class:
+        mock_store_class.return_value.async_load = AsyncMock(return_value={"rce": {}})
+        assert await RCESnapshotStore(mock_hass, "entry").async_load() is None
+
+
+@pytest.mark.asyncio
+async def test_store_load_ignores_undecodable_file_but_not_bugs(mock_hass) -> None:
+    with patch("custom_components.rce_pse.snapshot.Store") as mock_store_class:
+        mock_store_class.return_value.async_load = AsyncMock(side_effect=HomeAssistantError("bad json"))
+        assert await RCESnapshotStore(mock_hass, "entry").async_load() is None
+
+        mock_store_class.return_value.async_load = AsyncMock(side_effect=RuntimeError("bug"))
+        with pytest.raises(RuntimeError):
+            await RCESnapshotStore(mock_hass, "entry").async_load()
+
+
+@pytest.mark.asyncio
+async def test_restore_snapshot_serves_cached_data(mock_hass) -> None:
+    now = dt_util.now()
+    today = now.strftime("%Y-%m-%d")
+    yesterday = (now - timedelta(days=1)).strftime("%Y-%m-%d")
+    fetched_at = now - timedelta(minutes=5)
+    store = Mock()
+    store.async_load = AsyncMock(
+        return_value=RCESnapshot(
+            fetched_at,
+            _rce_records(yesterday) + _rce_records(today),
+            [{"business_date": yesterday, "dtime": "x"}, {"business_date": today, "dtime": "y"}],
+        )
+    )
+    coordinator = _build_coordinator(mock_hass, store)
+
+    assert await coordinator.async_restore_snapshot() is True
+
+    data = coordinator.async_set_updated_data.call_args[0][0]
+    assert isinstance(data["raw_data"], PriceSeries)
+    assert data["raw_data"].business_dates == (today,)
+    assert data["raw_data"][1]["rce_pln"] == "-12.500000"
+    assert data["pdgsz_data"] == [{"business_date": today, "dtime": "y"}]
+    assert data["last_update"] == fetched_at.isoformat()
+    assert coordinator.snapshot_is_stale() is False
+
+
+@pytest.mark.asyncio
+async def test_restore_snapshot_rejects_outdated_cache(mock_hass) -> None:
+    yesterday = (dt_util.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+    store = Mock()
+    store.async_load = AsyncMock(
+        return_value=RCESnapshot(dt_util.now(), _rce_records(yesterday), [])
+    )
+    coordinator = _build_coordinator(mock_hass, store)
+
+    assert await coordinator.async_restore_snapshot() is False
+    coordinator.async_set_updated_data.assert_not_called()
+    assert coordinator.snapshot_is_stale() is True
+
+
+@pytest.mark.asyncio
+async def test_restore_snapshot_without_cache(mock_hass) -> None:
+    store = Mock()
+    store.async_load = AsyncMock(return_value=None)
+    coordinator = _build_coordinator(mock_hass, store)
+
+    assert await coordinator.async_restore_snapshot() is False
+
+
+@pytest.mark.asyncio
+async def test_fetch_schedules_snapshot_save(mock_hass) -> None:
+    today = dt_util.now().strftime("%Y-%m-%d")
+    store = Mock()
+    coordinator = _build_coordinator(mock_hass, store)
+    coordinator._fetch_pdgsz = AsyncMock(return_value=[])
+
+    mock_response = AsyncMock()
+    mock_response.status = 200
+    mock_response.json = AsyncMock(return_value={"value": _rce_records(today)})
+    coordinator.session = Mock()
+    coordinator.session.get.return_value.__aenter__ = AsyncMock(return_value=mock_response)
+    coordinator.session.get.return_value.__aexit__ = AsyncMock(return_value=None)
+
+    await coordinator._fetch_data()
+
+    snapshot = store.async_schedule_save.call_args[0][0]
+    assert snapshot.rce_records == _rce_records(today)
+    assert snapshot.pdgsz_records == []
+
+
+@pytest.mark.asyncio
+async def test_setup_entry_uses_snapshot_and_revalidates_when_stale(mock_hass) -> None:
+    mock_entry = Mock(spec=ConfigEntry)
+    mock_entry.entry_id = "test_entry_id"
+    mock_hass.config_entries = Mock()
+    mock_hass.config_entries.async_forward_entry_setups = AsyncMock(return_value=True)
+
+    with patch("custom_components.rce_pse.RCEPSEDataUpdateCoordinator") as mock_coordinator_class:
+        mock_coordinator = mock_coordinator_class.return_value
+        mock_coordinator.async_restore_snapshot = AsyncMock(return_value=True)
+        mock_coordinator.async_config_entry_first_refresh = AsyncMock()
+        mock_coordinator.async_refresh = Mock()
+        mock_coordinator.snapshot_is_stale.return_value = True
+
+        assert await async_setup_entry(mock_hass, mock_entry) is True
+
+    mock_coordinator.async_config_entry_first_refresh.assert_not_called()
+    mock_entry.async_create_background_task.assert_called_once()
+    mock_hass.config_entries.async_forward_entry_setups.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_setup_entry_skips_revalidation_for_fresh_snapshot(mock_hass) -> None:
+    mock_entry = Mock(spec=ConfigEntry)
+    mock_entry.entry_id = "test_entry_id"
+    mock_hass.config_entries = Mock()
+    mock_hass.config_entries.async_forward_entry_setups = AsyncMock(return_value=True)
+
+    with patch("custom_components.rce_pse.RCEPSEDataUpdateCoordinator") as mock_coordinator_class:
+        mock_coordinator = mock_coordinator_class.return_value
+        mock_coordinator.async_restore_snapshot = AsyncMock(return_value=True)
+        mock_coordinator.async_config_entry_first_refresh = AsyncMock()
+        mock_coordinator.snapshot_is_stale.return_value = False
+
+        assert await async_setup_entry(mock_hass, mock_entry) is True
+
+    mock_coordinator.async_config_entry_first_refresh.assert_not_called()
+    mock_entry.async_create_background_task.assert_not_called()
+
+
+def test_snapshot_is_stale_after_update_interval(mock_hass) -> None:
+    coordinator = _build_coordinator(mock_hass, Mock())
+    coordinator._last_api_fetch = dt_util.now() - API_UPDATE_INTERVAL
+    assert coordinator.snapshot_is_stale() is True
@@ -693,14 +693,14 @@ class TestLowPriceThresholdWindowTimestampSensors:
     def test_today_low_price_threshold_window_start_with_window(self, mock_coordinator, mock_config_entry):
         sensor = RCETodayLowPriceThresholdWindowStartSensor(mock_coordinator, mock_config_entry)
         with patch.object(sensor, "get_today_data") as mock_today:
-            mock_today.return_value = [{"period": "02:00 - 02:15", "rce_pln": "0.0"}]
-            with patch.object(sensor.calculator, "find_first_window_below_threshold") as mock_find:
-                mock_find.return_value = [{"period": "02:00 - 02:15", "rce_pln": "0.0"}]
-                timestamp = sensor.native_value
-                assert timestamp is not None
-                assert isinstance(timestamp, datetime)
-                assert timestamp.hour == 2
-                assert timestamp.minute == 0
+            mock_today.return_value = [
+                {"period": "02:00 - 02:15", "rce_pln": "0.0", "dtime": "2025-06-01 02:15:00"}
+            ]
+            timestamp = sensor.native_value
+            assert timestamp is not None
+            assert isinstance(timestamp, datetime)
+            assert timestamp.hour == 2
+            assert timestamp.minute == 0
 
     def test_today_low_price_threshold_window_start_no_window(self, mock_coordinator, mock_config_entry):
         sensor = RCETodayLowPriceThresholdWindowStartSensor(mock_coordinator, mock_config_entry)
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 from unittest.mock import Mock, patch
 
-
 from custom_components.rce_pse.sensors.window_avg_price import (
     RCETodayCheapestWindowAvgPriceSensor,
     RCETodayExpensiveWindowAvgPriceSensor,
@@ -147,12 +146,28 @@ class TestTodaySecondExpensiveWindowAvgPriceSensor:
         with patch.object(sensor, "get_today_data") as mock_today_data:
             mock_today_data.return_value = SAMPLE_WINDOW_DATA
 
-            with patch.object(sensor.calculator, "find_optimal_window") as mock_find:
-                mock_find.return_value = SAMPLE_WINDOW_DATA
+            with patch.object(sensor.calculator, "find_top_windows") as mock_find:
+                mock_find.return_value = [SAMPLE_WINDOW_DATA]
 
                 value = sensor.native_value
                 assert value == EXPECTED_AVG
 
+    def test_native_value_excludes_expensive_window(self, mock_coordinator):
+        mock_config_entry = Mock()
+        mock_config_entry.data = {}
+        mock_config_entry.options = {}
+        sensor = RCETodaySecondExpensiveWindowAvgPriceSensor(mock_coordinator, mock_config_entry)
+
+        with (
+            patch.object(sensor, "get_today_data", return_value=SAMPLE_WINDOW_DATA),
+            patch.object(sensor.calculator, "find_optimal_window", return_value=SAMPLE_WINDOW_DATA) as mock_optimal,
+            patch.object(sensor.calculator, "find_top_windows", return_value=[SAMPLE_WINDOW_DATA]) as mock_top,
+        ):
+            assert sensor.native_value == EXPECTED_AVG
+
+        assert mock_optimal.call_args.kwargs["is_max"] is True
+        assert mock_top.call_args.kwargs["exclude"] == [SAMPLE_WINDOW_DATA]
+
     def test_native_value_no_data(self, mock_coordinator):
         mock_config_entry = Mock()
         mock_config_entry.data = {}
@@ -306,12 +321,28 @@ class TestTomorrowSecondExpensiveWindowAvgPriceSensor:
         with patch.object(sensor, "get_tomorrow_data") as mock_tomorrow_data:
             mock_tomorrow_data.return_value = SAMPLE_WINDOW_DATA
 
-            with patch.object(sensor.calculator, "find_optimal_window") as mock_find:
-                mock_find.return_value = SAMPLE_WINDOW_DATA
+            with patch.object(sensor.calculator, "find_top_windows") as mock_find:
+                mock_find.return_value = [SAMPLE_WINDOW_DATA]
 
                 value = sensor.native_value
                 assert value == EXPECTED_AVG
 
+    def test_native_value_excludes_expensive_window(self, mock_coordinator):
+        mock_config_entry = Mock()
+        mock_config_entry.data = {}
+        mock_config_entry.options = {}
+        sensor = RCETomorrowSecondExpensiveWindowAvgPriceSensor(mock_coordinator, mock_config_entry)
+
+        with (
+            patch.object(sensor, "get_tomorrow_data", return_value=SAMPLE_WINDOW_DATA),
+            patch.object(sensor.calculator, "find_optimal_window", return_value=SAMPLE_WINDOW_DATA) as mock_optimal,
+            patch.object(sensor.calculator, "find_top_windows", return_value=[SAMPLE_WINDOW_DATA]) as mock_top,
+        ):
+            assert sensor.native_value == EXPECTED_AVG
+
+        assert mock_optimal.call_args.kwargs["is_max"] is True
+        assert mock_top.call_args.kwargs["exclude"] == [SAMPLE_WINDOW_DATA]
+
     def test_native_value_no_data(self, mock_coordinator):
         mock_config_entry = Mock()
         mock_config_entry.data = {}